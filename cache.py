@@ -0,0 +1,55 @@
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    def __init__(self, ttl: float, max_size: int = 1024):
+        """
+        Cache clé/valeur en mémoire avec durée de vie et taille bornée
+
+        Les entrées expirées ne sont plus considérées comme fraîches mais
+        restent lisibles avec allow_stale=True jusqu'à ce qu'elles soient
+        remplacées ou évincées (les moins récemment utilisées en premier).
+
+        Args:
+            ttl: Durée de vie par défaut d'une entrée (en secondes)
+            max_size: Nombre maximal d'entrées conservées
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data = OrderedDict()  # key: (expires_at, value)
+
+    def get(self, key, default=None, allow_stale: bool = False):
+        """Retourne la valeur associée à key, ou default si absente (ou expirée)"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if not allow_stale and time.monotonic() >= expires_at:
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: float = None):
+        """Ajoute ou remplace une entrée (ttl remplace la durée de vie par défaut)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def is_fresh(self, key) -> bool:
+        """Indique si key est présente et non expirée"""
+        entry = self._data.get(key)
+        return entry is not None and time.monotonic() < entry[0]
+
+    def delete(self, key):
+        """Supprime une entrée si elle existe"""
+        self._data.pop(key, None)
+
+    def clear(self):
+        """Vide le cache"""
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -1,3 +1,5 @@
 from .wordle_game import WordleGame
+from .scoring import ScoringEngine
+from .solver import WordleSolver
 
-__all__ = ['WordleGame']
+__all__ = ['WordleGame', 'ScoringEngine', 'WordleSolver']
@@ -0,0 +1,64 @@
+"""
+Construit le lexique compact des mots autorisés pour le Wordle
+
+Usage :
+    python -m games.build_lexicon liste_de_mots.txt [autre_liste.txt ...]
+
+Le bot le fait aussi tout seul au démarrage si WORDLE_LEXICON_SOURCES est
+défini dans global_var.py (voir ensure_lexicon).
+
+Chaque fichier source contient un mot par ligne (UTF-8, accents acceptés,
+ex: une extraction de Lexique ou du dictionnaire Grammalecte). Les mots
+sont normalisés (majuscules, sans accents), filtrés sur la longueur et
+écrits dans games/data/mots_5.lex. Les mots à tiret, apostrophe ou chiffre
+sont ignorés.
+"""
+import argparse
+import os
+from .lexicon import DEFAULT_LEXICON_PATH, VERSION, read_header, write_lexicon
+
+
+def read_words(paths):
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                # Certains formats ajoutent des colonnes après le mot (séparées par une tabulation)
+                word = line.split("\t", 1)[0].strip()
+                if word and not word.startswith("#"):
+                    yield word
+
+
+def build_lexicon(sources, output: str = DEFAULT_LEXICON_PATH, length: int = 5) -> int:
+    """Construit le lexique à partir des fichiers sources et retourne le nombre de mots écrits"""
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    return write_lexicon(output, read_words(sources), length)
+
+
+def ensure_lexicon(sources, output: str = DEFAULT_LEXICON_PATH, length: int = 5) -> bool:
+    """
+    Construit le lexique s'il est absent, d'un format plus ancien ou plus ancien qu'une des sources
+
+    Returns:
+        bool: True si le lexique a été (re)construit
+    """
+    sources = [path for path in sources if os.path.exists(path)]
+    if not sources:
+        return False
+    header = read_header(output)
+    if (header is not None and header[0] == VERSION and header[1] == length
+            and os.path.getmtime(output) >= max(os.path.getmtime(path) for path in sources)):
+        return False
+    count = build_lexicon(sources, output, length)
+    print(f"✅ Lexique Wordle construit : {count} mots de {length} lettres dans {output}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construit le lexique compact des mots autorisés")
+    parser.add_argument("sources", nargs="+", help="Fichiers texte, un mot par ligne")
+    parser.add_argument("--output", default=DEFAULT_LEXICON_PATH)
+    parser.add_argument("--length", type=int, default=5)
+    args = parser.parse_args()
+
+    count = build_lexicon(args.sources, args.output, args.length)
+    print(f"✅ {count} mots de {args.length} lettres écrits dans {args.output} ({os.path.getsize(args.output)} octets)")
@@ -0,0 +1,174 @@
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+
+ALPHABET_SIZE = 26
+ALL_LETTERS = (1 << ALPHABET_SIZE) - 1
+
+
+def letter_index(letter: str) -> int:
+    return ord(letter) - 65
+
+
+def letter_mask(word: str) -> int:
+    """Ensemble des lettres d'un mot sur 26 bits (bit 0 = A)"""
+    mask = 0
+    for letter in word:
+        mask |= 1 << letter_index(letter)
+    return mask
+
+
+class Constraints:
+    __slots__ = ("length", "greens", "allowed", "min_count", "max_count", "required")
+
+    def __init__(self, length: int = 5):
+        """
+        Contraintes déduites des retours d'une partie
+
+        allowed[i] est le masque 26 bits des lettres encore possibles à la
+        position i, min_count/max_count bornent le nombre d'exemplaires de
+        chaque lettre, required est le masque des lettres à placer et
+        greens les lettres vertes connues.
+        Les contraintes sont mises à jour à chaque tentative avec add().
+        """
+        self.length = length
+        self.greens: List[Optional[str]] = [None] * length
+        self.allowed = [ALL_LETTERS] * length
+        self.min_count = [0] * ALPHABET_SIZE
+        self.max_count = [length] * ALPHABET_SIZE
+        self.required = 0
+
+    @classmethod
+    def from_history(cls, attempts: Iterable[Tuple[str, Sequence[str]]], length: int = 5) -> "Constraints":
+        """Reconstruit les contraintes d'une suite de (mot, statuts)"""
+        constraints = cls(length)
+        for guess, statuses in attempts:
+            constraints.add(guess, statuses)
+        return constraints
+
+    def add(self, guess: str, statuses: Sequence[str]):
+        """Ajoute le retour d'une tentative ('correct', 'present' ou 'absent' pour chaque lettre)"""
+        found = {}
+        capped = set()
+        for i, (letter, status) in enumerate(zip(guess, statuses)):
+            bit = 1 << letter_index(letter)
+            if status == 'correct':
+                self.greens[i] = letter
+                self.allowed[i] = bit
+                found[letter] = found.get(letter, 0) + 1
+            else:
+                self.allowed[i] &= ~bit
+                if status == 'present':
+                    found[letter] = found.get(letter, 0) + 1
+                else:
+                    capped.add(letter)
+
+        for letter, count in found.items():
+            index = letter_index(letter)
+            self.min_count[index] = max(self.min_count[index], count)
+            self.required |= 1 << index
+        # Une lettre grise : le mot en contient exactement le nombre d'exemplaires verts/jaunes
+        for letter in capped:
+            index = letter_index(letter)
+            self.max_count[index] = min(self.max_count[index], found.get(letter, 0))
+
+    def hard_mode_violation(self, guess: str) -> Optional[str]:
+        """
+        Vérifie une tentative en mode difficile (lettres vertes à leur place, lettres jaunes utilisées)
+
+        Returns:
+            str: La contrainte non respectée, None si la tentative est acceptée
+        """
+        for i, letter in enumerate(self.greens):
+            if letter is not None and guess[i] != letter:
+                return f"La lettre n°{i + 1} doit être **{letter}**"
+
+        missing = self.required & ~letter_mask(guess)
+        if missing:
+            letter = chr((missing & -missing).bit_length() - 1 + 65)
+            return f"Le mot doit contenir la lettre **{letter}**"
+
+        for index in range(ALPHABET_SIZE):
+            if self.min_count[index] > 1:
+                letter = chr(index + 65)
+                if guess.count(letter) < self.min_count[index]:
+                    return f"Le mot doit contenir **{self.min_count[index]}** fois la lettre **{letter}**"
+        return None
+
+
+class ConstraintIndex:
+    def __init__(self, words: Sequence[str]):
+        """
+        Index des mots par position, lettre et nombre d'exemplaires
+
+        Chaque ensemble de mots est un bitset (entier Python, bit n = mot n) :
+        combiner des contraintes revient à quelques ET/NON sur ces entiers et
+        compter les mots possibles à un bit_count(), en quelques
+        microsecondes même pour un grand dictionnaire. Fonctionne pour
+        n'importe quelle longueur de mot (tous les mots de la liste doivent
+        avoir la même).
+
+        Args:
+            words: Liste des mots (majuscules, sans accents, même longueur)
+        """
+        self.words = list(words)
+        self.length = len(self.words[0]) if self.words else 0
+        self.all_words = (1 << len(self.words)) - 1
+        letters = np.frombuffer(''.join(self.words).encode('ascii'), dtype=np.uint8).reshape(len(self.words), self.length) - 65
+
+        # at_position[i][l] : mots ayant la lettre l à la position i
+        self.at_position = [
+            [self._bitset(letters[:, i] == letter) for letter in range(ALPHABET_SIZE)]
+            for i in range(self.length)
+        ]
+        # at_least[l][k] : mots contenant au moins k fois la lettre l (k = 0..longueur+1)
+        self.at_least = []
+        for letter in range(ALPHABET_SIZE):
+            counts = (letters == letter).sum(axis=1)
+            self.at_least.append([self._bitset(counts >= k) for k in range(self.length + 2)])
+
+    @staticmethod
+    def _bitset(selection: np.ndarray) -> int:
+        return int.from_bytes(np.packbits(selection, bitorder='little').tobytes(), 'little')
+
+    def matching(self, constraints: Constraints) -> int:
+        """Bitset des mots compatibles avec les contraintes"""
+        result = self.all_words
+        for i, allowed in enumerate(constraints.allowed):
+            if allowed == ALL_LETTERS:
+                continue
+            if allowed & (allowed - 1) == 0:
+                result &= self.at_position[i][allowed.bit_length() - 1]
+                continue
+            excluded = ALL_LETTERS & ~allowed
+            while excluded:
+                bit = excluded & -excluded
+                result &= ~self.at_position[i][bit.bit_length() - 1]
+                excluded ^= bit
+
+        for letter in range(ALPHABET_SIZE):
+            minimum, maximum = constraints.min_count[letter], constraints.max_count[letter]
+            if minimum:
+                result &= self.at_least[letter][minimum]
+            if maximum < self.length:
+                result &= ~self.at_least[letter][maximum + 1]
+        return result
+
+    def count(self, constraints: Constraints) -> int:
+        """Nombre de mots encore possibles"""
+        return self.matching(constraints).bit_count()
+
+    def iter_words(self, bitset: int) -> Iterator[str]:
+        """Mots d'un bitset, dans l'ordre de la liste"""
+        while bitset:
+            low = bitset & -bitset
+            yield self.words[low.bit_length() - 1]
+            bitset ^= low
+
+    def possible_words(self, constraints: Constraints, limit: int = None) -> List[str]:
+        """Mots compatibles avec les contraintes (au plus limit)"""
+        words = []
+        for word in self.iter_words(self.matching(constraints)):
+            words.append(word)
+            if limit is not None and len(words) >= limit:
+                break
+        return words
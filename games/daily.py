@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Sequence, Tuple
+import discord
+from discord.ext import tasks
+
+try:
+    from zoneinfo import ZoneInfo
+    DAILY_TIMEZONE = ZoneInfo("Europe/Paris")
+except Exception:  # base des fuseaux absente : minuit UTC
+    from datetime import timezone
+    DAILY_TIMEZONE = timezone.utc
+
+
+def today() -> date:
+    """Date du mot du jour (change à minuit, heure de Paris)"""
+    return datetime.now(DAILY_TIMEZONE).date()
+
+
+def daily_key(guild_id: int, day: date) -> str:
+    return f"{guild_id}:{day.isoformat()}"
+
+
+def daily_word(words: Sequence[str], guild_id: int, day: date) -> str:
+    """Mot du jour d'un serveur : toujours le même pour un serveur et une date donnés"""
+    digest = hashlib.blake2b(daily_key(guild_id, day).encode(), digest_size=8).digest()
+    return words[int.from_bytes(digest, "big") % len(words)]
+
+
+class DailyBoard:
+    __slots__ = ("distribution", "failures", "players", "solvers")
+    MAX_SOLVERS_SHOWN = 10
+
+    def __init__(self, max_attempts: int = 6):
+        """Résultats agrégés du mot du jour d'un serveur, mis à jour à chaque partie terminée"""
+        self.distribution = [0] * max_attempts  # nombre de joueurs ayant trouvé en 1, 2, ... essais
+        self.failures = 0
+        self.players = set()  # user_id des joueurs ayant terminé
+        self.solvers: List[Tuple[int, int]] = []  # (user_id, essais) des premiers à trouver
+
+    def add(self, user_id: int, attempts: int, won: bool):
+        self.players.add(user_id)
+        if won:
+            self.distribution[attempts - 1] += 1
+            if len(self.solvers) < self.MAX_SOLVERS_SHOWN:
+                self.solvers.append((user_id, attempts))
+        else:
+            self.failures += 1
+
+    @property
+    def wins(self) -> int:
+        return sum(self.distribution)
+
+
+class DailyResults:
+    def __init__(self, db_path: str = "wordle_daily.db", flush_interval: int = 30, max_attempts: int = 6):
+        """
+        Résultats du mot du jour, par serveur et par date
+
+        Chaque partie terminée met à jour les compteurs du serveur en temps
+        constant : afficher le tableau ne relit jamais les parties. Les
+        résultats sont écrits dans SQLite par lots (write-behind) et les
+        compteurs d'un jour ne sont reconstruits depuis la base qu'au premier
+        accès après un redémarrage, dans un thread et sur une connexion de
+        lecture séparée (WAL) : les premiers joueurs après minuit n'attendent
+        ni la boucle d'événements ni un flush en cours.
+
+        Args:
+            db_path: Fichier SQLite (None pour ne rien sauvegarder)
+            flush_interval: Intervalle (en secondes) entre deux écritures sur disque
+            max_attempts: Nombre d'essais d'une partie
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.boards: Dict[str, DailyBoard] = {}  # "guild_id:date": résultats agrégés
+        self._pending: List[tuple] = []  # lignes à écrire
+        self._writing: List[tuple] = []  # lignes en cours d'écriture
+        self._db_lock = threading.Lock()
+        self._db = None  # connexion ouverte au premier usage
+        self._read_lock = threading.Lock()
+        self._reader = None  # connexion de lecture, ouverte au premier chargement
+        self.flush_loop.change_interval(seconds=flush_interval)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connexion SQLite (créée avec la table au premier appel, sous _db_lock)"""
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS daily_results (
+                    guild_id INTEGER NOT NULL,
+                    day TEXT NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    won INTEGER NOT NULL,
+                    finished_at REAL NOT NULL,
+                    PRIMARY KEY (guild_id, day, user_id)
+                )
+            """)
+            self._db.commit()
+        return self._db
+
+    def _read_connection(self) -> sqlite3.Connection:
+        """Connexion de lecture (sous _read_lock), indépendante des écritures en cours"""
+        if self._reader is None:
+            with self._db_lock:
+                self._connection()  # table créée et base passée en WAL
+            self._reader = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._reader
+
+    async def board(self, guild_id: int, day: date) -> DailyBoard:
+        """Résultats agrégés d'un serveur pour un jour (reconstruits depuis SQLite, dans un thread, au premier accès)"""
+        key = daily_key(guild_id, day)
+        board = self.boards.get(key)
+        if board is None:
+            # Résultats pas encore écrits (flush en attente ou en cours), avant et après la lecture
+            unsaved = self._unsaved(guild_id, day)
+            rows = await self._load(guild_id, day)
+            rows += unsaved + self._unsaved(guild_id, day)
+            # Pendant la lecture, un autre appel a pu construire le tableau
+            board = self.boards.get(key)
+            if board is None:
+                board = DailyBoard(self.max_attempts)
+                for user_id, attempts, won in rows:
+                    if user_id not in board.players:  # résultat écrit pendant la lecture : déjà compté
+                        board.add(user_id, attempts, bool(won))
+                self.boards[key] = board
+        return board
+
+    def _unsaved(self, guild_id: int, day: date) -> List[tuple]:
+        return [(row[2], row[3], row[4]) for row in self._writing + self._pending
+                if row[0] == guild_id and row[1] == day.isoformat()]
+
+    def _read_rows(self, guild_id: int, day: date) -> List[tuple]:
+        with self._read_lock:
+            return self._read_connection().execute(
+                "SELECT user_id, attempts, won FROM daily_results WHERE guild_id = ? AND day = ? ORDER BY finished_at",
+                (guild_id, day.isoformat())
+            ).fetchall()
+
+    async def _load(self, guild_id: int, day: date) -> List[tuple]:
+        if not self.db_path:
+            return []
+        return await asyncio.to_thread(self._read_rows, guild_id, day)
+
+    async def has_played(self, guild_id: int, day: date, user_id: int) -> bool:
+        return user_id in (await self.board(guild_id, day)).players
+
+    async def record(self, guild_id: int, day: date, user_id: int, attempts: int, won: bool):
+        """Enregistre une partie terminée (une seule par joueur et par jour)"""
+        board = await self.board(guild_id, day)
+        if user_id in board.players:
+            return
+        board.add(user_id, attempts, won)
+        self._pending.append((guild_id, day.isoformat(), user_id, attempts, int(won), time.time()))
+
+    def _write(self, rows: List[tuple]):
+        with self._db_lock:
+            db = self._connection()
+            with db:
+                db.executemany("INSERT OR IGNORE INTO daily_results VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    async def flush(self):
+        """Écrit les résultats en attente sans bloquer la boucle d'événements"""
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        if not self.db_path:
+            return
+        self._writing = rows
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la sauvegarde des résultats du mot du jour: {e}")
+            self._pending = rows + self._pending
+        finally:
+            self._writing = []
+
+    def evict_old_boards(self):
+        """Oublie les compteurs en mémoire des jours passés (ils restent dans SQLite)"""
+        yesterday = (today() - timedelta(days=1)).isoformat()
+        for key in [key for key in self.boards if key.split(":", 1)[1] < yesterday]:
+            del self.boards[key]
+
+    @tasks.loop(seconds=30)
+    async def flush_loop(self):
+        """Écrit les résultats par lots et libère les jours passés"""
+        self.evict_old_boards()
+        await self.flush()
+
+    def start(self):
+        """Démarre l'écriture périodique"""
+        if not self.flush_loop.is_running():
+            self.flush_loop.start()
+
+    async def close(self):
+        """Arrête l'écriture périodique et écrit les derniers résultats"""
+        self.flush_loop.cancel()
+        await self.flush()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+        with self._read_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    async def create_board_embed(self, guild: discord.Guild, day: date) -> discord.Embed:
+        """Crée l'embed des résultats du jour d'un serveur (à partir des compteurs, sans relire les parties)"""
+        board = await self.board(guild.id, day)
+        played = len(board.players)
+
+        embed = discord.Embed(
+            title=f"📅 Mot du jour - {day.strftime('%d/%m/%Y')}",
+            description=f"**{played}** joueur(s) - **{board.wins}** ont trouvé le mot",
+            color=discord.Color.gold()
+        )
+
+        if played:
+            biggest = max(max(board.distribution), board.failures, 1)
+            lines = []
+            for attempts, count in enumerate(board.distribution, start=1):
+                lines.append(f"``{attempts}`` {'🟩' * round(count / biggest * 10)} {count}")
+            lines.append(f"``X`` {'⬛' * round(board.failures / biggest * 10)} {board.failures}")
+            embed.add_field(name="Répartition des essais", value="\n".join(lines), inline=False)
+
+        if board.solvers:
+            solvers = []
+            for position, (user_id, attempts) in enumerate(board.solvers, start=1):
+                member = guild.get_member(user_id)
+                name = member.display_name if member else f"<@{user_id}>"
+                solvers.append(f"**{position}.** {name} ({attempts}/{self.max_attempts})")
+            embed.add_field(name="Premiers à trouver", value="\n".join(solvers), inline=False)
+
+        embed.set_footer(text="Un nouveau mot chaque jour à minuit - /motdujour pour jouer")
+        return embed
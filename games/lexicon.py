@@ -0,0 +1,245 @@
+import heapq
+import itertools
+import os
+import struct
+import unicodedata
+from typing import Callable, Iterable, Iterator, List, Optional
+import numpy as np
+
+# Format du fichier : en-tête (magie, version, longueur des mots, nombre de mots)
+# puis les mots encodés en entiers uint32 little-endian, triés par ordre croissant,
+# puis (mots de 5 lettres au plus) une table de présence d'un bit par code possible.
+# Chaque lettre occupe 5 bits (A=1 ... Z=26), la première lettre dans les bits
+# de poids fort : l'ordre des entiers est donc l'ordre alphabétique.
+MAGIC = b"PKLX"
+VERSION = 2
+HEADER = struct.Struct("<4sBBxxI")
+LETTER_BITS = 5
+MAX_WORD_LENGTH = 32 // LETTER_BITS
+BITMAP_MAX_LENGTH = 5  # 2^25 bits = 4 Mo ; au-delà, recherche dichotomique dans les codes triés
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(__file__), "data", "mots_5.lex")
+LIGATURES = str.maketrans({"Œ": "OE", "Æ": "AE", "ß": "SS"})
+
+
+def normalize_word(text: str) -> str:
+    """Met un mot en majuscules sans accents (É -> E, Œ -> OE)"""
+    text = text.strip().upper().translate(LIGATURES)
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
+
+
+def encode_word(word: str) -> Optional[int]:
+    """Encode un mot normalisé en entier, None s'il contient autre chose que A-Z ou s'il est trop long"""
+    if not word or len(word) > MAX_WORD_LENGTH:
+        return None
+    code = 0
+    for letter in word:
+        value = ord(letter) - 64
+        if not 1 <= value <= 26:
+            return None
+        code = (code << LETTER_BITS) | value
+    return code
+
+
+def decode_word(code: int, length: int) -> str:
+    """Décode un entier produit par encode_word"""
+    letters = []
+    for _ in range(length):
+        code, value = divmod(int(code), 1 << LETTER_BITS)
+        letters.append(chr(value + 64))
+    return ''.join(reversed(letters))
+
+
+def write_lexicon(path: str, words: Iterable[str], word_length: int) -> int:
+    """
+    Écrit un lexique compact (mots normalisés, dédoublonnés et triés)
+
+    Returns:
+        int: Nombre de mots écrits
+    """
+    codes = set()
+    for word in words:
+        word = normalize_word(word)
+        if len(word) == word_length:
+            code = encode_word(word)
+            if code is not None:
+                codes.add(code)
+
+    array = np.array(sorted(codes), dtype='<u4')
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, word_length, len(array)))
+        f.write(array.tobytes())
+        if word_length <= BITMAP_MAX_LENGTH:
+            bitmap = np.zeros(bitmap_size(word_length), dtype=np.uint8)
+            np.bitwise_or.at(bitmap, array >> 3, (1 << (array & 7)).astype(np.uint8))
+            f.write(bitmap.tobytes())
+    os.replace(tmp_path, path)
+    return len(array)
+
+
+def bitmap_size(word_length: int) -> int:
+    """Taille (en octets) de la table de présence des mots de word_length lettres"""
+    return (1 << (LETTER_BITS * word_length)) // 8
+
+
+def read_header(path: str) -> Optional[tuple]:
+    """(version, longueur des mots, nombre de mots) d'un lexique, None si le fichier n'en est pas un"""
+    try:
+        with open(path, "rb") as f:
+            magic, version, word_length, count = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    if magic != MAGIC:
+        return None
+    return version, word_length, count
+
+
+class PackedLexicon:
+    ITER_CHUNK = 4096  # codes décodés à la fois lors d'un parcours complet
+
+    def __init__(self, path: str, word_length: int = 5, extra_words: Iterable[str] = ()):
+        """
+        Lexique de mots autorisés stocké dans un fichier compact
+
+        Le fichier n'est ouvert qu'au premier usage (projection mémoire) :
+        importer le module ne coûte rien, quelle que soit la taille du
+        lexique, et il n'est jamais copié en mémoire. Un test
+        d'appartenance lit un seul bit de la table de présence projetée
+        (temps constant) ; l'autocomplétion et le parcours utilisent les
+        codes triés.
+
+        Args:
+            path: Chemin du fichier produit par write_lexicon (python -m games.build_lexicon)
+            word_length: Longueur des mots attendue
+            extra_words: Mots toujours acceptés, même absents du fichier (ex: les solutions)
+        """
+        self.path = path
+        self.word_length = word_length
+        self.extra_codes = {encode_word(normalize_word(word)) for word in extra_words} - {None}
+        self._codes: Optional[np.ndarray] = None  # codes du fichier (projection mémoire), triés
+        self._bitmap: Optional[np.ndarray] = None  # table de présence du fichier (projection mémoire)
+        self._extra: Optional[np.ndarray] = None  # mots de base absents du fichier, triés
+
+    def load(self):
+        """Projette le fichier en mémoire et prépare les mots de base absents du fichier"""
+        if self._codes is not None:
+            return
+        codes, bitmap = np.zeros(0, dtype='<u4'), None
+        if os.path.exists(self.path):
+            try:
+                codes, bitmap = self._map_file()
+                print(f"📖 Lexique Wordle chargé : {len(codes)} mots ({self.path})")
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Lexique {self.path} illisible, seuls les mots de base sont acceptés: {e}")
+        else:
+            print(f"⚠️ Lexique {self.path} introuvable, seuls les mots de base sont acceptés "
+                  f"(définir WORDLE_LEXICON_SOURCES dans global_var.py pour le construire)")
+        extra = np.array(sorted(self.extra_codes), dtype='<u4')
+        self._extra = extra[~self._contains_codes(codes, extra)]
+        self._bitmap = bitmap
+        self._codes = codes
+
+    def _map_file(self) -> tuple:
+        """Projette les codes triés et la table de présence (None si le fichier n'en a pas)"""
+        header = read_header(self.path)
+        if header is None or header[0] != VERSION:
+            raise ValueError("format inconnu (reconstruire avec python -m games.build_lexicon)")
+        _, word_length, count = header
+        if word_length != self.word_length:
+            raise ValueError(f"mots de {word_length} lettres au lieu de {self.word_length}")
+        codes = np.zeros(0, dtype='<u4')
+        if count:
+            codes = np.memmap(self.path, dtype='<u4', mode='r', offset=HEADER.size, shape=(count,))
+        bitmap = None
+        if word_length <= BITMAP_MAX_LENGTH:
+            bitmap = np.memmap(self.path, dtype=np.uint8, mode='r', offset=HEADER.size + 4 * count,
+                               shape=(bitmap_size(word_length),))
+        return codes, bitmap
+
+    @staticmethod
+    def _contains_codes(sorted_codes: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Pour chaque code, indique s'il est présent dans le tableau trié"""
+        positions = np.searchsorted(sorted_codes, codes)
+        found = positions < len(sorted_codes)
+        found[found] = sorted_codes[positions[found]] == codes[found]
+        return found
+
+    @staticmethod
+    def _prefix_range(sorted_codes: np.ndarray, low: int, high: int) -> np.ndarray:
+        start = int(np.searchsorted(sorted_codes, low, side='left'))
+        end = int(np.searchsorted(sorted_codes, high, side='left'))
+        return sorted_codes[start:end]
+
+    def __contains__(self, word: str) -> bool:
+        if self._codes is None:
+            self.load()
+        word = normalize_word(word)
+        if len(word) != self.word_length:
+            return False
+        code = encode_word(word)
+        if code is None:
+            return False
+        if code in self.extra_codes:
+            return True
+        if self._bitmap is not None:
+            return bool(self._bitmap[code >> 3] >> (code & 7) & 1)
+        return self._has(self._codes, code)
+
+    @staticmethod
+    def _has(sorted_codes: np.ndarray, code: int) -> bool:
+        position = int(np.searchsorted(sorted_codes, code))
+        return position < len(sorted_codes) and int(sorted_codes[position]) == code
+
+    def __len__(self) -> int:
+        if self._codes is None:
+            self.load()
+        return len(self._codes) + len(self._extra)
+
+    def _iter_codes(self, codes: np.ndarray) -> Iterator[int]:
+        for start in range(0, len(codes), self.ITER_CHUNK):
+            yield from codes[start:start + self.ITER_CHUNK].tolist()
+
+    def __iter__(self) -> Iterator[str]:
+        """Mots du lexique (fichier et mots de base), par ordre alphabétique"""
+        if self._codes is None:
+            self.load()
+        for code in heapq.merge(self._iter_codes(self._codes), self._extra.tolist()):
+            yield decode_word(code, self.word_length)
+
+    def complete(self, prefix: str, limit: int = 25, accept: Callable[[str], bool] = None, max_scan: int = 5000) -> List[str]:
+        """
+        Mots commençant par un préfixe (accents ignorés), par ordre alphabétique
+
+        Les codes étant triés dans l'ordre alphabétique, les mots d'un préfixe
+        forment une plage contiguë trouvée par dichotomie (np.searchsorted),
+        dans le fichier comme dans les mots de base.
+
+        Args:
+            prefix: Début du mot tapé par le joueur
+            limit: Nombre maximal de mots retournés
+            accept: Filtre optionnel (ex: contraintes du mode difficile)
+            max_scan: Nombre maximal de mots examinés quand un filtre est donné
+        """
+        if self._codes is None:
+            self.load()
+        prefix = normalize_word(prefix)
+        if len(prefix) > self.word_length:
+            return []
+        code = encode_word(prefix) if prefix else 0
+        if code is None:
+            return []
+
+        shift = LETTER_BITS * (self.word_length - len(prefix))
+        low, high = code << shift, (code + 1) << shift
+        from_file = self._prefix_range(self._codes, low, high)[:max_scan].tolist()
+        from_extra = self._prefix_range(self._extra, low, high)[:max_scan].tolist()
+
+        words = []
+        for code in itertools.islice(heapq.merge(from_file, from_extra), max_scan):
+            word = decode_word(code, self.word_length)
+            if accept is None or accept(word):
+                words.append(word)
+                if len(words) >= limit:
+                    break
+        return words
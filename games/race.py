@@ -0,0 +1,184 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+import discord
+from .scoring import PATTERN_COUNT, decode_pattern
+
+
+class RacePlayer:
+    __slots__ = ("user_id", "name", "codes", "won", "row")
+
+    def __init__(self, user_id: int, name: str):
+        """Progression d'un joueur dans une course (retours seulement, jamais les lettres)"""
+        self.user_id = user_id
+        self.name = name
+        self.codes = bytearray()
+        self.won = False
+        self.row = ""  # ligne du tableau, recalculée à chaque essai du joueur uniquement
+
+
+class WordleRace:
+    MAX_ROWS_SHOWN = 25
+
+    def __init__(self, channel_id: int, word: str, tiles: List[str], max_attempts: int = 6, edit_interval: float = 2.0,
+                 min_players: int = 2, join_window: float = 120.0):
+        """
+        Course Wordle d'un salon : tout le monde cherche le même mot
+
+        Un seul message affiche la progression de tous les joueurs. Les
+        essais ne font que marquer le tableau comme modifié : une tâche
+        unique modifie le message au plus une fois toutes les edit_interval
+        secondes, quel que soit le nombre d'essais entre deux modifications.
+        Chaque ligne de joueur est recalculée seulement quand ce joueur
+        propose un mot ; le tableau n'est assemblé qu'au moment de l'envoi.
+
+        Une course sans gagnant ne se termine quand tous les joueurs ont
+        épuisé leurs essais qu'à partir de min_players joueurs ou après
+        join_window secondes : un joueur seul ne ferme pas la course aux
+        autres. Sinon, elle est abandonnée après idle_timeout (RaceManager).
+
+        Args:
+            channel_id: ID du salon
+            word: Mot à trouver
+            tiles: Carrés emoji de chacun des 243 retours possibles
+            max_attempts: Nombre d'essais par joueur
+            edit_interval: Délai minimal (en secondes) entre deux modifications du message
+            min_players: Nombre de joueurs à partir duquel la course peut se terminer sans gagnant
+            join_window: Durée (en secondes) après laquelle la course peut se terminer sans gagnant
+        """
+        self.channel_id = channel_id
+        self.word = word
+        self.tiles = tiles
+        self.max_attempts = max_attempts
+        self.edit_interval = edit_interval
+        self.min_players = min_players
+        self.join_window = join_window
+        self.players: Dict[int, RacePlayer] = {}  # user_id: joueur, du moins au plus récemment actif
+        self.winners: List[int] = []
+        self.started_at = time.time()
+        self.last_active = self.started_at
+        self.finished = False
+        self.message: Optional[discord.Message] = None
+        self._dirty = False
+        self._last_edit = 0.0
+        self._update_task: Optional[asyncio.Task] = None
+
+    def player(self, user_id: int, name: str) -> RacePlayer:
+        player = self.players.get(user_id)
+        if player is None:
+            player = self.players[user_id] = RacePlayer(user_id, name)
+        return player
+
+    def add_attempt(self, player: RacePlayer, code: int, won: bool):
+        """Ajoute un essai et recalcule la ligne du joueur"""
+        player.codes.append(code)
+        player.won = won
+        self.players[player.user_id] = self.players.pop(player.user_id)
+        self.last_active = time.time()
+        if won:
+            self.winners.append(player.user_id)
+            self.finished = True
+        elif self._can_end_without_winner() and all(self.is_out(p) for p in self.players.values()):
+            # Tous les joueurs ont épuisé leurs essais
+            self.finished = True
+
+        if won:
+            status = "🏆"
+        elif len(player.codes) >= self.max_attempts:
+            status = "❌"
+        else:
+            status = ""
+        player.row = f"{self.tiles[code]} {len(player.codes)}/{self.max_attempts} **{player.name}** {status}".rstrip()
+
+    def is_out(self, player: RacePlayer) -> bool:
+        return player.won or len(player.codes) >= self.max_attempts
+
+    def _can_end_without_winner(self) -> bool:
+        return len(self.players) >= self.min_players or time.time() - self.started_at >= self.join_window
+
+    def create_embed(self) -> discord.Embed:
+        """Crée l'embed du tableau de la course (à partir des lignes déjà calculées)"""
+        if self.finished:
+            if self.winners:
+                winner = self.players[self.winners[0]]
+                title = f"🏁 Course terminée - {winner.name} a gagné !"
+                color = discord.Color.green()
+            else:
+                title = "🏁 Course terminée - personne n'a trouvé"
+                color = discord.Color.red()
+            description = f"Le mot était : **{self.word}**"
+        else:
+            title = "🏁 Course Wordle"
+            color = discord.Color.blue()
+            description = f"Premier à trouver le mot gagne ! Proposez vos mots avec `/essai <mot>` ({self.max_attempts} essais chacun)"
+
+        embed = discord.Embed(title=title, description=description, color=color)
+        rows = [player.row for player in self.players.values() if player.row]
+        if rows:
+            shown = rows[-self.MAX_ROWS_SHOWN:]  # les derniers joueurs actifs, le plus récent en bas
+            if len(rows) > len(shown):
+                shown.insert(0, f"... et {len(rows) - len(shown)} autre(s) joueur(s)")
+            embed.add_field(name=f"Joueurs ({len(rows)})", value="\n".join(shown), inline=False)
+        embed.set_footer(text="Wordle Français - Course")
+        return embed
+
+    def request_update(self):
+        """Programme une modification du message (regroupée avec les suivantes)"""
+        self._dirty = True
+        if self.message is not None and (self._update_task is None or self._update_task.done()):
+            self._update_task = asyncio.create_task(self._update_message())
+
+    async def _update_message(self):
+        while self._dirty:
+            delay = self._last_edit + self.edit_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Tous les essais arrivés pendant l'attente sont inclus dans cette modification
+            self._dirty = False
+            try:
+                await self.message.edit(embed=self.create_embed())
+            except discord.NotFound:
+                # Tableau supprimé : le republier, ou arrêter les mises à jour si c'est impossible
+                try:
+                    self.message = await self.message.channel.send(embed=self.create_embed())
+                except discord.HTTPException as e:
+                    print(f"❌ Erreur lors de la mise à jour de la course Wordle: {e}")
+                    self.message = None
+                    self._dirty = False
+                    return
+            except discord.HTTPException as e:
+                print(f"❌ Erreur lors de la mise à jour de la course Wordle: {e}")
+            self._last_edit = time.monotonic()
+
+
+class RaceManager:
+    def __init__(self, emoji_map: Dict[str, str], idle_timeout: int = 30 * 60):
+        """
+        Courses Wordle en cours, une par salon
+
+        Args:
+            emoji_map: Emoji de chaque statut ('correct', 'present', 'absent')
+            idle_timeout: Durée (en secondes) sans essai avant l'abandon d'une course
+        """
+        self.idle_timeout = idle_timeout
+        self.races: Dict[int, WordleRace] = {}  # channel_id: course
+        # Carrés de chaque retour possible, calculés une fois pour toutes
+        self.tiles = ["".join(emoji_map[status] for status in decode_pattern(code)) for code in range(PATTERN_COUNT)]
+
+    def get(self, channel_id: int) -> Optional[WordleRace]:
+        """Course en cours dans un salon, ou None"""
+        race = self.races.get(channel_id)
+        if race is not None and time.time() - race.last_active > self.idle_timeout:
+            del self.races[channel_id]
+            return None
+        return race
+
+    def start(self, channel_id: int, word: str, max_attempts: int = 6) -> WordleRace:
+        race = self.races[channel_id] = WordleRace(channel_id, word, self.tiles, max_attempts)
+        return race
+
+    def end(self, channel_id: int):
+        self.races.pop(channel_id, None)
+
+    def __len__(self) -> int:
+        return len(self.races)
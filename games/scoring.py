@@ -0,0 +1,199 @@
+import glob
+import hashlib
+import os
+import threading
+from typing import Iterable, List, Optional, Sequence
+import numpy as np
+
+WORD_LENGTH = 5
+PATTERN_COUNT = 3 ** WORD_LENGTH
+ABSENT, PRESENT, CORRECT = 0, 1, 2
+ALL_CORRECT = PATTERN_COUNT - 1
+STATUS_NAMES = ('absent', 'present', 'correct')
+POWERS = 3 ** np.arange(WORD_LENGTH, dtype=np.uint16)
+
+
+def score_pattern(guess: str, answer: str) -> int:
+    """
+    Calcule le code du retour Wordle d'une tentative (version Python, sans matrice)
+
+    Le code est un nombre en base 3 : le chiffre de la position i vaut
+    0 (absent), 1 (présent) ou 2 (correct). 242 = mot trouvé.
+    """
+    statuses = [ABSENT] * len(guess)
+    remaining = {}
+    for i, (guess_letter, answer_letter) in enumerate(zip(guess, answer)):
+        if guess_letter == answer_letter:
+            statuses[i] = CORRECT
+        else:
+            remaining[answer_letter] = remaining.get(answer_letter, 0) + 1
+
+    for i, letter in enumerate(guess):
+        if statuses[i] != CORRECT and remaining.get(letter, 0) > 0:
+            statuses[i] = PRESENT
+            remaining[letter] -= 1
+
+    return sum(status * 3 ** i for i, status in enumerate(statuses))
+
+
+def decode_pattern(code: int, length: int = WORD_LENGTH) -> List[str]:
+    """Convertit un code en liste de statuts ('correct', 'present', 'absent')"""
+    statuses = []
+    for _ in range(length):
+        code, status = divmod(int(code), 3)
+        statuses.append(STATUS_NAMES[status])
+    return statuses
+
+
+def encode_statuses(statuses: Iterable[str]) -> int:
+    """Convertit une liste de statuts en code (inverse de decode_pattern)"""
+    return sum(STATUS_NAMES.index(status) * 3 ** i for i, status in enumerate(statuses))
+
+
+def _words_to_array(words: Sequence[str]) -> np.ndarray:
+    return np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8).reshape(len(words), WORD_LENGTH)
+
+
+def build_pattern_matrix(guesses: Sequence[str], answers: Sequence[str], chunk_size: int = 128) -> np.ndarray:
+    """
+    Calcule le code de chaque couple (tentative, solution), par blocs de tentatives
+
+    Une lettre mal placée est "présente" si la solution contient plus
+    d'exemplaires non verts de cette lettre que la tentative n'en a déjà
+    utilisé avant elle (mêmes règles que score_pattern, doublons compris).
+
+    Returns:
+        np.ndarray: matrice uint8 de forme (len(guesses), len(answers))
+    """
+    guess_letters = _words_to_array(guesses)
+    answer_letters = _words_to_array(answers)[None, :, :]
+    matrix = np.empty((len(guesses), len(answers)), dtype=np.uint8)
+
+    for start in range(0, len(guesses), chunk_size):
+        block = guess_letters[start:start + chunk_size][:, None, :]
+        green = block == answer_letters                       # (bloc, solutions, 5)
+        codes = np.zeros(green.shape[:2], dtype=np.uint16)
+        for i in range(WORD_LENGTH):
+            letter = block[:, :, i:i + 1]
+            available = ((answer_letters == letter) & ~green).sum(axis=2)
+            used_before = ((block[:, :, :i] == letter) & ~green[:, :, :i]).sum(axis=2)
+            present = ~green[:, :, i] & (used_before < available)
+            codes += np.where(green[:, :, i], CORRECT, np.where(present, PRESENT, ABSENT)).astype(np.uint16) * POWERS[i]
+        matrix[start:start + chunk_size] = codes
+    return matrix
+
+
+class ScoringEngine:
+    def __init__(self, words: Sequence[str], cache_dir: str = ".", cache_prefix: str = "wordle_patterns"):
+        """
+        Moteur de score Wordle basé sur une matrice précalculée
+
+        La matrice contient le code du retour (0-242) de chaque couple
+        (tentative, solution) de la liste de mots. Elle est sauvegardée sur
+        disque dans un fichier .npy dont le nom contient l'empreinte du
+        dictionnaire : elle n'est recalculée que si la liste change. Le
+        chargement a lieu au premier usage (ou avec load()).
+
+        Args:
+            words: Liste des mots (majuscules, sans accents)
+            cache_dir: Dossier où sauvegarder la matrice (None pour désactiver)
+            cache_prefix: Préfixe du nom du fichier de cache
+        """
+        self.words = list(dict.fromkeys(words))
+        self.index = {word: i for i, word in enumerate(self.words)}
+        self.cache_dir = cache_dir
+        self.cache_prefix = cache_prefix
+        self.digest = hashlib.blake2b('\n'.join(self.words).encode('utf-8'), digest_size=8).hexdigest()
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    @property
+    def cache_path(self) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{self.cache_prefix}_{self.digest}.npy")
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Matrice (tentatives x solutions) des codes, chargée ou calculée au premier accès"""
+        if self._matrix is None:
+            self.load()
+        return self._matrix
+
+    def load(self):
+        """Charge la matrice depuis le disque, ou la calcule et la sauvegarde"""
+        with self._lock:
+            if self._matrix is not None:
+                return
+            path = self.cache_path
+            if path and os.path.exists(path):
+                try:
+                    matrix = np.load(path)
+                    if matrix.shape == (len(self.words), len(self.words)) and matrix.dtype == np.uint8:
+                        self._matrix = matrix
+                        return
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Cache de la matrice Wordle illisible, recalcul: {e}")
+
+            self._matrix = build_pattern_matrix(self.words, self.words)
+            if path:
+                self._save(path)
+
+    def _save(self, path: str):
+        """Sauvegarde atomique de la matrice et suppression des caches d'anciens dictionnaires"""
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.save(f, self._matrix)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Impossible de sauvegarder la matrice Wordle: {e}")
+            return
+        for old_path in glob.glob(os.path.join(self.cache_dir, f"{self.cache_prefix}_*.npy")):
+            if old_path != path:
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+
+    def pattern(self, guess: str, answer: str) -> int:
+        """Code du retour pour (tentative, solution), lu dans la matrice si les deux mots y sont"""
+        guess_index = self.index.get(guess)
+        answer_index = self.index.get(answer)
+        if guess_index is None or answer_index is None:
+            return score_pattern(guess, answer)
+        return int(self.matrix[guess_index, answer_index])
+
+    def all_candidates(self) -> np.ndarray:
+        """Indices de toutes les solutions possibles"""
+        return np.arange(len(self.words))
+
+    def filter_candidates(self, candidates: np.ndarray, guess: str, code: int) -> np.ndarray:
+        """
+        Garde les solutions compatibles avec le retour obtenu pour une tentative
+
+        Args:
+            candidates: Indices des solutions encore possibles
+            guess: Mot proposé
+            code: Code du retour obtenu
+
+        Returns:
+            np.ndarray: Indices des solutions pour lesquelles guess aurait donné ce code
+        """
+        guess_index = self.index.get(guess)
+        if guess_index is not None:
+            return candidates[self.matrix[guess_index, candidates] == code]
+        # Tentative hors de la matrice : calcul Python sur les candidats restants
+        keep = [score_pattern(guess, self.words[i]) == code for i in candidates]
+        return candidates[np.array(keep, dtype=bool)]
+
+    def candidates_for(self, attempts: Iterable[tuple]) -> np.ndarray:
+        """Solutions compatibles avec une suite de (tentative, code)"""
+        candidates = self.all_candidates()
+        for guess, code in attempts:
+            candidates = self.filter_candidates(candidates, guess, code)
+        return candidates
+
+    def candidate_words(self, candidates: np.ndarray) -> List[str]:
+        """Convertit des indices en mots"""
+        return [self.words[i] for i in candidates]
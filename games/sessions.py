@@ -0,0 +1,545 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from discord.ext import tasks
+from .scoring import decode_pattern
+
+SESSION_COLUMNS = "user_id, word, guesses, codes, max_attempts, won, last_active, daily, hard"
+# Colonnes ajoutées après la première version (bases existantes mises à jour à l'ouverture)
+ADDED_COLUMNS = (("daily", "TEXT"), ("hard", "INTEGER NOT NULL DEFAULT 0"))
+
+
+def prepare_sessions_table(db: sqlite3.Connection):
+    """Crée la table des parties, ou ajoute les colonnes manquantes d'une base plus ancienne"""
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            user_id INTEGER PRIMARY KEY,
+            word TEXT NOT NULL,
+            guesses BLOB NOT NULL,
+            codes BLOB NOT NULL,
+            max_attempts INTEGER NOT NULL,
+            won INTEGER NOT NULL,
+            last_active REAL NOT NULL,
+            daily TEXT,
+            hard INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    columns = [row[1] for row in db.execute("PRAGMA table_info(sessions)")]
+    for column, definition in ADDED_COLUMNS:
+        if column not in columns:
+            db.execute(f"ALTER TABLE sessions ADD COLUMN {column} {definition}")
+
+
+class WordleSession:
+    __slots__ = ("user_id", "word", "guesses", "codes", "max_attempts", "won", "last_active", "daily", "hard", "constraints")
+
+    def __init__(self, user_id: int, word: str, max_attempts: int = 6, guesses: bytes = b"", codes: bytes = b"",
+                 won: bool = False, last_active: float = None, daily: str = None, hard: bool = False):
+        """
+        Partie de Wordle en cours d'un joueur
+
+        Les tentatives sont stockées à la suite dans un bytearray (5 octets
+        ASCII par mot) et leurs retours dans un autre (un code 0-242 par
+        tentative), ce qui tient en quelques dizaines d'octets par partie.
+        """
+        self.user_id = user_id
+        self.word = word
+        self.guesses = bytearray(guesses)
+        self.codes = bytearray(codes)
+        self.max_attempts = max_attempts
+        self.won = won
+        self.last_active = last_active or time.time()
+        self.daily = daily  # "guild_id:date" pour une partie du mot du jour, None sinon
+        self.hard = hard  # mode difficile
+        self.constraints = None  # contraintes du mode difficile (recalculées au besoin, non sauvegardées)
+
+    @property
+    def attempt_count(self) -> int:
+        return len(self.codes)
+
+    @property
+    def finished(self) -> bool:
+        """La partie est gagnée ou n'a plus d'essais"""
+        return self.won or self.attempt_count >= self.max_attempts
+
+    def add_attempt(self, guess: str, code: int):
+        self.guesses += guess.encode("ascii")
+        self.codes.append(code)
+        self.last_active = time.time()
+
+    def history(self) -> List[Tuple[str, int]]:
+        """Tentatives sous forme de (mot, code du retour)"""
+        length = len(self.word)
+        return [
+            (self.guesses[i * length:(i + 1) * length].decode("ascii"), code)
+            for i, code in enumerate(self.codes)
+        ]
+
+    @property
+    def attempts(self) -> List[Tuple[str, list]]:
+        """Tentatives sous forme de (mot, [(lettre, statut), ...]), pour l'affichage"""
+        return [(guess, list(zip(guess, decode_pattern(code, len(guess))))) for guess, code in self.history()]
+
+    def to_row(self) -> tuple:
+        return (self.user_id, self.word, bytes(self.guesses), bytes(self.codes), self.max_attempts, int(self.won), self.last_active, self.daily, int(self.hard))
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "WordleSession":
+        user_id, word, guesses, codes, max_attempts, won, last_active, daily, hard = row
+        return cls(user_id, word, max_attempts, guesses, codes, bool(won), last_active, daily, bool(hard))
+
+
+class SessionBackend:
+    """
+    Stockage des parties en cours
+
+    Toute modification d'une partie passe par update(), qui applique la
+    modification de façon atomique : deux /guess simultanés d'un même
+    joueur ne peuvent pas partir du même état, même s'ils sont traités
+    par deux processus différents (avec SharedSessionStore). Une partie
+    terminée par la modification est supprimée dans la même opération.
+
+    Les méthodes sont des coroutines : un stockage qui accède au disque le
+    fait dans un thread, sans bloquer la boucle d'événements. apply peut
+    donc être appelé hors de la boucle et ne doit modifier que la partie.
+    """
+
+    async def get(self, user_id: int) -> Optional[WordleSession]:
+        """Partie en cours d'un joueur, ou None"""
+        raise NotImplementedError
+
+    async def create(self, user_id: int, word: str, max_attempts: int = 6, daily: str = None, hard: bool = False,
+                     replace: bool = True) -> Optional[WordleSession]:
+        """Crée la partie d'un joueur (None si replace est faux et qu'une partie est déjà en cours)"""
+        raise NotImplementedError
+
+    async def update(self, user_id: int, apply: Callable[[WordleSession], Any]) -> Any:
+        """Modifie la partie d'un joueur avec apply(partie) et retourne son résultat (None si aucune partie)"""
+        raise NotImplementedError
+
+    async def pop(self, user_id: int) -> Optional[WordleSession]:
+        """Supprime la partie d'un joueur et la retourne (None si aucune partie)"""
+        raise NotImplementedError
+
+    async def delete(self, user_id: int):
+        """Supprime la partie d'un joueur"""
+        await self.pop(user_id)
+
+    def start(self):
+        """Démarre les tâches de fond du stockage"""
+
+    async def close(self):
+        """Arrête les tâches de fond et ferme le stockage"""
+
+
+class SessionStore(SessionBackend):
+    def __init__(self, db_path: str = "wordle_sessions.db", idle_timeout: int = 24 * 3600, max_sessions: int = 10000,
+                 flush_interval: int = 30):
+        """
+        Parties de Wordle en cours, bornées en mémoire et sauvegardées dans SQLite (un seul processus)
+
+        Les modifications sont gardées en mémoire et écrites par lots toutes
+        les flush_interval secondes (write-behind) : un /guess n'attend
+        jamais le disque. Une partie sans activité depuis idle_timeout
+        secondes est supprimée. Au-delà de max_sessions parties en mémoire,
+        les moins récemment utilisées ne sont gardées que dans SQLite et
+        rechargées à la demande.
+
+        Les identifiants des joueurs ayant une partie dans SQLite sont
+        chargés au démarrage : un joueur sans partie n'entraîne aucune
+        lecture du disque. Les rechargements passent par une connexion de
+        lecture séparée (WAL), qui n'attend jamais la fin d'un flush.
+
+        Args:
+            db_path: Fichier SQLite (None pour ne rien sauvegarder)
+            idle_timeout: Durée (en secondes) d'inactivité avant suppression d'une partie
+            max_sessions: Nombre maximal de parties gardées en mémoire
+            flush_interval: Intervalle (en secondes) entre deux écritures sur disque
+        """
+        self.db_path = db_path
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.sessions: "OrderedDict[int, WordleSession]" = OrderedDict()  # user_id: partie, du moins au plus récemment utilisé
+        self._dirty: Dict[int, Optional[tuple]] = {}  # user_id: ligne à écrire (None = à supprimer)
+        self._writing: Dict[int, Optional[tuple]] = {}  # lignes en cours d'écriture (flush pas encore validé)
+        self._flushes = 0  # nombre de flush terminés (pour détecter un flush pendant une lecture)
+        self._db_lock = threading.Lock()
+        self._db = None  # connexion ouverte au premier usage
+        self._read_lock = threading.Lock()
+        self._reader = None  # connexion de lecture, ouverte au premier rechargement
+        # Joueurs dont la partie est dans SQLite ou en attente d'écriture (None tant que non chargé)
+        self._stored_ids: Optional[Set[int]] = None if db_path else set()
+        self.flush_loop.change_interval(seconds=flush_interval)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connexion SQLite (créée avec la table au premier appel, sous _db_lock)"""
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            prepare_sessions_table(self._db)
+            self._db.commit()
+        return self._db
+
+    def _read_connection(self) -> sqlite3.Connection:
+        """Connexion de lecture (sous _read_lock), indépendante des écritures en cours"""
+        if self._reader is None:
+            with self._db_lock:
+                self._connection()  # table créée et base passée en WAL
+            self._reader = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._reader
+
+    def _is_idle(self, session: WordleSession, now: float) -> bool:
+        return now - session.last_active > self.idle_timeout
+
+    def _cached(self, user_id: int) -> Tuple[bool, Optional[WordleSession]]:
+        """Partie gardée en mémoire ou en attente d'écriture : (trouvée, partie)"""
+        session = self.sessions.get(user_id)
+        if session is not None:
+            return True, session
+        for pending in (self._dirty, self._writing):
+            if user_id in pending:
+                # Sortie de la mémoire mais pas encore écrite : repartir de la ligne en attente
+                row = pending[user_id]
+                return True, WordleSession.from_row(row) if row else None
+        return False, None
+
+    async def get(self, user_id: int) -> Optional[WordleSession]:
+        """Partie en cours d'un joueur (rechargée depuis SQLite dans un thread si besoin), ou None"""
+        found, session = self._cached(user_id)
+        if not found:
+            if self._stored_ids is not None and user_id not in self._stored_ids:
+                # Aucune partie sauvegardée : inutile d'interroger SQLite
+                return None
+            while True:
+                flushes = self._flushes
+                loaded = await self._load(user_id)
+                # Pendant la lecture, la partie a pu être recréée, modifiée ou supprimée
+                found, session = self._cached(user_id)
+                # Un flush terminé pendant la lecture a pu écrire une version plus récente que celle lue : relire
+                if found or self._flushes == flushes:
+                    break
+            if not found:
+                session = loaded
+                if session is None and self._stored_ids is not None:
+                    self._stored_ids.discard(user_id)  # partie supprimée par le nettoyage des parties abandonnées
+        if session is None:
+            return None
+        if self._is_idle(session, time.time()):
+            self._forget(user_id)
+            return None
+        self._remember(session)
+        return session
+
+    async def create(self, user_id: int, word: str, max_attempts: int = 6, daily: str = None, hard: bool = False,
+                     replace: bool = True) -> Optional[WordleSession]:
+        """Crée (ou remplace) la partie d'un joueur"""
+        if not replace and await self.get(user_id) is not None:
+            return None
+        session = WordleSession(user_id, word, max_attempts, daily=daily, hard=hard)
+        self._remember(session)
+        self.mark_dirty(session)
+        return session
+
+    async def update(self, user_id: int, apply: Callable[[WordleSession], Any]) -> Any:
+        """Modifie la partie d'un joueur (atomique : apply est appelé sans céder la main à la boucle d'événements)"""
+        session = await self.get(user_id)
+        if session is None:
+            return None
+        result = apply(session)
+        if session.finished:
+            self._forget(user_id)
+        else:
+            self.mark_dirty(session)
+        return result
+
+    async def pop(self, user_id: int) -> Optional[WordleSession]:
+        session = await self.get(user_id)
+        if session is not None:
+            self._forget(user_id)
+        return session
+
+    def mark_dirty(self, session: WordleSession):
+        """Programme l'écriture de la partie au prochain flush"""
+        self._dirty[session.user_id] = session.to_row()
+        if self._stored_ids is not None:
+            self._stored_ids.add(session.user_id)
+
+    def _forget(self, user_id: int):
+        """Supprime la partie d'un joueur (de la mémoire, puis de SQLite au prochain flush)"""
+        self.sessions.pop(user_id, None)
+        self._dirty[user_id] = None
+        if self._stored_ids is not None:
+            self._stored_ids.discard(user_id)
+
+    def _remember(self, session: WordleSession):
+        self.sessions[session.user_id] = session
+        self.sessions.move_to_end(session.user_id)
+        # Trop de parties en mémoire : les plus anciennes restent dans SQLite (ou dans la file d'écriture)
+        while len(self.sessions) > self.max_sessions:
+            _, oldest = self.sessions.popitem(last=False)
+            if oldest.user_id in self._dirty:
+                self._dirty[oldest.user_id] = oldest.to_row()
+
+    def _read_row(self, user_id: int) -> Optional[tuple]:
+        with self._read_lock:
+            return self._read_connection().execute(
+                f"SELECT {SESSION_COLUMNS} FROM sessions WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+
+    async def _load(self, user_id: int) -> Optional[WordleSession]:
+        if not self.db_path:
+            return None
+        row = await asyncio.to_thread(self._read_row, user_id)
+        return WordleSession.from_row(row) if row else None
+
+    def _read_ids(self) -> Set[int]:
+        with self._read_lock:
+            rows = self._read_connection().execute(
+                "SELECT user_id FROM sessions WHERE last_active >= ?",
+                (time.time() - self.idle_timeout,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    async def load_ids(self):
+        """Charge (dans un thread) les identifiants des joueurs ayant une partie sauvegardée"""
+        if self._stored_ids is not None:
+            return
+        try:
+            stored_ids = await asyncio.to_thread(self._read_ids)
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors du chargement des parties Wordle: {e}")
+            return
+        # Appliquer les modifications faites pendant la lecture
+        for user_id, row in {**self._writing, **self._dirty}.items():
+            if row is None:
+                stored_ids.discard(user_id)
+            else:
+                stored_ids.add(user_id)
+        self._stored_ids = stored_ids
+
+    def evict_idle(self):
+        """Supprime de la mémoire les parties abandonnées (sans activité depuis idle_timeout)"""
+        now = time.time()
+        for user_id in [user_id for user_id, session in self.sessions.items() if self._is_idle(session, now)]:
+            self._forget(user_id)
+
+    def _write(self, rows: Dict[int, Optional[tuple]]):
+        """Écrit un lot de modifications en une seule transaction (appelé dans un thread)"""
+        upserts = [row for row in rows.values() if row is not None]
+        deletes = [(user_id,) for user_id, row in rows.items() if row is None]
+        with self._db_lock:
+            db = self._connection()
+            with db:
+                if upserts:
+                    db.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", upserts)
+                if deletes:
+                    db.executemany("DELETE FROM sessions WHERE user_id = ?", deletes)
+                db.execute("DELETE FROM sessions WHERE last_active < ?", (time.time() - self.idle_timeout,))
+
+    async def flush(self):
+        """Écrit les modifications en attente sans bloquer la boucle d'événements"""
+        if not self._dirty:
+            return
+        rows, self._dirty = self._dirty, {}
+        if not self.db_path:
+            return
+        # Lignes encore visibles par get() jusqu'à la fin de la transaction
+        self._writing = rows
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la sauvegarde des parties Wordle: {e}")
+            # Remettre le lot en file sans écraser les modifications plus récentes
+            for user_id, row in rows.items():
+                self._dirty.setdefault(user_id, row)
+        finally:
+            self._writing = {}
+            self._flushes += 1
+
+    @tasks.loop(seconds=30)
+    async def flush_loop(self):
+        """Nettoie les parties abandonnées et écrit les modifications par lots"""
+        self.evict_idle()
+        await self.flush()
+
+    @flush_loop.before_loop
+    async def before_flush_loop(self):
+        await self.load_ids()
+
+    def start(self):
+        """Démarre l'écriture périodique"""
+        if not self.flush_loop.is_running():
+            self.flush_loop.start()
+
+    async def close(self):
+        """Arrête l'écriture périodique et écrit les dernières modifications"""
+        self.flush_loop.cancel()
+        await self.flush()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+        with self._read_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+
+class SharedSessionStore(SessionBackend):
+    def __init__(self, db_path: str = "wordle_sessions.db", idle_timeout: int = 24 * 3600, busy_timeout: float = 5.0,
+                 cleanup_interval: int = 600):
+        """
+        Parties de Wordle partagées entre plusieurs processus (shards, instance de secours)
+
+        Contrairement à SessionStore, rien n'est gardé en mémoire : chaque
+        lecture et chaque modification passe par le fichier SQLite, en mode
+        WAL (les lectures ne bloquent pas les écritures). Une modification
+        relit la partie et l'écrit dans une même transaction BEGIN IMMEDIATE :
+        un seul processus à la fois peut modifier une partie, et il part
+        toujours de la dernière version écrite. Les transactions ne durent
+        que quelques dizaines de microsecondes sur un disque local.
+
+        Chaque accès au fichier est fait dans un thread : quand un autre
+        processus garde le verrou d'écriture (jusqu'à busy_timeout
+        secondes), seul l'appel en cours attend, pas la boucle d'événements.
+
+        Args:
+            db_path: Fichier SQLite partagé (sur un disque local : le mode WAL ne fonctionne pas en réseau)
+            idle_timeout: Durée (en secondes) d'inactivité avant suppression d'une partie
+            busy_timeout: Attente maximale (en secondes) quand un autre processus écrit
+            cleanup_interval: Intervalle (en secondes) entre deux suppressions des parties abandonnées
+        """
+        self.db_path = db_path
+        self.idle_timeout = idle_timeout
+        self.busy_timeout = busy_timeout
+        self._db_lock = threading.Lock()
+        self._db = None  # connexion ouverte au premier usage
+        self.cleanup_loop.change_interval(seconds=cleanup_interval)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connexion SQLite en mode WAL, transactions gérées explicitement (sous _db_lock)"""
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            with self._transaction_on(self._db):
+                prepare_sessions_table(self._db)
+        return self._db
+
+    @staticmethod
+    @contextmanager
+    def _transaction_on(db: sqlite3.Connection):
+        # IMMEDIATE : le verrou d'écriture est pris avant la lecture
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+            db.execute("COMMIT")
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+
+    @contextmanager
+    def _transaction(self):
+        with self._db_lock:
+            with self._transaction_on(self._connection()) as db:
+                yield db
+
+    def _read(self, db: sqlite3.Connection, user_id: int) -> Optional[WordleSession]:
+        row = db.execute(f"SELECT {SESSION_COLUMNS} FROM sessions WHERE user_id = ?", (user_id,)).fetchone()
+        if row is None:
+            return None
+        session = WordleSession.from_row(row)
+        if time.time() - session.last_active > self.idle_timeout:
+            return None
+        return session
+
+    @staticmethod
+    def _save(db: sqlite3.Connection, session: WordleSession):
+        db.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", session.to_row())
+
+    def _get(self, user_id: int) -> Optional[WordleSession]:
+        with self._db_lock:
+            return self._read(self._connection(), user_id)
+
+    def _create(self, user_id: int, word: str, max_attempts: int, daily: Optional[str], hard: bool,
+                replace: bool) -> Optional[WordleSession]:
+        with self._transaction() as db:
+            if not replace and self._read(db, user_id) is not None:
+                return None
+            session = WordleSession(user_id, word, max_attempts, daily=daily, hard=hard)
+            self._save(db, session)
+        return session
+
+    def _update(self, user_id: int, apply: Callable[[WordleSession], Any]) -> Any:
+        with self._transaction() as db:
+            session = self._read(db, user_id)
+            if session is None:
+                return None
+            result = apply(session)
+            if session.finished:
+                db.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+            else:
+                self._save(db, session)
+        return result
+
+    def _pop(self, user_id: int) -> Optional[WordleSession]:
+        with self._transaction() as db:
+            session = self._read(db, user_id)
+            db.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+        return session
+
+    async def get(self, user_id: int) -> Optional[WordleSession]:
+        return await asyncio.to_thread(self._get, user_id)
+
+    async def create(self, user_id: int, word: str, max_attempts: int = 6, daily: str = None, hard: bool = False,
+                     replace: bool = True) -> Optional[WordleSession]:
+        return await asyncio.to_thread(self._create, user_id, word, max_attempts, daily, hard, replace)
+
+    async def update(self, user_id: int, apply: Callable[[WordleSession], Any]) -> Any:
+        return await asyncio.to_thread(self._update, user_id, apply)
+
+    async def pop(self, user_id: int) -> Optional[WordleSession]:
+        return await asyncio.to_thread(self._pop, user_id)
+
+    def _delete_idle(self):
+        with self._transaction() as db:
+            db.execute("DELETE FROM sessions WHERE last_active < ?", (time.time() - self.idle_timeout,))
+
+    @tasks.loop(seconds=600)
+    async def cleanup_loop(self):
+        """Supprime les parties abandonnées"""
+        try:
+            await asyncio.to_thread(self._delete_idle)
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors du nettoyage des parties Wordle: {e}")
+
+    def start(self):
+        """Démarre le nettoyage périodique"""
+        if not self.cleanup_loop.is_running():
+            self.cleanup_loop.start()
+
+    def _close_connection(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    async def close(self):
+        """Arrête le nettoyage périodique et ferme la connexion"""
+        self.cleanup_loop.cancel()
+        await asyncio.to_thread(self._close_connection)
+
+    def __len__(self) -> int:
+        with self._db_lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM sessions WHERE last_active >= ?", (time.time() - self.idle_timeout,)
+            ).fetchone()[0]
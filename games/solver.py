@@ -0,0 +1,92 @@
+from typing import Callable, Iterable, List, Optional, Tuple
+import numpy as np
+from .scoring import PATTERN_COUNT, ScoringEngine
+
+
+class WordleSolver:
+    def __init__(self, engine: ScoringEngine):
+        """
+        Solveur Wordle par maximisation de l'information attendue
+
+        Pour chaque tentative possible, on regarde comment elle répartit les
+        solutions restantes entre les 243 retours possibles : la meilleure est
+        celle dont la répartition a la plus grande entropie. Le calcul est
+        vectorisé sur la matrice du moteur de score et doit être lancé hors
+        de la boucle d'événements (asyncio.to_thread).
+
+        Args:
+            engine: Moteur de score contenant la matrice des retours
+        """
+        self.engine = engine
+        self._opening: Optional[Tuple[str, float]] = None
+        self._opening_digest = None
+
+    def entropies(self, candidates: np.ndarray) -> np.ndarray:
+        """Entropie (en bits) de la répartition des candidats pour chaque tentative du dictionnaire"""
+        patterns = self.engine.matrix[:, candidates].astype(np.int64)
+        rows = patterns.shape[0]
+        # Histogramme des retours de chaque ligne en un seul bincount (décalage de 243 par ligne)
+        offsets = np.arange(rows, dtype=np.int64)[:, None] * PATTERN_COUNT
+        counts = np.bincount((patterns + offsets).ravel(), minlength=rows * PATTERN_COUNT)
+        probabilities = counts.reshape(rows, PATTERN_COUNT) / len(candidates)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terms = np.where(probabilities > 0, probabilities * np.log2(probabilities), 0.0)
+        return -terms.sum(axis=1)
+
+    def best_guess(self, candidates: np.ndarray, allowed: np.ndarray = None) -> Tuple[str, float]:
+        """
+        Meilleure tentative pour une liste de solutions possibles
+
+        À entropie égale, un mot qui peut encore être la solution est préféré.
+        allowed (masque sur le dictionnaire) limite les tentatives proposées,
+        ex: mode difficile ; les solutions possibles y sont toujours permises.
+
+        Returns:
+            tuple: (mot, information attendue en bits)
+        """
+        if len(candidates) <= 2:
+            return self.engine.words[candidates[0]], float(len(candidates) - 1)
+
+        scores = self.entropies(candidates)
+        is_candidate = np.zeros(len(self.engine.words), dtype=bool)
+        is_candidate[candidates] = True
+        # Petit bonus pour départager les ex aequo en faveur des solutions possibles
+        ranking = scores + is_candidate * 1e-6
+        if allowed is not None:
+            ranking = np.where(allowed | is_candidate, ranking, -np.inf)
+        best = int(np.argmax(ranking))
+        return self.engine.words[best], float(scores[best])
+
+    def opening_guess(self) -> Tuple[str, float]:
+        """Meilleur premier mot (calculé une fois par dictionnaire)"""
+        if self._opening is None or self._opening_digest != self.engine.digest:
+            self._opening = self.best_guess(self.engine.all_candidates())
+            self._opening_digest = self.engine.digest
+        return self._opening
+
+    def suggest(self, history: Iterable[Tuple[str, int]],
+                accept: Callable[[str], bool] = None) -> Tuple[Optional[str], List[str], float]:
+        """
+        Propose la prochaine tentative à partir des essais d'une partie
+
+        Args:
+            history: Essais de la partie, sous forme de (mot, code du retour) (WordleSession.history())
+            accept: Filtre optionnel des tentatives proposées (ex: contraintes du mode difficile)
+
+        Returns:
+            tuple: (mot conseillé ou None si aucune solution ne correspond,
+                    solutions encore possibles, information attendue en bits)
+        """
+        history = list(history)
+        if not history:
+            word, bits = self.opening_guess()
+            return word, self.engine.words, bits
+
+        candidates = self.engine.candidates_for(history)
+        if len(candidates) == 0:
+            return None, [], 0.0
+        allowed = None
+        if accept is not None:
+            allowed = np.fromiter((accept(word) for word in self.engine.words), dtype=bool, count=len(self.engine.words))
+        word, bits = self.best_guess(candidates, allowed)
+        return word, self.engine.candidate_words(candidates), bits
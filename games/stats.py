@@ -0,0 +1,261 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import discord
+from discord.ext import tasks
+
+
+class PlayerStats:
+    __slots__ = ("user_id", "played", "wins", "current_streak", "max_streak", "distribution")
+
+    def __init__(self, user_id: int, played: int = 0, wins: int = 0, current_streak: int = 0, max_streak: int = 0,
+                 distribution: List[int] = None, max_attempts: int = 6):
+        """Statistiques Wordle d'un joueur (parties, victoires, séries, répartition des essais)"""
+        self.user_id = user_id
+        self.played = played
+        self.wins = wins
+        self.current_streak = current_streak
+        self.max_streak = max_streak
+        self.distribution = list(distribution) if distribution else [0] * max_attempts
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.played if self.played else 0.0
+
+    def add(self, won: bool, attempts: int):
+        self.played += 1
+        if won:
+            self.wins += 1
+            self.current_streak += 1
+            self.max_streak = max(self.max_streak, self.current_streak)
+            self.distribution[attempts - 1] += 1
+        else:
+            self.current_streak = 0
+
+    def to_row(self) -> tuple:
+        return (self.user_id, self.played, self.wins, self.current_streak, self.max_streak,
+                ",".join(map(str, self.distribution)), time.time())
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "PlayerStats":
+        user_id, played, wins, current_streak, max_streak, distribution = row[:6]
+        return cls(user_id, played, wins, current_streak, max_streak, [int(count) for count in distribution.split(",")])
+
+
+class StatsStore:
+    def __init__(self, db_path: str = "wordle_stats.db", flush_interval: int = 30, cache_size: int = 5000, max_attempts: int = 6):
+        """
+        Statistiques Wordle des joueurs, sauvegardées par lots dans SQLite
+
+        Chaque partie terminée met à jour les compteurs du joueur en mémoire
+        (cache LRU) ; les joueurs modifiés sont écrits en une transaction
+        toutes les flush_interval secondes. Le classement s'appuie sur un
+        index SQLite (victoires, parties) complété par les modifications pas
+        encore écrites : aucune lecture de l'historique complet.
+        L'écriture rejoue les parties en attente sur la ligne déjà en base,
+        dans la même transaction : plusieurs processus peuvent partager le
+        même fichier sans écraser les parties comptées par les autres.
+        Les lectures se font dans un thread, sur une connexion séparée (WAL) :
+        elles n'attendent ni la boucle d'événements ni un flush en cours.
+
+        Args:
+            db_path: Fichier SQLite (None pour garder les statistiques en mémoire uniquement)
+            flush_interval: Intervalle (en secondes) entre deux écritures sur disque
+            cache_size: Nombre de joueurs gardés en mémoire
+            max_attempts: Nombre d'essais d'une partie
+        """
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self.max_attempts = max_attempts
+        self.cache: "OrderedDict[int, PlayerStats]" = OrderedDict()  # user_id: statistiques
+        self._dirty: Dict[int, PlayerStats] = {}  # joueurs modifiés depuis la dernière écriture
+        self._results: Dict[int, List[Tuple[bool, int]]] = {}  # user_id: parties (won, attempts) pas encore écrites
+        self._db_lock = threading.Lock()
+        self._db = None  # connexion ouverte au premier usage
+        self._read_lock = threading.Lock()
+        self._reader = None  # connexion de lecture, ouverte à la première lecture
+        self.flush_loop.change_interval(seconds=flush_interval)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connexion SQLite (créée avec la table au premier appel, sous _db_lock)"""
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS player_stats (
+                    user_id INTEGER PRIMARY KEY,
+                    played INTEGER NOT NULL,
+                    wins INTEGER NOT NULL,
+                    current_streak INTEGER NOT NULL,
+                    max_streak INTEGER NOT NULL,
+                    distribution TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS player_stats_ranking ON player_stats (wins DESC, played ASC)")
+            self._db.commit()
+        return self._db
+
+    def _read_connection(self) -> sqlite3.Connection:
+        """Connexion de lecture (sous _read_lock), indépendante des écritures en cours"""
+        if self._reader is None:
+            with self._db_lock:
+                self._connection()  # table créée et base passée en WAL
+            self._reader = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._reader
+
+    async def get(self, user_id: int) -> PlayerStats:
+        """Statistiques d'un joueur (lues dans un thread si besoin ; un joueur inconnu a des statistiques vides)"""
+        stats = self._dirty.get(user_id) or self.cache.get(user_id)
+        if stats is None:
+            loaded = await self._load(user_id)
+            # Pendant la lecture, une autre partie du joueur a pu le mettre en cache
+            stats = self._dirty.get(user_id) or self.cache.get(user_id)
+            if stats is None:
+                stats = loaded or PlayerStats(user_id, max_attempts=self.max_attempts)
+        self.cache[user_id] = stats
+        self.cache.move_to_end(user_id)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return stats
+
+    def _read_row(self, user_id: int) -> Optional[PlayerStats]:
+        with self._read_lock:
+            return self._read(self._read_connection(), user_id)
+
+    async def _load(self, user_id: int) -> Optional[PlayerStats]:
+        if not self.db_path:
+            return None
+        return await asyncio.to_thread(self._read_row, user_id)
+
+    @staticmethod
+    def _read(db: sqlite3.Connection, user_id: int) -> Optional[PlayerStats]:
+        row = db.execute(
+            "SELECT user_id, played, wins, current_streak, max_streak, distribution FROM player_stats WHERE user_id = ?",
+            (user_id,)
+        ).fetchone()
+        return PlayerStats.from_row(row) if row else None
+
+    async def record(self, user_id: int, won: bool, attempts: int):
+        """Compte une partie terminée (gagnée en attempts essais, ou perdue/abandonnée)"""
+        stats = await self.get(user_id)
+        stats.add(won, attempts)
+        self._dirty[user_id] = stats
+        if self.db_path:
+            self._results.setdefault(user_id, []).append((won, attempts))
+
+    def _read_top(self, limit: int) -> List[tuple]:
+        with self._read_lock:
+            return self._read_connection().execute(
+                "SELECT user_id, played, wins, current_streak, max_streak, distribution FROM player_stats "
+                "ORDER BY wins DESC, played ASC LIMIT ?",
+                (limit,)
+            ).fetchall()
+
+    async def top(self, limit: int = 10) -> List[PlayerStats]:
+        """Meilleurs joueurs (victoires puis moins de parties), via l'index et les modifications en attente"""
+        rows = []
+        if self.db_path:
+            # Les joueurs modifiés peuvent apparaître avec des valeurs périmées : en lire assez pour compenser
+            rows = await asyncio.to_thread(self._read_top, limit + len(self._dirty))
+        players = {row[0]: PlayerStats.from_row(row) for row in rows}
+        players.update(self._dirty)
+        ranking = sorted(players.values(), key=lambda stats: (-stats.wins, stats.played))
+        return [stats for stats in ranking if stats.played][:limit]
+
+    def _write(self, results: Dict[int, List[Tuple[bool, int]]]) -> Dict[int, PlayerStats]:
+        """Ajoute les parties en attente aux lignes en base, en une transaction (appelé dans un thread)"""
+        merged = {}
+        with self._db_lock:
+            db = self._connection()
+            with db:
+                # Verrou d'écriture pris avant la lecture : un autre processus ne peut pas modifier ces lignes entre-temps
+                db.execute("BEGIN IMMEDIATE")
+                for user_id, games in results.items():
+                    stats = self._read(db, user_id) or PlayerStats(user_id, max_attempts=self.max_attempts)
+                    for won, attempts in games:
+                        stats.add(won, attempts)
+                    merged[user_id] = stats
+                db.executemany("INSERT OR REPLACE INTO player_stats VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               [stats.to_row() for stats in merged.values()])
+        return merged
+
+    async def flush(self):
+        """Écrit les parties en attente en une transaction, sans bloquer la boucle d'événements"""
+        # Sans base, les joueurs modifiés restent dans _dirty (seule copie complète)
+        if not self._results or not self.db_path:
+            return
+        results, self._results = self._results, {}
+        try:
+            merged = await asyncio.to_thread(self._write, results)
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la sauvegarde des statistiques Wordle: {e}")
+            for user_id, games in results.items():
+                self._results[user_id] = games + self._results.get(user_id, [])
+            return
+        # Les joueurs sans nouvelle partie pendant l'écriture reprennent la version en base
+        for user_id, stats in merged.items():
+            if user_id not in self._results:
+                self._dirty.pop(user_id, None)
+                if user_id in self.cache:
+                    self.cache[user_id] = stats
+
+    @tasks.loop(seconds=30)
+    async def flush_loop(self):
+        """Écrit les statistiques modifiées par lots"""
+        await self.flush()
+
+    def start(self):
+        """Démarre l'écriture périodique"""
+        if not self.flush_loop.is_running():
+            self.flush_loop.start()
+
+    async def close(self):
+        """Arrête l'écriture périodique et écrit les dernières statistiques"""
+        self.flush_loop.cancel()
+        await self.flush()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+        with self._read_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    async def create_stats_embed(self, user_id: int, user_name: str) -> discord.Embed:
+        """Crée l'embed des statistiques d'un joueur"""
+        stats = await self.get(user_id)
+        embed = discord.Embed(title=f"📊 Statistiques Wordle - {user_name}", color=discord.Color.blue())
+
+        if not stats.played:
+            embed.description = "Aucune partie terminée pour le moment. Utilisez `/wordle` pour jouer !"
+            return embed
+
+        embed.add_field(name="Parties", value=str(stats.played))
+        embed.add_field(name="Victoires", value=f"{stats.win_rate:.0%}")
+        embed.add_field(name="Série", value=f"{stats.current_streak} (max {stats.max_streak})")
+
+        biggest = max(max(stats.distribution), 1)
+        lines = [
+            f"``{attempts}`` {'🟩' * max(round(count / biggest * 10), 1 if count else 0)} {count}"
+            for attempts, count in enumerate(stats.distribution, start=1)
+        ]
+        embed.add_field(name="Répartition des essais", value="\n".join(lines), inline=False)
+        return embed
+
+    async def create_top_embed(self, get_name: Callable[[int], str], limit: int = 10) -> discord.Embed:
+        """Crée l'embed du classement global (get_name: user_id -> nom affiché)"""
+        embed = discord.Embed(title="🏆 Classement Wordle", color=discord.Color.gold())
+        ranking = await self.top(limit)
+        if not ranking:
+            embed.description = "Aucune partie terminée pour le moment."
+            return embed
+        embed.description = "\n".join(
+            f"**{position}.** {get_name(stats.user_id)} - {stats.wins} victoire(s) sur {stats.played} ({stats.win_rate:.0%})"
+            for position, stats in enumerate(ranking, start=1)
+        )
+        return embed
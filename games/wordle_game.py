@@ -1,110 +1,244 @@
 import discord
 import random
-from typing import Dict, Optional
-import unicodedata
+from datetime import date
+from typing import Callable, List, Optional
 from .dico import MOTS_5_LETTRES
+from .lexicon import DEFAULT_LEXICON_PATH, PackedLexicon, normalize_word
+from .scoring import ScoringEngine, decode_pattern
+from .solver import WordleSolver
+from .sessions import SessionBackend, SessionStore, WordleSession
+from .daily import DailyResults, daily_key, daily_word, today
+from .stats import StatsStore
+from .constraints import ConstraintIndex, Constraints
+from .race import RaceManager, WordleRace
 
 class WordleGame:
-    def __init__(self):
-        self.active_games: Dict[int, dict] = {}  # user_id: game_data
+    # Emojis pour les lettres
+    EMOJI_MAP = {
+        'correct': '🟩',
+        'present': '🟨',
+        'absent': '⬛'
+    }
+
+    def __init__(self, lexicon_path: str = DEFAULT_LEXICON_PATH, sessions_path: str = "wordle_sessions.db",
+                 sessions: SessionBackend = None):
+        # Parties en cours : par défaut bornées en mémoire, abandonnées après 24h d'inactivité, sauvegardées dans SQLite
+        # (SharedSessionStore pour partager les parties entre plusieurs processus)
+        self.sessions = sessions if sessions is not None else SessionStore(sessions_path)
         
-        # Importer la liste de mots depuis dico.py
+        # Solutions possibles : la liste de dico.py
         self.word_list = MOTS_5_LETTRES
+        self.answer_set = frozenset(self.word_list)
+
+        # Mots acceptés comme tentative : le lexique complet (chargé au premier usage) + les solutions
+        self.allowed_guesses = PackedLexicon(lexicon_path, word_length=5, extra_words=self.word_list)
+
+        # Matrice des retours précalculée (chargée depuis le disque au premier usage)
+        self.scoring = ScoringEngine(self.word_list)
+        self.solver = WordleSolver(self.scoring)
+
+        # Résultats du mot du jour, agrégés par serveur
+        self.daily = DailyResults()
+
+        # Statistiques des joueurs (parties, victoires, séries)
+        self.stats = StatsStore()
+
+        # Courses en cours, une par salon
+        self.races = RaceManager(self.EMOJI_MAP)
+
+        # Index des contraintes du mode difficile (construit au premier usage)
+        self._constraint_index = None
+
+    @property
+    def constraint_index(self) -> ConstraintIndex:
+        """Index des solutions par position, lettre et nombre d'exemplaires"""
+        if self._constraint_index is None:
+            self._constraint_index = ConstraintIndex(self.word_list)
+        return self._constraint_index
     
     def normalize_text(self, text: str) -> str:
         """Normalise le texte en retirant les accents et en mettant en majuscule"""
-        text = text.upper()
-        return ''.join(
-            c for c in unicodedata.normalize('NFD', text)
-            if unicodedata.category(c) != 'Mn'
-        )
+        return normalize_word(text)
+
+    def is_valid_guess(self, word: str) -> bool:
+        """Vérifie qu'un mot normalisé est une solution possible ou un mot du lexique"""
+        return word in self.answer_set or word in self.allowed_guesses
     
-    def start_game(self, user_id: int) -> str:
-        """Démarre une nouvelle partie de Wordle"""
+    async def start_game(self, user_id: int, hard: bool = False) -> Optional[WordleSession]:
+        """Démarre une nouvelle partie de Wordle (hard: mode difficile). Retourne None si une partie est déjà en cours"""
         word = random.choice(self.word_list)
-        self.active_games[user_id] = {
-            'word': word,
-            'attempts': [],
-            'max_attempts': 6,
-            'won': False
-        }
-        return word
+        return await self.sessions.create(user_id, word, max_attempts=6, hard=hard, replace=False)
     
-    def get_game(self, user_id: int) -> Optional[dict]:
+    async def start_daily_game(self, user_id: int, guild_id: int) -> Optional[WordleSession]:
+        """Démarre la partie du mot du jour d'un serveur. Retourne None si le joueur l'a déjà faite aujourd'hui ou a une partie en cours"""
+        day = today()
+        if await self.daily.has_played(guild_id, day, user_id):
+            return None
+        word = daily_word(self.word_list, guild_id, day)
+        return await self.sessions.create(user_id, word, max_attempts=6, daily=daily_key(guild_id, day), replace=False)
+
+    async def _record_result(self, game: WordleSession):
+        """Compte le résultat d'une partie terminée ou abandonnée (statistiques et mot du jour)"""
+        await self.stats.record(game.user_id, game.won, game.attempt_count)
+        if game.daily:
+            guild_id, day = game.daily.split(":", 1)
+            await self.daily.record(int(guild_id), date.fromisoformat(day), game.user_id, game.attempt_count, game.won)
+
+    async def get_game(self, user_id: int) -> Optional[WordleSession]:
         """Récupère la partie en cours d'un joueur"""
-        return self.active_games.get(user_id)
+        return await self.sessions.get(user_id)
     
-    def end_game(self, user_id: int):
-        """Termine la partie d'un joueur"""
-        if user_id in self.active_games:
-            del self.active_games[user_id]
+    async def end_game(self, user_id: int) -> Optional[WordleSession]:
+        """Termine la partie d'un joueur (une partie abandonnée compte comme perdue) et la retourne"""
+        # Retirée et lue en une seule opération : le résultat n'est compté qu'une fois
+        game = await self.sessions.pop(user_id)
+        if game and not self.is_over(game):
+            await self._record_result(game)
+        return game
+
+    def constraints_for(self, game: WordleSession) -> Constraints:
+        """Contraintes déduites des essais d'une partie (reconstruites une seule fois après un rechargement)"""
+        if game.constraints is None:
+            game.constraints = self._build_constraints(game)
+        return game.constraints
+
+    @staticmethod
+    def _build_constraints(game: WordleSession) -> Constraints:
+        return Constraints.from_history(
+            ((guess, [status for _, status in result]) for guess, result in game.attempts),
+            length=len(game.word)
+        )
+
+    def hard_mode_filter(self, game: WordleSession) -> Optional[Callable[[str], bool]]:
+        """
+        Filtre des tentatives permises par le mode difficile (None hors mode difficile)
+
+        Les contraintes sont une copie : le filtre peut être utilisé dans un
+        thread (ex: /hint) pendant qu'un /guess fait avancer la partie.
+        """
+        if not game.hard or not game.attempt_count:
+            return None
+        constraints = self._build_constraints(game)
+        return lambda word: constraints.hard_mode_violation(word) is None
+
+    async def hard_mode_violation(self, user_id: int, guess: str) -> Optional[str]:
+        """Contrainte du mode difficile non respectée par la tentative, None si elle est acceptée"""
+        game = await self.get_game(user_id)
+        if not game or not game.hard:
+            return None
+        guess = self.normalize_text(guess)
+        if len(guess) != len(game.word):
+            return None
+        return self.constraints_for(game).hard_mode_violation(guess)
+
+    async def complete_guess(self, user_id: int, prefix: str, limit: int = 25) -> List[str]:
+        """
+        Mots acceptés commençant par prefix, pour l'autocomplétion de /guess
+
+        En mode difficile, seuls les mots respectant les indices de la partie
+        sont proposés.
+        """
+        accept = None
+        game = await self.get_game(user_id)
+        if game and game.hard and game.attempt_count:
+            constraints = self.constraints_for(game)
+            accept = lambda word: constraints.hard_mode_violation(word) is None
+        return self.allowed_guesses.complete(prefix, limit, accept)
+
+    def remaining_words(self, game: WordleSession) -> int:
+        """Nombre de solutions encore compatibles avec les essais de la partie"""
+        return self.constraint_index.count(self.constraints_for(game))
+
+    def is_over(self, game: WordleSession) -> bool:
+        """La partie est gagnée ou n'a plus d'essais"""
+        return game.finished
     
-    def check_guess(self, user_id: int, guess: str) -> tuple:
+    async def check_guess(self, user_id: int, guess: str) -> tuple:
         """
-        Vérifie une tentative et retourne (valid, result, game_over, won)
+        Vérifie une tentative et retourne (valid, result, game_over, won, game)
+        game est la partie après la tentative (une partie terminée n'est plus stockée)
         result est une liste de tuples (lettre, status) où status est:
         - 'correct': lettre correcte à la bonne position (vert)
         - 'present': lettre correcte mais mauvaise position (jaune)
         - 'absent': lettre absente (gris)
         """
-        game = self.get_game(user_id)
-        if not game:
-            return False, None, True, False
-        
         guess = self.normalize_text(guess)
         
-        # Vérifier la longueur
-        if len(guess) != 5:
-            return False, None, False, False
-        
-        # Vérifier que c'est un mot valide (optionnel)
-        if guess not in self.word_list:
-            return False, None, False, False
-        
-        target = game['word']
-        result = []
-        
-        # Compter les lettres dans le mot cible
-        target_counts = {}
-        for letter in target:
-            target_counts[letter] = target_counts.get(letter, 0) + 1
-        
-        # Premier passage: marquer les lettres correctes
-        guess_status = [''] * 5
-        for i, letter in enumerate(guess):
-            if letter == target[i]:
-                guess_status[i] = 'correct'
-                target_counts[letter] -= 1
-        
-        # Deuxième passage: marquer les lettres présentes
-        for i, letter in enumerate(guess):
-            if guess_status[i] == '':
-                if letter in target_counts and target_counts[letter] > 0:
-                    guess_status[i] = 'present'
-                    target_counts[letter] -= 1
-                else:
-                    guess_status[i] = 'absent'
-        
-        # Créer le résultat
-        for letter, status in zip(guess, guess_status):
-            result.append((letter, status))
-        
-        # Ajouter la tentative
-        game['attempts'].append((guess, result))
-        
-        # Vérifier si gagné
-        won = guess == target
-        if won:
-            game['won'] = True
+        # Vérifier la longueur et que c'est un mot valide
+        if len(guess) != 5 or not self.is_valid_guess(guess):
+            game = await self.get_game(user_id)
+            return False, None, game is None, False, game
+
+        def play(game: WordleSession) -> tuple:
+            # Appliqué par le stockage sur la dernière version de la partie (éventuellement dans un thread) :
+            # un /guess simultané (ou traité par un autre processus) a pu la faire avancer
+            if self.is_over(game):
+                return False, None, True, False, game
+
+            # Mode difficile : les indices déjà obtenus doivent être utilisés
+            if game.hard and self.constraints_for(game).hard_mode_violation(guess):
+                return False, None, False, False, game
+
+            # Lire le retour dans la matrice précalculée
+            code = self.scoring.pattern(guess, game.word)
+            statuses = decode_pattern(code)
+
+            # Ajouter la tentative
+            if game.hard:
+                self.constraints_for(game).add(guess, statuses)
+            game.add_attempt(guess, code)
+
+            # Vérifier si gagné
+            won = guess == game.word
+            if won:
+                game.won = True
+            return True, list(zip(guess, statuses)), self.is_over(game), won, game
+
+        # La partie est retirée du stockage dans la même opération si l'essai la termine
+        outcome = await self.sessions.update(user_id, play)
+        if outcome is None:
+            return False, None, True, False, None
+        valid, result, game_over, won, game = outcome
         
-        # Vérifier si fin de partie
-        game_over = won or len(game['attempts']) >= game['max_attempts']
+        # Fin de partie : seul l'essai qui l'a terminée arrive ici avec valid et game_over
+        if valid and game_over:
+            await self._record_result(game)
         
-        return True, result, game_over, won
+        return outcome
     
-    def create_board_embed(self, user_id: int, user_name: str, last_result=None, game_over=False, won=False, invalid_word=False) -> discord.Embed:
-        """Crée l'embed pour afficher le plateau de jeu"""
-        game = self.get_game(user_id)
+    def start_race(self, channel_id: int) -> Optional[WordleRace]:
+        """Lance une course dans un salon, None si une course y est déjà en cours"""
+        race = self.races.get(channel_id)
+        if race and not race.finished:
+            return None
+        return self.races.start(channel_id, random.choice(self.word_list))
+
+    def race_guess(self, channel_id: int, user_id: int, user_name: str, guess: str) -> tuple:
+        """
+        Vérifie l'essai d'un joueur dans la course du salon et retourne (error, result, race)
+        error est le message à afficher si l'essai est refusé, None sinon
+        """
+        race = self.races.get(channel_id)
+        if not race or race.finished:
+            return "Aucune course en cours dans ce salon ! Utilisez `/course` pour en lancer une.", None, race
+
+        guess = self.normalize_text(guess)
+        if len(guess) != len(race.word) or not self.is_valid_guess(guess):
+            return "Le mot doit contenir exactement 5 lettres et être dans la liste des mots valides.", None, race
+
+        player = race.player(user_id, user_name)
+        if race.is_out(player):
+            return "Vous n'avez plus d'essais pour cette course.", None, race
+
+        code = self.scoring.pattern(guess, race.word)
+        race.add_attempt(player, code, guess == race.word)
+        if race.finished:
+            self.races.end(channel_id)
+        return None, list(zip(guess, decode_pattern(code))), race
+
+    def create_board_embed(self, user_id: int, user_name: str, last_result=None, game_over=False, won=False, invalid_word=False,
+                           game: WordleSession = None) -> discord.Embed:
+        """Crée l'embed pour afficher le plateau de jeu (game: partie en cours du joueur, déjà lue)"""
         
         if invalid_word:
             embed = discord.Embed(
@@ -122,23 +256,16 @@ class WordleGame:
             )
             return embed
         
-        # Emojis pour les lettres
-        emoji_map = {
-            'correct': '🟩',
-            'present': '🟨',
-            'absent': '⬛'
-        }
-        
         # Construire le plateau
         board = ""
-        for attempt, result in game['attempts']:
+        for attempt, result in game.attempts:
             line = ""
             for letter, status in result:
-                line += emoji_map[status]
+                line += self.EMOJI_MAP[status]
             board += line + f"  **{attempt}**\n"
         
         # Ajouter les lignes vides restantes
-        remaining = game['max_attempts'] - len(game['attempts'])
+        remaining = game.max_attempts - game.attempt_count
         for _ in range(remaining):
             board += "⬜⬜⬜⬜⬜\n"
         
@@ -146,15 +273,19 @@ class WordleGame:
         if game_over:
             if won:
                 title = f"🎉 Bravo {user_name} !"
-                description = f"Vous avez trouvé le mot en {len(game['attempts'])} essai(s) !"
+                description = f"Vous avez trouvé le mot en {game.attempt_count} essai(s) !"
                 color = discord.Color.green()
             else:
                 title = f"😢 Perdu {user_name}"
-                description = f"Le mot était : **{game['word']}**"
+                description = f"Le mot était : **{game.word}**"
                 color = discord.Color.red()
         else:
             title = f"🎮 Wordle - {user_name}"
-            description = f"Essai {len(game['attempts'])}/{game['max_attempts']}"
+            description = f"Essai {game.attempt_count}/{game.max_attempts}"
+            if game.hard:
+                title += " (difficile)"
+                if game.attempt_count:
+                    description += f" - {self.remaining_words(game)} mot(s) encore possible(s)"
             color = discord.Color.blue()
         
         embed = discord.Embed(
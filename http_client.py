@@ -0,0 +1,201 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Dict
+from urllib.parse import urlsplit
+import aiohttp
+from resilience import CircuitBreaker, RETRYABLE_STATUSES, backoff_delay, retry_after_delay
+
+
+class HostRateLimiter:
+    def __init__(self, rate: float, burst: int = 1, concurrency: int = 1):
+        """
+        Limiteur de débit pour un hôte (seau à jetons + nombre de requêtes simultanées borné)
+
+        Args:
+            rate: Nombre de requêtes autorisées par seconde en régime établi
+            burst: Nombre de requêtes pouvant partir d'un coup (taille du seau)
+            concurrency: Nombre maximal de requêtes en cours en même temps
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _take_token(self):
+        # Le verrou fait passer les demandeurs un par un, dans l'ordre d'arrivée
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Attend un jeton et une place libre, puis les garde le temps de la requête"""
+        await self._take_token()
+        async with self._semaphore:
+            yield
+
+
+class HttpClient:
+    def __init__(self, limit: int = 100, limit_per_host: int = 10, dns_cache_ttl: int = 300, keepalive_timeout: float = 30.0):
+        """
+        Client HTTP partagé par toutes les intégrations du bot
+
+        Une seule session aiohttp est créée à la première requête puis
+        réutilisée : les connexions restent ouvertes (keep-alive) dans un
+        pool par hôte et les résolutions DNS sont mises en cache.
+
+        Args:
+            limit: Nombre maximal de connexions simultanées au total
+            limit_per_host: Nombre maximal de connexions simultanées par hôte
+            dns_cache_ttl: Durée de vie (en secondes) du cache DNS
+            keepalive_timeout: Durée (en secondes) pendant laquelle une connexion inutilisée reste ouverte
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self._session = None
+        self._limiters = {}  # hôte: HostRateLimiter
+        self._breakers: Dict[str, CircuitBreaker] = {}  # hôte: disjoncteur
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Retourne la session partagée, en la créant si nécessaire"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def set_rate_limit(self, host: str, rate: float, burst: int = 1, concurrency: int = 1):
+        """Configure le limiteur de débit d'un hôte (remplace la configuration précédente)"""
+        self._limiters[host] = HostRateLimiter(rate, burst, concurrency)
+
+    @asynccontextmanager
+    async def throttle(self, host: str):
+        """Passe par le limiteur de l'hôte s'il est configuré, sans effet sinon"""
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            yield
+            return
+        async with limiter.acquire():
+            yield
+
+    def set_circuit_breaker(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Configure le disjoncteur d'un hôte (remplace la configuration précédente)"""
+        self._breakers[host] = CircuitBreaker(host, failure_threshold, reset_timeout)
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """Retourne le disjoncteur d'un hôte, créé avec les réglages par défaut si nécessaire"""
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(host)
+        return self._breakers[host]
+
+    def breaker_states(self) -> Dict[str, dict]:
+        """État des disjoncteurs de tous les hôtes contactés"""
+        return {host: breaker.snapshot() for host, breaker in self._breakers.items()}
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, timeout: float = 10.0, retries: int = 2, deadline: float = None,
+                      backoff: float = 0.5, max_backoff: float = 8.0, **kwargs):
+        """
+        Requête avec délai maximal, nouvelles tentatives et disjoncteur par hôte
+
+        Les erreurs réseau, les délais dépassés et les statuts temporaires
+        (429, 5xx...) sont retentés après une attente exponentielle avec tirage
+        aléatoire (ou le Retry-After renvoyé par le serveur). Tant que le
+        disjoncteur de l'hôte est ouvert, CircuitOpenError est levée sans
+        envoyer de requête. Le limiteur de débit de l'hôte, s'il existe, est
+        gardé jusqu'à la fin de la lecture de la réponse.
+
+        Args:
+            method: Méthode HTTP
+            url: URL complète
+            timeout: Délai maximal (en secondes) d'une tentative, lecture du body comprise
+            retries: Nombre de nouvelles tentatives après la première
+            deadline: Délai maximal (en secondes) de l'appel complet, tentatives comprises
+            backoff: Attente de base avant la première nouvelle tentative
+            max_backoff: Attente maximale entre deux tentatives
+            **kwargs: Arguments passés à aiohttp (params, headers, json...)
+
+        Yields:
+            aiohttp.ClientResponse: La dernière réponse obtenue (le statut est à vérifier)
+        """
+        host = urlsplit(url).hostname
+        breaker = self.breaker(host)
+        session = await self.get_session()
+        deadline_at = time.monotonic() + deadline if deadline else None
+
+        for attempt in range(retries + 1):
+            attempt_timeout = timeout
+            if deadline_at is not None:
+                attempt_timeout = min(timeout, max(deadline_at - time.monotonic(), 0.1))
+            last_attempt = attempt == retries
+
+            breaker.before_request()
+            stack = AsyncExitStack()
+            try:
+                await stack.enter_async_context(self.throttle(host))
+                response = await stack.enter_async_context(
+                    session.request(method, url, timeout=aiohttp.ClientTimeout(total=attempt_timeout), **kwargs)
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                await stack.aclose()
+                breaker.record_failure(type(e).__name__)
+                delay = backoff_delay(attempt, backoff, max_backoff)
+                if last_attempt or not self._has_time_for(deadline_at, delay):
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                await stack.aclose()
+                breaker.release_trial()
+                raise
+
+            if response.status in RETRYABLE_STATUSES:
+                breaker.record_failure(f"HTTP {response.status}")
+                delay = retry_after_delay(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = backoff_delay(attempt, backoff, max_backoff)
+                if not last_attempt and delay <= max_backoff and self._has_time_for(deadline_at, delay):
+                    await stack.aclose()
+                    await asyncio.sleep(delay)
+                    continue
+            else:
+                breaker.record_success()
+
+            async with stack:
+                try:
+                    yield response
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    # Erreur pendant la lecture du body (connexion coupée, délai dépassé)
+                    breaker.record_failure(type(e).__name__)
+                    raise
+            return
+
+    @staticmethod
+    def _has_time_for(deadline_at, delay: float) -> bool:
+        return deadline_at is None or time.monotonic() + delay < deadline_at
+
+    async def close(self):
+        """Ferme la session et toutes les connexions du pool"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# Instance globale du client HTTP
+http_client = HttpClient()
@@ -1,16 +1,154 @@
+import asyncio
 import discord
 from datetime import datetime
+from typing import List, Optional
+from discord.ext import tasks
 from global_var import CHANNEL_ID
 
+FIELD_VALUE_LIMIT = 1024  # caractères par valeur de champ d'embed (limite Discord)
+
+def truncate(text: str, limit: int) -> str:
+    """Coupe un texte trop long pour Discord (terminé par « … »)"""
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+class LogQueue:
+    MAX_EMBEDS = 10  # embeds par message (limite Discord)
+    MAX_MESSAGE_SIZE = 6000  # caractères par message, tous embeds confondus (limite Discord)
+
+    def __init__(self, channel_id: int, max_size: int = 500, flush_interval: float = 5.0):
+        """
+        File d'envoi des logs de commandes
+
+        Une commande ajoute son log à la file sans attendre Discord ; une
+        tâche de fond regroupe les logs par messages de 10 embeds au plus,
+        envoyés dès qu'un message est plein ou flush_interval secondes
+        après le premier log en attente. Quand la file est pleine, les
+        nouveaux logs sont comptés puis ignorés ; les logs d'un message refusé
+        par Discord aussi. Le nombre de logs perdus est indiqué dans le
+        message suivant.
+
+        Args:
+            channel_id: ID du salon des logs
+            max_size: Nombre maximal de logs en attente
+            flush_interval: Attente maximale (en secondes) avant l'envoi d'un message incomplet
+        """
+        self.channel_id = channel_id
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.dropped = 0  # logs ignorés depuis le dernier message envoyé
+        self.bot = None
+        self._batch: List[discord.Embed] = []  # message en cours de préparation ou d'envoi
+        self._carry: Optional[discord.Embed] = None  # embed qui ne tenait pas dans le message précédent
+        self._sending = False  # un message est en cours d'envoi
+
+    def push(self, embed: discord.Embed):
+        """Ajoute un log à la file sans attendre (ignoré si la file est pleine)"""
+        try:
+            self.queue.put_nowait(embed)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _fill_batch(self):
+        """Attend un premier log puis regroupe les suivants jusqu'à 10 embeds ou flush_interval secondes"""
+        first = self._carry or await self.queue.get()
+        self._carry = None
+        self._batch.append(first)
+        size = len(first)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(self._batch) < self.MAX_EMBEDS:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                embed = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if size + len(embed) > self.MAX_MESSAGE_SIZE:
+                self._carry = embed
+                break
+            self._batch.append(embed)
+            size += len(embed)
+
+    def _drain_batches(self) -> List[List[discord.Embed]]:
+        """Regroupe en messages tous les logs en attente (à l'arrêt du bot)"""
+        batches, batch, size = [], [], 0
+        pending = self._batch + ([self._carry] if self._carry else [])
+        self._batch, self._carry = [], None
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for embed in pending:
+            if len(batch) >= self.MAX_EMBEDS or (batch and size + len(embed) > self.MAX_MESSAGE_SIZE):
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(embed)
+            size += len(embed)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _send(self, embeds: List[discord.Embed]):
+        channel = self.bot.get_channel(self.channel_id) if self.bot else None
+        if channel is None:
+            return
+        dropped = self.dropped
+        content = f"⚠️ {dropped} log(s) perdu(s)" if dropped else None
+        try:
+            await channel.send(content=content, embeds=embeds)
+        except discord.HTTPException as e:
+            if e.status == 400 and len(embeds) > 1:
+                # Un embed refusé par Discord : envoyer les autres un par un plutôt que perdre tout le message
+                for embed in embeds:
+                    await self._send([embed])
+                return
+            print(f"❌ Erreur lors de l'envoi des logs: {e}")
+            self.dropped += len(embeds)
+            return
+        # Compteur remis à zéro seulement une fois la perte signalée (sans effacer celles survenues pendant l'envoi)
+        self.dropped -= dropped
+
+    @tasks.loop(seconds=0)
+    async def flush_loop(self):
+        """Envoie les logs en attente par messages de 10 embeds au plus"""
+        await self._fill_batch()
+        self._sending = True
+        try:
+            await self._send(self._batch)
+        finally:
+            self._sending = False
+        self._batch = []
+
+    def start(self, bot):
+        """Démarre l'envoi des logs dans le salon configuré"""
+        self.bot = bot
+        if not self.flush_loop.is_running():
+            self.flush_loop.start()
+
+    async def close(self):
+        """Arrête la tâche de fond et envoie tous les logs encore en attente"""
+        task = self.flush_loop.get_task()
+        if task is not None and not task.done():
+            if self._sending:
+                # Laisser partir le message en cours : l'interrompre le perdrait ou l'enverrait deux fois
+                self.flush_loop.stop()
+            else:
+                # En attente de logs : le message en préparation reste dans _batch
+                self.flush_loop.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        for batch in self._drain_batches():
+            await self._send(batch)
+
+# File globale des logs de commandes
+log_queue = LogQueue(CHANNEL_ID)
+
 async def log_command(ctx, response):
-    channel = ctx.bot.get_channel(CHANNEL_ID)
-    if channel:
-        embed = discord.Embed(title="Command Log", color=discord.Color.blue())
-        embed.add_field(name="User", value=f"<@{ctx.author.id}>", inline=True)
-        embed.add_field(name="Command", value=f"``{ctx.message.content}``", inline=True)
-        embed.add_field(name="Response", value=f"{response}", inline=False)
-        embed.set_footer(text=datetime.now().strftime("%H:%M - %d-%m-%Y"))
-        await channel.send(embed=embed)
+    """Ajoute le log d'une commande à la file (n'attend pas l'envoi)"""
+    embed = discord.Embed(title="Command Log", color=discord.Color.blue())
+    embed.add_field(name="User", value=f"<@{ctx.author.id}>", inline=True)
+    embed.add_field(name="Command", value=f"``{truncate(ctx.message.content, FIELD_VALUE_LIMIT - 4)}``", inline=True)
+    embed.add_field(name="Response", value=truncate(f"{response}", FIELD_VALUE_LIMIT), inline=False)
+    embed.set_footer(text=datetime.now().strftime("%H:%M - %d-%m-%Y"))
+    log_queue.push(embed)
 
 async def log_bot_ready(bot):
     channel = bot.get_channel(CHANNEL_ID)
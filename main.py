@@ -1,12 +1,19 @@
+import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands
 import re
+import time
 
-from valorant.rank_ctrl import get_valorant_rank, create_rank_embed
-from twitch import TwitchMonitor
-from tiktok import TikTokMonitor
+from valorant.rank_ctrl import get_valorant_rank, get_valorant_ranks, create_rank_embed, create_leaderboard_embed
+from valorant.registry import player_registry
+from twitch import TwitchMonitor, MultiTwitchMonitor, HelixClient, AdaptivePollScheduler
+from tiktok import TikTokMonitor, MultiTikTokMonitor
 from games.wordle_game import wordle_game
+from games.sessions import SharedSessionStore
+from games.build_lexicon import ensure_lexicon
+from games.daily import today
+from http_client import http_client
 from log import *
 from global_var import *
 
@@ -14,7 +21,39 @@ intents = discord.Intents.default()
 intents.members = True
 intents.message_content = True
 
-bot = commands.Bot(command_prefix='k?', intents=intents)
+# Sharding (optionnel) : AutoShardedBot, limité aux shards SHARD_IDS quand le bot tourne sur plusieurs processus
+BotBase = commands.AutoShardedBot if globals().get('SHARD_COUNT') else commands.Bot
+
+class PocketKayou(BotBase):
+    async def close(self):
+        """Arrête les surveillances et ferme les connexions HTTP avant l'arrêt du bot"""
+        twitch_monitor.stop()
+        if multi_twitch_monitor:
+            multi_twitch_monitor.stop()
+        tiktok_monitor.stop()
+        if multi_tiktok_monitor:
+            multi_tiktok_monitor.stop()
+        await http_client.close()
+        # Écrire les parties Wordle en cours avant l'arrêt
+        await wordle_game.sessions.close()
+        await wordle_game.daily.close()
+        await wordle_game.stats.close()
+        # Envoyer les derniers logs tant que la connexion à Discord est ouverte
+        await log_queue.close()
+        await super().close()
+
+shard_options = {}
+if globals().get('SHARD_COUNT'):
+    shard_options = {"shard_count": SHARD_COUNT, "shard_ids": globals().get('SHARD_IDS')}
+
+bot = PocketKayou(command_prefix='k?', intents=intents, **shard_options)
+
+# Parties Wordle partagées entre plusieurs processus (optionnel) : un /guess peut arriver sur n'importe quel shard
+if globals().get('WORDLE_SHARED_SESSIONS_DB'):
+    wordle_game.sessions = SharedSessionStore(WORDLE_SHARED_SESSIONS_DB)
+
+# Client Helix partagé (un seul token d'application pour tous les moniteurs Twitch)
+twitch_helix = HelixClient(TWITCH_CLIENT_ID, TWITCH_CLIENT_SECRET)
 
 # Initialiser le moniteur Twitch
 twitch_monitor = TwitchMonitor(
@@ -23,9 +62,31 @@ twitch_monitor = TwitchMonitor(
     client_secret=TWITCH_CLIENT_SECRET,
     twitch_username=TWITCH_USERNAME,
     notification_channel_id=TWITCH_NOTIFICATION_CHANNEL_ID,
-    role_id=TWITCH_ROLE_ID
+    role_id=TWITCH_ROLE_ID,
+    helix=twitch_helix,
+    # Polling adaptatif : rapide aux heures habituelles de live, lent ailleurs
+    scheduler=AdaptivePollScheduler(daily_budget=globals().get('TWITCH_DAILY_REQUEST_BUDGET', 720))
 )
 
+# Mode EventSub (optionnel) : alertes en temps réel, polling seulement si la connexion est coupée
+if globals().get('TWITCH_USER_TOKEN'):
+    twitch_monitor.enable_eventsub(
+        TWITCH_USER_TOKEN,
+        ws_url=globals().get('TWITCH_EVENTSUB_WS_URL'),
+        subscriptions_url=globals().get('TWITCH_EVENTSUB_SUBSCRIPTIONS_URL')
+    )
+
+# Initialiser le moniteur multi-streamers (optionnel, si TWITCH_STREAMERS est défini)
+multi_twitch_monitor = None
+if globals().get('TWITCH_STREAMERS'):
+    multi_twitch_monitor = MultiTwitchMonitor(
+        bot=bot,
+        client_id=TWITCH_CLIENT_ID,
+        client_secret=TWITCH_CLIENT_SECRET,
+        streamers=TWITCH_STREAMERS,
+        helix=twitch_helix
+    )
+
 # Initialiser le moniteur TikTok
 tiktok_monitor = TikTokMonitor(
     bot=bot,
@@ -33,6 +94,11 @@ tiktok_monitor = TikTokMonitor(
     notification_channel_id=TIKTOK_NOTIFICATION_CHANNEL_ID
 )
 
+# Initialiser le moniteur multi-comptes TikTok (optionnel, si TIKTOK_ACCOUNTS est défini)
+multi_tiktok_monitor = None
+if globals().get('TIKTOK_ACCOUNTS'):
+    multi_tiktok_monitor = MultiTikTokMonitor(bot=bot, accounts=TIKTOK_ACCOUNTS)
+
 
 
 @bot.command()
@@ -47,11 +113,14 @@ async def aide(ctx):
     print(f"k?aide command executed by : {ctx.author}")
     embed = discord.Embed(title="Aide valorant-bot", color=discord.Color.blue())
     embed.add_field(name="Préfixe :", value="``k?``")
-    embed.add_field(name="Commandes : ", value = "``k?aide`` ``k?ping`` ``k?rank``")
+    embed.add_field(name="Commandes : ", value = "``k?aide`` ``k?ping`` ``k?rank`` ``k?link`` ``k?unlink`` ``k?leaderboard``")
     embed.add_field(name="Informations commandes :", value="", inline=False)
     embed.add_field(name="``k?aide``", value="Afficher ce message d'aide", inline=False)
     embed.add_field(name="``k?ping``", value="Vérifier la latence du bot",inline=False)
     embed.add_field(name="``k?rank username#tag``", value="Afficher le rang Valorant d'un joueur", inline=False)
+    embed.add_field(name="``k?link username#tag``", value="Associer votre compte Valorant pour le classement du serveur", inline=False)
+    embed.add_field(name="``k?unlink``", value="Retirer votre compte Valorant du classement", inline=False)
+    embed.add_field(name="``k?leaderboard``", value="Afficher le classement Valorant du serveur", inline=False)
     await ctx.send(embed=embed)
     await log_command(ctx, "k?aide command executed with embed")
 
@@ -88,15 +157,86 @@ async def rank(ctx, *, username: str = None):
         await loading_msg.edit(content=f"❌ Erreur lors de la récupération des données: {str(e)}")
         print(f"Error in k?rank command: {e}")
 
+@bot.command()
+@commands.guild_only()
+async def link(ctx, *, username: str = None):
+    """Associe le compte Valorant de l'auteur pour le classement du serveur"""
+    print(f"k?link command executed by: {ctx.author}")
+
+    if not username or not re.match(r"^[^#]+#[^#]+$", username.strip()):
+        await ctx.send("❌ Format incorrect. Utilisez: `k?link username#tag` (ex: `k?link emm4#000`)")
+        return
+
+    player_registry.link(ctx.guild.id, ctx.author.id, username.strip())
+    response = f"✅ Compte **{username.strip()}** associé à {ctx.author.mention}"
+    await ctx.send(response)
+    await log_command(ctx, response)
+
+@bot.command()
+@commands.guild_only()
+async def unlink(ctx):
+    """Retire le compte Valorant de l'auteur du classement du serveur"""
+    print(f"k?unlink command executed by: {ctx.author}")
+
+    if player_registry.unlink(ctx.guild.id, ctx.author.id):
+        response = "✅ Compte Valorant retiré du classement"
+    else:
+        response = "❌ Aucun compte Valorant associé. Utilisez `k?link username#tag`"
+    await ctx.send(response)
+    await log_command(ctx, response)
+
+# Délai minimal (en secondes) entre deux mises à jour du message de classement
+LEADERBOARD_EDIT_INTERVAL = 1.5
+
+@bot.command()
+@commands.guild_only()
+async def leaderboard(ctx):
+    """Affiche le classement Valorant des membres du serveur, mis à jour au fil des résultats"""
+    print(f"k?leaderboard command executed by: {ctx.author}")
+
+    players = player_registry.get_players(ctx.guild.id)
+    if not players:
+        await ctx.send("❌ Aucun joueur enregistré. Utilisez `k?link username#tag` pour apparaître dans le classement")
+        return
+
+    # Un même Riot ID peut être associé à plusieurs membres : une seule recherche par compte
+    members_by_account = {}
+    for member_id, riot_id in players.items():
+        member = ctx.guild.get_member(member_id)
+        name = member.display_name if member else riot_id
+        members_by_account.setdefault(riot_id, []).append(name)
+
+    entries = []
+    total = len(players)
+    message = await ctx.send(embed=create_leaderboard_embed(ctx.guild.name, entries, 0, total))
+
+    try:
+        last_edit = time.monotonic()
+        async for riot_id, data in get_valorant_ranks(members_by_account):
+            entries.extend((name, data) for name in members_by_account[riot_id])
+            # Limiter les modifications du message pour ne pas être bloqué par Discord
+            if len(entries) < total and time.monotonic() - last_edit >= LEADERBOARD_EDIT_INTERVAL:
+                await message.edit(embed=create_leaderboard_embed(ctx.guild.name, entries, len(entries), total))
+                last_edit = time.monotonic()
+
+        await message.edit(embed=create_leaderboard_embed(ctx.guild.name, entries, total, total))
+        ranked = sum(1 for _, data in entries if data["success"])
+        await log_command(ctx, f"k?leaderboard executed - {ranked}/{total} joueurs classés")
+
+    except Exception as e:
+        await message.edit(content=f"❌ Erreur lors de la création du classement: {str(e)}")
+        print(f"Error in k?leaderboard command: {e}")
+
 # ===== COMMANDES SLASH WORDLE =====
 
 @bot.tree.command(name="wordle", description="Commencer une nouvelle partie de Wordle en français")
-async def wordle_command(interaction: discord.Interaction):
+@app_commands.describe(difficile="Mode difficile : les lettres trouvées doivent être réutilisées")
+async def wordle_command(interaction: discord.Interaction, difficile: bool = False):
     """Démarre une nouvelle partie de Wordle"""
     user_id = interaction.user.id
     
     # Vérifier si une partie est déjà en cours
-    existing_game = wordle_game.get_game(user_id)
+    existing_game = await wordle_game.get_game(user_id)
     if existing_game:
         await interaction.response.send_message(
             "❌ Vous avez déjà une partie en cours ! Utilisez `/abandon` pour l'abandonner ou `/guess` pour continuer.",
@@ -104,9 +244,62 @@ async def wordle_command(interaction: discord.Interaction):
         )
         return
     
-    # Démarrer une nouvelle partie
-    wordle_game.start_game(user_id)
-    embed = wordle_game.create_board_embed(user_id, interaction.user.name)
+    # Démarrer une nouvelle partie (None si une partie a été créée entre-temps, ex: double clic)
+    game = await wordle_game.start_game(user_id, hard=difficile)
+    if game is None:
+        await interaction.response.send_message("❌ Vous avez déjà une partie en cours !", ephemeral=True)
+        return
+    embed = wordle_game.create_board_embed(user_id, interaction.user.name, game=game)
+    await interaction.response.send_message(embed=embed)
+
+@bot.tree.command(name="motdujour", description="Jouer au mot du jour (le même pour tout le serveur)")
+@app_commands.guild_only()
+async def daily_command(interaction: discord.Interaction):
+    """Démarre la partie du mot du jour du serveur"""
+    user_id = interaction.user.id
+
+    if await wordle_game.get_game(user_id):
+        await interaction.response.send_message(
+            "❌ Vous avez déjà une partie en cours ! Utilisez `/abandon` pour l'abandonner ou `/guess` pour continuer.",
+            ephemeral=True
+        )
+        return
+
+    game = await wordle_game.start_daily_game(user_id, interaction.guild.id)
+    if game is None:
+        await interaction.response.send_message(
+            "❌ Vous avez déjà joué le mot du jour ! Revenez demain, ou utilisez `/resultats` pour voir le classement.",
+            ephemeral=True
+        )
+        return
+
+    # Plateau privé : les tentatives des autres joueurs ne doivent pas dévoiler le mot
+    embed = wordle_game.create_board_embed(user_id, interaction.user.name, game=game)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@bot.tree.command(name="resultats", description="Afficher les résultats du mot du jour du serveur")
+@app_commands.guild_only()
+async def daily_results_command(interaction: discord.Interaction):
+    """Affiche les résultats agrégés du mot du jour"""
+    embed = await wordle_game.daily.create_board_embed(interaction.guild, today())
+    await interaction.response.send_message(embed=embed)
+
+@bot.tree.command(name="stats", description="Afficher les statistiques Wordle d'un joueur")
+@app_commands.describe(membre="Le joueur (vous par défaut)")
+async def stats_command(interaction: discord.Interaction, membre: discord.User = None):
+    """Affiche les statistiques Wordle"""
+    user = membre or interaction.user
+    embed = await wordle_game.stats.create_stats_embed(user.id, user.display_name)
+    await interaction.response.send_message(embed=embed)
+
+@bot.tree.command(name="top", description="Afficher le classement Wordle")
+async def top_command(interaction: discord.Interaction):
+    """Affiche les meilleurs joueurs de Wordle"""
+    def get_name(user_id: int) -> str:
+        user = bot.get_user(user_id)
+        return user.display_name if user else f"<@{user_id}>"
+
+    embed = await wordle_game.stats.create_top_embed(get_name)
     await interaction.response.send_message(embed=embed)
 
 @bot.tree.command(name="guess", description="Proposer un mot pour deviner le Wordle")
@@ -116,7 +309,7 @@ async def guess_command(interaction: discord.Interaction, mot: str):
     user_id = interaction.user.id
     
     # Vérifier si une partie est en cours
-    game = wordle_game.get_game(user_id)
+    game = await wordle_game.get_game(user_id)
     if not game:
         await interaction.response.send_message(
             "❌ Aucune partie en cours ! Utilisez `/wordle` pour commencer.",
@@ -124,28 +317,126 @@ async def guess_command(interaction: discord.Interaction, mot: str):
         )
         return
     
+    # Mode difficile : indiquer tout de suite la contrainte non respectée
+    violation = await wordle_game.hard_mode_violation(user_id, mot)
+    if violation:
+        embed = discord.Embed(title="❌ Mode difficile", description=violation, color=discord.Color.red())
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return
+
     # Vérifier la tentative
-    valid, result, game_over, won = wordle_game.check_guess(user_id, mot)
+    valid, result, game_over, won, game = await wordle_game.check_guess(user_id, mot)
     
     if not valid:
         embed = wordle_game.create_board_embed(user_id, interaction.user.name, invalid_word=True)
         await interaction.response.send_message(embed=embed, ephemeral=True)
         return
     
-    # Afficher le résultat
-    embed = wordle_game.create_board_embed(user_id, interaction.user.name, result, game_over, won)
-    await interaction.response.send_message(embed=embed)
-    
-    # Si la partie est terminée, la supprimer
-    if game_over:
-        wordle_game.end_game(user_id)
+    # Afficher le résultat (en privé pour le mot du jour, pour ne pas le dévoiler aux autres)
+    embed = wordle_game.create_board_embed(user_id, interaction.user.name, result, game_over, won, game=game)
+    await interaction.response.send_message(embed=embed, ephemeral=game.daily is not None)
+
+    # Mot du jour terminé : annoncer le résultat sans les lettres
+    if game_over and game.daily:
+        grid = "\n".join("".join(wordle_game.EMOJI_MAP[status] for _, status in result) for _, result in game.attempts)
+        score = game.attempt_count if won else "X"
+        await interaction.followup.send(f"📅 **{interaction.user.display_name}** a terminé le mot du jour : {score}/{game.max_attempts}\n{grid}")
+
+@guess_command.autocomplete("mot")
+async def guess_autocomplete(interaction: discord.Interaction, current: str):
+    """Propose les mots du lexique commençant par le texte tapé (25 au maximum)"""
+    words = await wordle_game.complete_guess(interaction.user.id, current)
+    return [app_commands.Choice(name=word, value=word) for word in words]
+
+@bot.tree.command(name="course", description="Lancer une course Wordle : tout le salon cherche le même mot")
+@app_commands.guild_only()
+async def race_command(interaction: discord.Interaction):
+    """Lance une course Wordle dans le salon"""
+    race = wordle_game.start_race(interaction.channel_id)
+    if race is None:
+        await interaction.response.send_message(
+            "❌ Une course est déjà en cours dans ce salon ! Utilisez `/essai` pour y participer.",
+            ephemeral=True
+        )
+        return
+
+    # Le tableau est un message du salon (modifiable sans limite de durée, contrairement à une réponse d'interaction)
+    await interaction.response.send_message("🏁 Course lancée !", ephemeral=True)
+    try:
+        race.message = await interaction.channel.send(
+            f"🏁 **{interaction.user.display_name}** lance une course Wordle !", embed=race.create_embed()
+        )
+    except discord.HTTPException as e:
+        # Sans tableau, la course ne peut pas être suivie : l'annuler
+        print(f"❌ Erreur lors de l'envoi du tableau de la course Wordle: {e}")
+        wordle_game.races.end(interaction.channel_id)
+        await interaction.followup.send("❌ Impossible d'afficher le tableau de la course dans ce salon.", ephemeral=True)
+
+@bot.tree.command(name="essai", description="Proposer un mot dans la course Wordle du salon")
+@app_commands.describe(mot="Le mot de 5 lettres à proposer")
+@app_commands.guild_only()
+async def race_guess_command(interaction: discord.Interaction, mot: str):
+    """Propose un mot dans la course du salon (le tableau commun est mis à jour par lots)"""
+    error, result, race = wordle_game.race_guess(interaction.channel_id, interaction.user.id, interaction.user.display_name, mot)
+    if error:
+        await interaction.response.send_message(f"❌ {error}", ephemeral=True)
+        return
+
+    # Les lettres ne sont montrées qu'au joueur, le salon ne voit que les couleurs
+    player = race.players[interaction.user.id]
+    line = "".join(wordle_game.EMOJI_MAP[status] for _, status in result)
+    word = "".join(letter for letter, _ in result)
+    await interaction.response.send_message(
+        f"{line}  **{word}** ({len(player.codes)}/{race.max_attempts})", ephemeral=True
+    )
+    race.request_update()
+
+    if race.finished and player.won:
+        await interaction.followup.send(f"🏆 **{interaction.user.display_name}** remporte la course ! Le mot était **{race.word}**")
+
+@race_guess_command.autocomplete("mot")
+async def race_guess_autocomplete(interaction: discord.Interaction, current: str):
+    """Propose les mots du lexique commençant par le texte tapé (25 au maximum)"""
+    return [app_commands.Choice(name=word, value=word) for word in wordle_game.allowed_guesses.complete(current)]
+
+@bot.tree.command(name="hint", description="Obtenir un indice pour la partie de Wordle en cours")
+async def hint_command(interaction: discord.Interaction):
+    """Propose le mot qui apporte le plus d'information"""
+    user_id = interaction.user.id
+
+    game = await wordle_game.get_game(user_id)
+    if not game:
+        await interaction.response.send_message(
+            "❌ Aucune partie en cours ! Utilisez `/wordle` pour commencer.",
+            ephemeral=True
+        )
+        return
+
+    # Calcul lancé dans un thread pour ne pas bloquer les autres commandes
+    # En mode difficile, seuls les mots respectant les indices déjà obtenus sont conseillés
+    word, candidates, bits = await asyncio.to_thread(
+        wordle_game.solver.suggest, game.history(), wordle_game.hard_mode_filter(game)
+    )
+
+    if word is None:
+        await interaction.response.send_message("❌ Aucun mot du dictionnaire ne correspond à vos essais.", ephemeral=True)
+        return
+
+    embed = discord.Embed(title="💡 Indice Wordle", color=discord.Color.gold())
+    embed.add_field(name="Mot conseillé", value=f"**{word}**", inline=False)
+    if len(candidates) <= 10:
+        embed.add_field(name="Solutions possibles", value=" ".join(f"``{c}``" for c in candidates), inline=False)
+    else:
+        embed.add_field(name="Solutions possibles", value=f"{len(candidates)} mots", inline=False)
+    embed.set_footer(text=f"Information attendue : {bits:.2f} bits")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
 
 @bot.tree.command(name="abandon", description="Abandonner la partie de Wordle en cours")
 async def abandon_command(interaction: discord.Interaction):
     """Abandonne la partie de Wordle en cours"""
     user_id = interaction.user.id
     
-    game = wordle_game.get_game(user_id)
+    game = await wordle_game.end_game(user_id)
     if not game:
         await interaction.response.send_message(
             "❌ Aucune partie en cours !",
@@ -153,12 +444,9 @@ async def abandon_command(interaction: discord.Interaction):
         )
         return
     
-    word = game['word']
-    wordle_game.end_game(user_id)
-    
     embed = discord.Embed(
         title="🏳️ Partie abandonnée",
-        description=f"Le mot était : **{word}**",
+        description=f"Le mot était : **{game.word}**",
         color=discord.Color.orange()
     )
     await interaction.response.send_message(embed=embed)
@@ -217,6 +505,7 @@ async def clear_error(interaction: discord.Interaction, error: app_commands.AppC
 @bot.event
 async def on_ready():
     print(f'🤖 {bot.user} est connecté et prêt!')
+    log_queue.start(bot)
     await log_bot_ready(bot)
     
     try:
@@ -228,10 +517,34 @@ async def on_ready():
     # Démarrer la surveillance Twitch
     twitch_monitor.start()
     print("🎥 Surveillance Twitch activée")
+
+    if multi_twitch_monitor:
+        multi_twitch_monitor.start()
+        print(f"🎥 Surveillance multi-streamers Twitch activée ({len(multi_twitch_monitor.streamers)} streamers)")
     
     # Démarrer la surveillance TikTok
     tiktok_monitor.start()
     print("🎵 Surveillance TikTok activée")
+
+    if multi_tiktok_monitor:
+        multi_tiktok_monitor.start()
+        print(f"🎵 Surveillance multi-comptes TikTok activée ({len(multi_tiktok_monitor.accounts)} comptes)")
+
+    # Sauvegarde périodique des parties Wordle en cours
+    wordle_game.sessions.start()
+    wordle_game.daily.start()
+    wordle_game.stats.start()
+
+    # Charger (ou calculer) la matrice Wordle et le meilleur premier mot hors de la boucle d'événements
+    await asyncio.to_thread(wordle_game.scoring.load)
+    await asyncio.to_thread(wordle_game.solver.opening_guess)
+    # Lexique des mots acceptés : construit au besoin à partir des listes de mots configurées
+    if globals().get('WORDLE_LEXICON_SOURCES'):
+        await asyncio.to_thread(ensure_lexicon, WORDLE_LEXICON_SOURCES, wordle_game.allowed_guesses.path)
+    else:
+        print("⚠️ WORDLE_LEXICON_SOURCES non défini : le lexique Wordle n'est pas construit automatiquement")
+    await asyncio.to_thread(wordle_game.allowed_guesses.load)
+    print("🎮 Matrice Wordle prête")
     
 
 
@@ -0,0 +1,114 @@
+import random
+import time
+from typing import Optional
+
+# Statuts pour lesquels une nouvelle tentative a des chances de réussir
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Levée quand un hôte est considéré comme indisponible (disjoncteur ouvert)"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"{host} indisponible, nouvel essai dans {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Disjoncteur d'un hôte
+
+        Après failure_threshold échecs consécutifs, les requêtes vers l'hôte
+        échouent immédiatement pendant reset_timeout secondes. Une seule
+        requête d'essai est ensuite autorisée : si elle réussit le
+        disjoncteur se referme, sinon il reste ouvert pour une nouvelle période.
+
+        Args:
+            host: Nom de l'hôte surveillé
+            failure_threshold: Nombre d'échecs consécutifs avant ouverture
+            reset_timeout: Durée (en secondes) d'ouverture avant la requête d'essai
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.last_error: Optional[str] = None
+
+    def before_request(self):
+        """Vérifie qu'une requête peut partir, lève CircuitOpenError sinon"""
+        if self.state == self.CLOSED:
+            return
+
+        remaining = self.opened_at + self.reset_timeout - time.monotonic()
+        if self.state == self.OPEN and remaining <= 0:
+            self.state = self.HALF_OPEN
+            self.trial_in_flight = False
+
+        if self.state == self.HALF_OPEN and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return
+
+        self.total_rejected += 1
+        raise CircuitOpenError(self.host, max(remaining, 0.0))
+
+    def record_success(self):
+        """La requête a abouti : referme le disjoncteur"""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self, error: str = None):
+        """La requête a échoué (réseau, délai dépassé ou erreur serveur)"""
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        self.last_error = error
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                print(f"⚠️ Disjoncteur ouvert pour {self.host} ({self.consecutive_failures} échecs consécutifs)")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def release_trial(self):
+        """Libère la requête d'essai sans résultat (requête annulée)"""
+        self.trial_in_flight = False
+
+    def snapshot(self) -> dict:
+        """État du disjoncteur, pour la surveillance"""
+        retry_in = 0.0
+        if self.state == self.OPEN:
+            retry_in = max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "total_failures": self.total_failures,
+            "total_rejected": self.total_rejected,
+            "retry_in": round(retry_in, 1),
+            "last_error": self.last_error
+        }
+
+
+def backoff_delay(attempt: int, base: float = 0.5, maximum: float = 8.0) -> float:
+    """Délai avant la tentative suivante : exponentiel, avec un tirage aléatoire (full jitter)"""
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
+
+
+def retry_after_delay(value: Optional[str]) -> Optional[float]:
+    """Lit un en-tête Retry-After exprimé en secondes (None s'il est absent ou illisible)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
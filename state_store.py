@@ -0,0 +1,59 @@
+import json
+import os
+
+
+class StateStore:
+    def __init__(self, path: str = "monitor_state.json"):
+        """
+        Petit stockage clé/valeur persistant pour l'état des moniteurs
+
+        Tout l'état tient dans un fichier JSON réécrit de manière atomique
+        (fichier temporaire puis renommage) à chaque modification : un arrêt
+        brutal laisse toujours l'ancienne ou la nouvelle version, jamais un
+        fichier à moitié écrit. Les écritures n'ont lieu que lors des
+        transitions, elles sont donc rares.
+
+        Args:
+            path: Fichier de sauvegarde (None pour un état uniquement en mémoire)
+        """
+        self.path = path
+        self._data = {}
+        self._load()
+
+    def get(self, key: str, default=None):
+        """Retourne la valeur sauvegardée pour key, ou default"""
+        return self._data.get(key, default)
+
+    def set(self, key: str, value):
+        """Enregistre la valeur (sérialisable en JSON) et sauvegarde immédiatement"""
+        if self._data.get(key) == value:
+            return
+        self._data[key] = value
+        self._save()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ État des moniteurs illisible, il sera ignoré: {e}")
+            self._data = {}
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Impossible de sauvegarder l'état des moniteurs: {e}")
+
+
+# Instance globale partagée par les moniteurs
+state_store = StateStore()
@@ -0,0 +1,45 @@
+import asyncio
+import sqlite3
+import time
+from datetime import date
+from games.daily import DailyResults
+
+DAY = date(2026, 1, 1)
+
+
+def test_board_loads_while_flush_is_blocked(tmp_path):
+    db_path = str(tmp_path / "daily.db")
+
+    async def scenario():
+        results = DailyResults(db_path)
+        await results.record(1, DAY, 10, 3, True)
+        await results.record(2, DAY, 20, 6, False)
+        await results.flush()
+        results.boards.clear()
+
+        # Un autre processus garde le verrou d'écriture : le flush suivant attend dans son thread
+        other = sqlite3.connect(db_path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        await results.record(1, DAY, 11, 4, True)
+        flush = asyncio.create_task(results.flush())
+        await asyncio.sleep(0.05)
+
+        results.boards.clear()
+        started = time.monotonic()
+        board = await results.board(1, DAY)
+        played = await results.has_played(2, DAY, 20)
+        elapsed = time.monotonic() - started
+        assert not flush.done()
+
+        other.execute("COMMIT")
+        other.close()
+        await flush
+        await results.close()
+        return board, played, elapsed
+
+    board, played, elapsed = asyncio.run(scenario())
+    assert elapsed < 0.5
+    assert played
+    # Résultat en base et résultat en cours d'écriture, chacun compté une fois
+    assert board.players == {10, 11}
+    assert board.distribution[2:4] == [1, 1]
@@ -0,0 +1,17 @@
+import random
+from games.sessions import WordleSession
+from games.wordle_game import WordleGame
+
+
+def test_hint_respects_hard_mode():
+    game = WordleGame(sessions_path=None)
+    game.scoring.load()
+    rng = random.Random(3)
+    for _ in range(10):
+        word, guess = rng.sample(game.word_list, 2)
+        session = WordleSession(1, word, 6, hard=True)
+        session.add_attempt(guess, game.scoring.pattern(guess, word))
+
+        hint, candidates, _ = game.solver.suggest(session.history(), game.hard_mode_filter(session))
+        assert game.constraints_for(session).hard_mode_violation(hint) is None
+        assert word in candidates
@@ -0,0 +1,31 @@
+from games.build_lexicon import ensure_lexicon
+from games.lexicon import HEADER, MAGIC, PackedLexicon, read_header, write_lexicon
+
+
+def test_membership_uses_file_and_extra_words(tmp_path):
+    path = str(tmp_path / "mots.lex")
+    write_lexicon(path, ["école", "Bœufs", "arbre", "trop-long", "chat"], 5)
+    lexicon = PackedLexicon(path, extra_words=["POMME"])
+
+    assert "ECOLE" in lexicon
+    assert "ecole" in lexicon
+    assert "BOEUF" not in lexicon  # BŒUFS donne BOEUFS (6 lettres)
+    assert "ARBRE" in lexicon
+    assert "POMME" in lexicon
+    assert "ZZZZZ" not in lexicon
+    assert "CHAT" not in lexicon
+    assert list(lexicon) == ["ARBRE", "ECOLE", "POMME"]
+    assert lexicon.complete("a") == ["ARBRE"]
+
+
+def test_old_format_is_rebuilt(tmp_path):
+    source = tmp_path / "mots.txt"
+    source.write_text("arbre\nécole\n", encoding="utf-8")
+    output = str(tmp_path / "mots.lex")
+    with open(output, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 1, 5, 0))
+
+    assert ensure_lexicon([str(source)], output)
+    assert read_header(output)[2] == 2
+    assert not ensure_lexicon([str(source)], output)
+    assert "ECOLE" in PackedLexicon(output)
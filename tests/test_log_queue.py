@@ -0,0 +1,120 @@
+import asyncio
+import sys
+import types
+import discord
+
+# global_var (configuration locale du bot) n'est pas versionné
+sys.modules.setdefault("global_var", types.SimpleNamespace(CHANNEL_ID=0))
+from log import LogQueue, log_command, log_queue
+
+
+class SlowChannel:
+    def __init__(self):
+        self.sent = []
+        self.in_flight = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def send(self, content=None, embeds=None):
+        self.in_flight.set()
+        await self.release.wait()
+        self.sent.append([embed.title for embed in embeds])
+
+
+class FakeBot:
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get_channel(self, channel_id):
+        return self.channel
+
+
+def test_close_waits_for_message_in_flight():
+    async def scenario():
+        channel = SlowChannel()
+        queue = LogQueue(0, flush_interval=0.01)
+        for i in range(3):
+            queue.push(discord.Embed(title=f"log {i}"))
+        queue.start(FakeBot(channel))
+        await channel.in_flight.wait()
+
+        # Arrêt demandé pendant l'envoi du premier message
+        queue.push(discord.Embed(title="log 3"))
+        closing = asyncio.create_task(queue.close())
+        await asyncio.sleep(0.05)
+        assert not closing.done()
+        channel.release.set()
+        await closing
+        return channel.sent
+
+    sent = asyncio.run(scenario())
+    # Chaque log envoyé exactement une fois, dans l'ordre
+    assert sent == [["log 0", "log 1", "log 2"], ["log 3"]]
+
+
+def test_close_sends_batch_being_filled():
+    async def scenario():
+        channel = SlowChannel()
+        channel.release.set()
+        queue = LogQueue(0, flush_interval=60)
+        queue.start(FakeBot(channel))
+        queue.push(discord.Embed(title="log 0"))
+        await asyncio.sleep(0.05)  # en attente des logs suivants
+        await queue.close()
+        return channel.sent
+
+    assert asyncio.run(scenario()) == [["log 0"]]
+
+
+class StrictChannel:
+    def __init__(self, fail=False):
+        self.sent = []
+        self.fail = fail
+
+    async def send(self, content=None, embeds=None):
+        if self.fail:
+            raise discord.HTTPException(types.SimpleNamespace(status=503, reason="Service Unavailable"), "")
+        if any(len(field.value) > 1024 for embed in embeds for field in embed.fields):
+            raise discord.HTTPException(types.SimpleNamespace(status=400, reason="Bad Request"), "Invalid Form Body")
+        self.sent.append((content, [embed.title for embed in embeds]))
+
+
+def test_invalid_embed_does_not_drop_batch():
+    async def scenario():
+        channel = StrictChannel()
+        queue = LogQueue(0)
+        queue.bot = FakeBot(channel)
+        embeds = [discord.Embed(title=f"log {i}") for i in range(3)]
+        embeds[1].add_field(name="Response", value="x" * 2000)
+        await queue._send(embeds)
+        await queue._send([discord.Embed(title="log 3")])
+        return channel.sent
+
+    sent = asyncio.run(scenario())
+    assert sent == [(None, ["log 0"]), ("⚠️ 1 log(s) perdu(s)", ["log 2"]), (None, ["log 3"])]
+
+
+def test_lost_count_kept_until_sent():
+    async def scenario():
+        channel = StrictChannel(fail=True)
+        queue = LogQueue(0, max_size=1)
+        queue.bot = FakeBot(channel)
+        queue.push(discord.Embed(title="log 0"))
+        queue.push(discord.Embed(title="log 1"))  # file pleine
+        await queue._send([discord.Embed(title="log 0")])
+        channel.fail = False
+        await queue._send([discord.Embed(title="log 2")])
+        return channel.sent, queue.dropped
+
+    sent, dropped = asyncio.run(scenario())
+    assert sent == [("⚠️ 2 log(s) perdu(s)", ["log 2"])]
+    assert dropped == 0
+
+
+def test_log_command_truncates_long_response(monkeypatch):
+    pushed = []
+    monkeypatch.setattr(log_queue, "push", pushed.append)
+    ctx = types.SimpleNamespace(author=types.SimpleNamespace(id=1), message=types.SimpleNamespace(content="!cmd " + "a" * 3000))
+    asyncio.run(log_command(ctx, "r" * 5000))
+    fields = pushed[0].fields
+    assert all(len(field.value) <= 1024 for field in fields)
+    assert fields[2].value.endswith("…")
@@ -0,0 +1,46 @@
+import asyncio
+from valorant.rank_ctrl import RankCache
+
+
+def test_waiter_survives_leader_cancellation():
+    async def scenario():
+        cache = RankCache()
+        calls = []
+
+        async def fetch(username_tag):
+            calls.append(username_tag)
+            await asyncio.sleep(0.05)
+            return {"success": True, "rank": "Gold 2"}
+
+        leader = asyncio.create_task(cache.get("emm4#000", fetch))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.get("EMM4#000", fetch))
+        await asyncio.sleep(0.01)
+
+        leader.cancel()
+        result = await waiter
+        assert leader.cancelled()
+        return result, calls
+
+    result, calls = asyncio.run(scenario())
+    assert result == {"success": True, "rank": "Gold 2"}
+    # Le second appelant a relancé la recherche après l'annulation du premier
+    assert len(calls) == 2
+
+
+def test_waiters_share_leader_result():
+    async def scenario():
+        cache = RankCache()
+        calls = []
+
+        async def fetch(username_tag):
+            calls.append(username_tag)
+            await asyncio.sleep(0.01)
+            return {"success": True, "rank": "Iron 1"}
+
+        results = await asyncio.gather(*(cache.get("emm4#000", fetch) for _ in range(5)))
+        return results, calls
+
+    results, calls = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(result["rank"] == "Iron 1" for result in results)
@@ -0,0 +1,32 @@
+import asyncio
+import time
+from games.sessions import SessionStore
+
+
+def test_evicted_session_visible_while_flush_is_writing(tmp_path):
+    async def scenario():
+        store = SessionStore(str(tmp_path / "sessions.db"), max_sessions=1)
+        await store.load_ids()
+        await store.create(1, "POMME")
+        await store.create(2, "ARBRE")  # la partie 1 sort de la mémoire
+
+        write = store._write
+
+        def slow_write(rows):
+            time.sleep(0.2)
+            write(rows)
+
+        store._write = slow_write
+        flush = asyncio.create_task(store.flush())
+        await asyncio.sleep(0.05)
+        during = await store.get(1)  # transaction pas encore validée
+        await flush
+        store.sessions.clear()
+        after = await store.get(1)
+        await store.close()
+        return during, after
+
+    during, after = asyncio.run(scenario())
+    assert during is not None and during.word == "POMME"
+    assert after is not None and after.word == "POMME"
+
@@ -0,0 +1,50 @@
+import asyncio
+import sqlite3
+import time
+from games.sessions import SharedSessionStore
+
+
+def test_loop_stays_responsive_while_another_process_writes(tmp_path):
+    db_path = str(tmp_path / "sessions.db")
+
+    async def scenario():
+        store = SharedSessionStore(db_path, busy_timeout=5.0)
+        await store.create(1, "POMME")
+
+        # Un autre processus garde le verrou d'écriture
+        other = sqlite3.connect(db_path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+
+        gaps = []
+
+        async def ticker():
+            last = time.monotonic()
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.monotonic()
+                gaps.append(now - last)
+                last = now
+
+        def play(session):
+            session.add_attempt("ARBRE", 0)
+            return session.attempt_count
+
+        ticks = asyncio.create_task(ticker())
+        update = asyncio.create_task(store.update(1, play))
+        await asyncio.sleep(0.3)
+        assert not update.done()  # en attente du verrou...
+        other.execute("COMMIT")
+        result = await update  # ... puis appliquée dès sa libération
+
+        ticks.cancel()
+        other.close()
+        session = await store.get(1)
+        await store.close()
+        return result, session, gaps
+
+    result, session, gaps = asyncio.run(scenario())
+    assert result == 1
+    assert session.attempt_count == 1
+    # La boucle a continué de tourner pendant toute l'attente
+    assert len(gaps) >= 15
+    assert max(gaps) < 0.1
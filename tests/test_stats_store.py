@@ -0,0 +1,39 @@
+import asyncio
+import sqlite3
+import time
+from games.stats import StatsStore
+
+
+def test_reads_do_not_wait_for_blocked_flush(tmp_path):
+    db_path = str(tmp_path / "stats.db")
+
+    async def scenario():
+        store = StatsStore(db_path)
+        await store.record(1, True, 3)
+        await store.record(2, False, 6)
+        await store.flush()
+        store.cache.clear()
+
+        # Un autre processus garde le verrou d'écriture : le flush suivant attend dans son thread
+        other = sqlite3.connect(db_path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        await store.record(1, True, 4)
+        flush = asyncio.create_task(store.flush())
+        await asyncio.sleep(0.05)
+
+        started = time.monotonic()
+        stats = await store.get(2)
+        ranking = await store.top()
+        elapsed = time.monotonic() - started
+        assert not flush.done()
+
+        other.execute("COMMIT")
+        other.close()
+        await flush
+        await store.close()
+        return stats, ranking, elapsed
+
+    stats, ranking, elapsed = asyncio.run(scenario())
+    assert elapsed < 0.5
+    assert (stats.played, stats.wins) == (1, 0)
+    assert [(player.user_id, player.wins) for player in ranking] == [(1, 2), (2, 0)]
@@ -0,0 +1,52 @@
+import asyncio
+from state_store import state_store
+from twitch.stream_monitor import TwitchMonitor
+
+STREAM = {"id": "111", "user_name": "Emm4", "title": "Live", "thumbnail_url": "", "started_at": None}
+
+
+class FakeHelix:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    async def get_streams(self, logins):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def make_monitor(monkeypatch, responses):
+    monkeypatch.setattr(state_store, "path", None)
+    monkeypatch.setattr(state_store, "_data", {})
+    monitor = TwitchMonitor(None, "id", "secret", "emm4", 0, helix=FakeHelix(responses))
+    notifications = []
+
+    async def send_stream_notification(stream_data):
+        notifications.append(stream_data["id"])
+
+    monitor.send_stream_notification = send_stream_notification
+    return monitor, notifications
+
+
+def poll(monitor, times):
+    async def scenario():
+        for _ in range(times):
+            await monitor.update_stream_state(await monitor.check_stream_status())
+
+    asyncio.run(scenario())
+
+
+def test_failed_poll_keeps_stream_live(monkeypatch):
+    monitor, notifications = make_monitor(monkeypatch, [{"emm4": STREAM}, None, RuntimeError("timeout"), {"emm4": STREAM}])
+    poll(monitor, 4)
+    assert notifications == ["111"]
+    assert monitor.is_live
+    assert state_store.get("twitch:emm4") == {"is_live": True, "stream_id": "111"}
+
+
+def test_same_stream_is_not_announced_twice(monkeypatch):
+    # Réponse vide de Twitch au milieu du stream : le même stream n'est pas annoncé de nouveau
+    monitor, notifications = make_monitor(monkeypatch, [{"emm4": STREAM}, {}, {"emm4": STREAM}, {}, {"emm4": dict(STREAM, id="222")}])
+    poll(monitor, 5)
+    assert notifications == ["111", "222"]
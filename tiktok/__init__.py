@@ -1,3 +1,4 @@
 from .tiktok_monitor import TikTokMonitor
+from .multi_monitor import MultiTikTokMonitor
 
-__all__ = ['TikTokMonitor']
+__all__ = ['TikTokMonitor', 'MultiTikTokMonitor']
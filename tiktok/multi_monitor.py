@@ -0,0 +1,92 @@
+import asyncio
+import random
+import time
+from typing import Dict, List
+from discord.ext import tasks
+from http_client import http_client
+from .tiktok_monitor import TikTokMonitor
+
+class MultiTikTokMonitor:
+    def __init__(self, bot, accounts: List[dict], interval: int = 300, jitter: float = 0.1,
+                 rate: float = 0.5, burst: int = 2, concurrency: int = 2):
+        """
+        Moniteur de nouveaux TikToks pour plusieurs comptes
+
+        Les vérifications sont réparties sur l'intervalle (avec un décalage
+        aléatoire) plutôt que lancées toutes en même temps, et chaque requête
+        vers tiktok.com passe par un limiteur de débit commun.
+
+        Args:
+            bot: Instance du bot Discord
+            accounts: Liste de dicts {"username", "notification_channel_id"}
+            interval: Intervalle (en secondes) entre deux vérifications d'un même compte
+            jitter: Décalage aléatoire maximal, en fraction de l'intervalle
+            rate: Nombre de requêtes par seconde autorisées vers tiktok.com
+            burst: Nombre de requêtes pouvant partir d'un coup
+            concurrency: Nombre maximal de requêtes simultanées vers tiktok.com
+        """
+        self.bot = bot
+        self.interval = interval
+        self.jitter = jitter
+        self.accounts: Dict[str, TikTokMonitor] = {}  # username: moniteur du compte
+        for account in accounts:
+            monitor = TikTokMonitor(bot, account["username"], account["notification_channel_id"])
+            self.accounts[monitor.tiktok_username] = monitor
+        self.next_due: Dict[str, float] = {}  # username: instant (time.monotonic) de la prochaine vérification
+        self._running: Dict[str, asyncio.Task] = {}  # username: vérification en cours
+        http_client.set_rate_limit(TikTokMonitor.HOST, rate, burst, concurrency)
+
+    def _jitter(self) -> float:
+        return random.uniform(-self.jitter, self.jitter) * self.interval
+
+    def schedule(self):
+        """Répartit les premières vérifications des comptes sur un intervalle"""
+        now = time.monotonic()
+        step = self.interval / max(len(self.accounts), 1)
+        for index, username in enumerate(self.accounts):
+            self.next_due[username] = now + index * step + abs(self._jitter()) / 2
+
+    async def _poll(self, username: str):
+        try:
+            await self.accounts[username].check_for_new_video()
+        except Exception as e:
+            print(f"❌ Erreur lors de la vérification TikTok de @{username}: {e}")
+        finally:
+            self._running.pop(username, None)
+
+    @tasks.loop(seconds=5)
+    async def monitor_tiktoks(self):
+        """Lance les vérifications arrivées à échéance (sans attendre leur fin)"""
+        now = time.monotonic()
+        for username, due in self.next_due.items():
+            if due > now or username in self._running:
+                continue
+            self.next_due[username] = due + self.interval + self._jitter()
+            # Après une longue pause, ne pas enchaîner les vérifications en retard
+            if self.next_due[username] < now:
+                self.next_due[username] = now + self.interval
+            self._running[username] = asyncio.create_task(self._poll(username))
+
+    @monitor_tiktoks.before_loop
+    async def before_monitor_tiktoks(self):
+        """Attend que le bot soit prêt avant de démarrer la surveillance"""
+        await self.bot.wait_until_ready()
+        self.schedule()
+        print(f"🔍 Surveillance TikTok de {len(self.accounts)} comptes démarrée")
+
+    def account_stats(self) -> Dict[str, dict]:
+        """Statistiques par compte : dernier succès, échecs, latence, compteurs de requêtes"""
+        return {
+            username: {**monitor.stats, **monitor.fetch_counters}
+            for username, monitor in self.accounts.items()
+        }
+
+    def start(self):
+        """Démarre la surveillance TikTok"""
+        self.monitor_tiktoks.start()
+
+    def stop(self):
+        """Arrête la surveillance TikTok"""
+        self.monitor_tiktoks.cancel()
+        for task in self._running.values():
+            task.cancel()
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import re
+import time
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # orjson absent : décodeur standard, plus lent
+    json_loads = json.loads
+
+VIDEO_ID_PATTERN = re.compile(rb'"id":"(\d{19})"')
+# Champs qui identifient les vidéos dans le JSON d'état (le reste change à chaque requête : nonces, horodatages)
+ITEM_FIELDS_PATTERN = re.compile(rb'"id":"\d{19}"|"createTime":"?\d+')
+DESC_PATTERN = re.compile(rb'"desc":"((?:[^"\\]|\\.)*)"')
+DESC_OPENER = b'"desc":"'
+STATE_SCRIPT_IDS = (b'"__UNIVERSAL_DATA_FOR_REHYDRATION__"', b'"SIGI_STATE"')
+SCRIPT_END = b'</script>'
+
+
+class ProfileScanner:
+    ID_OVERLAP = 32          # un ID coupé entre deux morceaux tient dans ces octets
+    MAX_DESC_BYTES = 64 * 1024
+
+    def __init__(self, max_bytes: int = 2 * 1024 * 1024):
+        """
+        Analyse incrémentale d'une page de profil TikTok
+
+        Le HTML est fourni par morceaux avec feed() : on cherche le premier ID
+        de vidéo puis la description qui le suit, et l'analyse s'arrête dès
+        que les deux sont trouvés. Seule la fin du tampon utile est gardée en
+        mémoire entre deux morceaux.
+
+        Args:
+            max_bytes: Nombre maximal d'octets lus avant d'abandonner
+        """
+        self.max_bytes = max_bytes
+        self.buffer = bytearray()
+        self.bytes_read = 0
+        self.parse_time = 0.0  # en secondes, temps passé dans feed()
+        self.video_id = None
+        self.raw_description = None
+        self.truncated = False
+
+    @property
+    def done(self) -> bool:
+        return self.raw_description is not None or self.truncated
+
+    @property
+    def description(self):
+        """Description décodée (le décodage n'a lieu que si elle est demandée)"""
+        if self.raw_description is None:
+            return None
+        return _decode_json_string(self.raw_description)
+
+    @property
+    def digest(self):
+        """Empreinte de la section utile (ID + description brute), None si aucune vidéo trouvée"""
+        if self.video_id is None:
+            return None
+        section = self.video_id.encode() + b"\0" + (self.raw_description or b"")
+        return hashlib.blake2b(section, digest_size=16).hexdigest()
+
+    def feed(self, chunk: bytes) -> bool:
+        """Ajoute un morceau du body. Retourne True quand il n'est plus utile de lire la suite"""
+        start = time.perf_counter()
+        self.bytes_read += len(chunk)
+        self.buffer += chunk
+
+        if self.video_id is None:
+            match = VIDEO_ID_PATTERN.search(self.buffer)
+            if match:
+                self.video_id = match.group(1).decode()
+                del self.buffer[:match.end()]
+            elif len(self.buffer) > self.ID_OVERLAP:
+                del self.buffer[:-self.ID_OVERLAP]
+
+        if self.video_id is not None:
+            match = DESC_PATTERN.search(self.buffer)
+            if match:
+                self.raw_description = bytes(match.group(1))
+                self.buffer.clear()
+            else:
+                self._trim_for_description()
+
+        if self.bytes_read >= self.max_bytes and not self.done:
+            self.truncated = True
+        self.parse_time += time.perf_counter() - start
+        return self.done
+
+    def _trim_for_description(self):
+        """Garde une description commencée mais pas encore terminée, sinon juste la fin du tampon"""
+        opener = self.buffer.find(DESC_OPENER)
+        if opener != -1 and len(self.buffer) - opener <= self.MAX_DESC_BYTES:
+            del self.buffer[:opener]
+        elif len(self.buffer) > len(DESC_OPENER):
+            del self.buffer[:-len(DESC_OPENER)]
+
+    def stats(self) -> dict:
+        """Statistiques de l'analyse (octets lus, temps d'analyse en ms, résultat)"""
+        return {
+            "bytes_read": self.bytes_read,
+            "parse_time_ms": round(self.parse_time * 1000, 3),
+            "found": self.video_id is not None,
+            "truncated": self.truncated
+        }
+
+
+class StateBlobScanner:
+    MARKER_OVERLAP = 64
+
+    def __init__(self, max_bytes: int = 2 * 1024 * 1024):
+        """
+        Extraction incrémentale du JSON d'état embarqué dans une page de profil TikTok
+
+        Cherche le <script> __UNIVERSAL_DATA_FOR_REHYDRATION__ (ou SIGI_STATE),
+        récupère son contenu et s'arrête à la balise </script> : le reste de
+        la page n'est pas lu.
+
+        Args:
+            max_bytes: Nombre maximal d'octets lus avant d'abandonner
+        """
+        self.max_bytes = max_bytes
+        self.buffer = bytearray()
+        self.bytes_read = 0
+        self.parse_time = 0.0  # en secondes, temps passé dans feed()
+        self.in_blob = False
+        self.blob = None
+        self.truncated = False
+        self._end_search_from = 0
+
+    @property
+    def done(self) -> bool:
+        return self.blob is not None or self.truncated
+
+    @property
+    def digest(self):
+        """Empreinte de la liste des vidéos (ID et createTime), None si aucune vidéo n'a été trouvée"""
+        if self.blob is None:
+            return None
+        fields = ITEM_FIELDS_PATTERN.findall(self.blob)
+        if not fields:
+            return None
+        return hashlib.blake2b(b"\0".join(fields), digest_size=16).hexdigest()
+
+    def feed(self, chunk: bytes) -> bool:
+        """Ajoute un morceau du body. Retourne True quand il n'est plus utile de lire la suite"""
+        start = time.perf_counter()
+        self.bytes_read += len(chunk)
+        self.buffer += chunk
+
+        if not self.in_blob:
+            self._find_blob_start()
+
+        if self.in_blob:
+            end = self.buffer.find(SCRIPT_END, self._end_search_from)
+            if end != -1:
+                self.blob = bytes(self.buffer[:end])
+                self.buffer.clear()
+            else:
+                self._end_search_from = max(0, len(self.buffer) - len(SCRIPT_END))
+
+        if self.bytes_read >= self.max_bytes and not self.done:
+            self.truncated = True
+        self.parse_time += time.perf_counter() - start
+        return self.done
+
+    def _find_blob_start(self):
+        for script_id in STATE_SCRIPT_IDS:
+            position = self.buffer.find(script_id)
+            if position == -1:
+                continue
+            tag_end = self.buffer.find(b'>', position)
+            if tag_end == -1:
+                # Balise ouvrante coupée : attendre le morceau suivant
+                del self.buffer[:position]
+            else:
+                del self.buffer[:tag_end + 1]
+                self.in_blob = True
+            return
+        if len(self.buffer) > self.MARKER_OVERLAP:
+            del self.buffer[:-self.MARKER_OVERLAP]
+
+    def stats(self) -> dict:
+        """Statistiques de l'analyse (octets lus, temps d'analyse en ms, résultat)"""
+        return {
+            "bytes_read": self.bytes_read,
+            "parse_time_ms": round(self.parse_time * 1000, 3),
+            "found": self.blob is not None,
+            "truncated": self.truncated
+        }
+
+
+def extract_videos(blob: bytes) -> list:
+    """
+    Extrait les vidéos du JSON d'état d'une page de profil
+
+    Seuls les objets qui ressemblent à une vidéo (ID de 19 chiffres avec
+    createTime et desc) sont retenus, ce qui écarte les autres champs "id".
+
+    Returns:
+        list: dicts {"id", "create_time", "description"}, du plus récent au plus ancien
+    """
+    videos = {}
+    stack = [json_loads(blob)]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            video_id = node.get("id")
+            if (isinstance(video_id, str) and len(video_id) == 19 and video_id.isdigit()
+                    and "createTime" in node and "desc" in node):
+                videos[video_id] = {
+                    "id": video_id,
+                    "create_time": int(node.get("createTime") or 0),
+                    "description": node.get("desc") or ""
+                }
+                continue
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return sorted(videos.values(), key=lambda video: (video["create_time"], int(video["id"])), reverse=True)
+
+
+def _decode_json_string(raw: bytes) -> str:
+    """Décode une chaîne JSON brute (séquences \\n, \\uXXXX, ...)"""
+    try:
+        return json.loads(b'"' + raw + b'"')
+    except ValueError:
+        return raw.decode("utf-8", errors="replace")
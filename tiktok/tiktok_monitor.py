@@ -1,11 +1,17 @@
-import aiohttp
 import discord
 from discord.ext import tasks
 from datetime import datetime
-import re
+import time
+from http_client import http_client
+from state_store import state_store
+from .parser import ProfileScanner, StateBlobScanner, extract_videos
 
 class TikTokMonitor:
-    def __init__(self, bot, tiktok_username: str, notification_channel_id: int):
+    HOST = "www.tiktok.com"
+    CHUNK_SIZE = 16 * 1024
+    MAX_NOTIFICATIONS_PER_POLL = 5
+
+    def __init__(self, bot, tiktok_username: str, notification_channel_id: int, max_body_bytes: int = 2 * 1024 * 1024):
         """
         Moniteur de nouveaux TikToks
         
@@ -13,56 +19,158 @@ class TikTokMonitor:
             bot: Instance du bot Discord
             tiktok_username: Nom d'utilisateur TikTok à surveiller (avec ou sans @)
             notification_channel_id: ID du salon Discord où envoyer les notifications
+            max_body_bytes: Nombre maximal d'octets lus sur la page de profil
         """
         self.bot = bot
         self.tiktok_username = tiktok_username.replace('@', '')
         self.notification_channel_id = notification_channel_id
-        self.last_video_id = None
+        self.max_body_bytes = max_body_bytes
+        self.last_fetch_stats = None  # octets lus et temps d'analyse de la dernière vérification
+        # Requêtes conditionnelles : validateurs HTTP et empreinte de la dernière page analysée
+        self.etag = None
+        self.last_modified = None
+        self.last_digest = None
+        self.last_videos = []
+        self.last_body_bytes = 0
+        self.fetch_counters = {
+            "not_modified": 0,   # réponses 304
+            "digest_hits": 0,    # page reçue mais section utile inchangée
+            "misses": 0,         # section utile nouvelle ou modifiée
+            "bytes_saved": 0     # octets non téléchargés grâce aux 304
+        }
+        self.stats = {
+            "last_success": None,
+            "last_failure": None,
+            "failures": 0,
+            "consecutive_failures": 0,
+            "last_latency_ms": None
+        }
+        # Reprendre la dernière vidéo connue : pas de nouvelle référence à prendre après un redémarrage
+        self.last_video_id = state_store.get(self.state_key, {}).get("last_video_id")
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': 'gzip, deflate, br'
         }
     
-    async def get_latest_video(self):
-        """Récupère la dernière vidéo TikTok via le feed RSS"""
+    @property
+    def state_key(self) -> str:
+        """Clé de ce moniteur dans le stockage d'état"""
+        return f"tiktok:{self.tiktok_username}"
+
+    def save_state(self):
+        """Sauvegarde la dernière vidéo connue (appelé à chaque nouvelle vidéo)"""
+        state_store.set(self.state_key, {"last_video_id": self.last_video_id})
+
+    async def get_recent_videos(self):
+        """
+        Récupère les vidéos récentes depuis la page de profil (lue par morceaux)
+
+        Returns:
+            list: vidéos du plus récent au plus ancien (dicts id, url, description, username,
+                  create_time), ou None en cas d'erreur
+        """
         try:
-            # Utiliser le feed RSS de TikTok
-            url = f"https://www.tiktok.com/@{self.tiktok_username}"
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers, timeout=10) as response:
-                    if response.status != 200:
-                        print(f"⚠️ Erreur lors de la récupération du profil TikTok: {response.status}")
-                        return None
-                    
-                    html = await response.text()
-                    
-                    # Chercher l'ID de la dernière vidéo dans le HTML
-                    # Pattern pour trouver les IDs de vidéos TikTok
-                    video_pattern = r'"id":"(\d{19})"'
-                    matches = re.findall(video_pattern, html)
-                    
-                    if matches:
-                        latest_id = matches[0]
-                        video_url = f"https://www.tiktok.com/@{self.tiktok_username}/video/{latest_id}"
-                        
-                        # Extraire d'autres infos si possible
-                        desc_pattern = r'"desc":"([^"]*)"'
-                        desc_matches = re.findall(desc_pattern, html)
-                        description = desc_matches[0] if desc_matches else "Nouvelle vidéo TikTok"
-                        
-                        return {
-                            "id": latest_id,
-                            "url": video_url,
-                            "description": description,
-                            "username": self.tiktok_username
-                        }
-                    
-                    return None
-                    
+            videos = await self._fetch_recent_videos()
         except Exception as e:
-            print(f"❌ Erreur lors de la récupération de la vidéo TikTok: {e}")
+            self.stats["failures"] += 1
+            self.stats["consecutive_failures"] += 1
+            self.stats["last_failure"] = datetime.utcnow()
+            print(f"❌ Erreur lors de la récupération de la vidéo TikTok (@{self.tiktok_username}): {e}")
             return None
-    
+
+        self.stats["consecutive_failures"] = 0
+        self.stats["last_success"] = datetime.utcnow()
+        return videos
+
+    async def get_latest_video(self):
+        """Récupère la dernière vidéo TikTok, ou None"""
+        videos = await self.get_recent_videos()
+        return videos[0] if videos else None
+
+    async def _fetch_recent_videos(self) -> list:
+        """Télécharge et analyse la page de profil (lève une exception en cas d'échec)"""
+        url = f"https://{self.HOST}/@{self.tiktok_username}"
+
+        headers = dict(self.headers)
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        started = time.perf_counter()
+        # Limiteur de débit, délai maximal, nouvelles tentatives et disjoncteur de tiktok.com
+        async with http_client.request("GET", url, headers=headers, timeout=10, retries=1, deadline=25) as response:
+            # Page inchangée depuis la dernière vérification
+            if response.status == 304:
+                self.stats["last_latency_ms"] = round((time.perf_counter() - started) * 1000)
+                self.fetch_counters["not_modified"] += 1
+                self.fetch_counters["bytes_saved"] += self.last_body_bytes
+                return self.last_videos
+
+            if response.status != 200:
+                raise RuntimeError(f"statut HTTP {response.status}")
+
+            # Lire le body par morceaux jusqu'à la fin du JSON d'état embarqué.
+            # L'analyse par expressions régulières sert de repli si la page n'en contient pas.
+            blob_scanner = StateBlobScanner(max_bytes=self.max_body_bytes)
+            fallback_scanner = ProfileScanner(max_bytes=self.max_body_bytes)
+            async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                if not fallback_scanner.done:
+                    fallback_scanner.feed(chunk)
+                if blob_scanner.feed(chunk):
+                    break
+
+            # Validateurs gardés seulement si la page est analysée avec succès (voir _remember_validators)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+        self.stats["last_latency_ms"] = round((time.perf_counter() - started) * 1000)
+
+        self.last_fetch_stats = blob_scanner.stats()
+        self.last_fetch_stats["parse_time_ms"] = round((blob_scanner.parse_time + fallback_scanner.parse_time) * 1000, 3)
+        self.last_body_bytes = blob_scanner.bytes_read
+
+        scanner = blob_scanner if blob_scanner.blob is not None else fallback_scanner
+        digest = scanner.digest
+        if digest is None:
+            if blob_scanner.truncated:
+                print(f"⚠️ Profil TikTok tronqué après {blob_scanner.bytes_read} octets sans vidéo trouvée")
+            return []
+
+        # Section utile identique : réutiliser le résultat précédent sans rien décoder
+        if digest == self.last_digest and self.last_videos:
+            self.fetch_counters["digest_hits"] += 1
+            self._remember_validators(etag, last_modified)
+            return self.last_videos
+
+        self.fetch_counters["misses"] += 1
+        if scanner is blob_scanner:
+            parse_start = time.perf_counter()
+            videos = extract_videos(blob_scanner.blob)
+            parse_time_ms = self.last_fetch_stats["parse_time_ms"] + (time.perf_counter() - parse_start) * 1000
+            self.last_fetch_stats["parse_time_ms"] = round(parse_time_ms, 3)
+        else:
+            videos = [{"id": fallback_scanner.video_id, "create_time": None, "description": fallback_scanner.description}]
+
+        self.last_digest = digest
+        self.last_videos = [
+            {
+                "id": video["id"],
+                "url": f"https://{self.HOST}/@{self.tiktok_username}/video/{video['id']}",
+                "description": video["description"] or "Nouvelle vidéo TikTok",
+                "username": self.tiktok_username,
+                "create_time": video["create_time"]
+            }
+            for video in videos
+        ]
+        if self.last_videos:
+            self._remember_validators(etag, last_modified)
+        return self.last_videos
+
+    def _remember_validators(self, etag, last_modified):
+        """Garde les validateurs HTTP d'une page analysée avec succès (une page tronquée ne doit pas être servie en 304)"""
+        self.etag = etag
+        self.last_modified = last_modified
+
     async def send_tiktok_notification(self, video_data):
         """Envoie une notification Discord quand une nouvelle vidéo TikTok est postée"""
         channel = self.bot.get_channel(self.notification_channel_id)
@@ -100,19 +208,33 @@ class TikTokMonitor:
     @tasks.loop(minutes=5)  # Vérifie toutes les 5 minutes
     async def monitor_tiktok(self):
         """Tâche périodique pour surveiller les nouveaux TikToks"""
-        video_data = await self.get_latest_video()
-        
-        if video_data:
-            # Si c'est la première vérification, enregistrer l'ID sans notifier
-            if self.last_video_id is None:
-                self.last_video_id = video_data['id']
-                print(f"ℹ️ Dernière vidéo TikTok enregistrée: {video_data['id']}")
-            
-            # Si une nouvelle vidéo est détectée
-            elif video_data['id'] != self.last_video_id:
-                self.last_video_id = video_data['id']
-                await self.send_tiktok_notification(video_data)
-    
+        await self.check_for_new_video()
+
+    async def check_for_new_video(self):
+        """Vérifie le profil une fois et notifie chaque vidéo publiée depuis la dernière connue"""
+        videos = await self.get_recent_videos()
+        if not videos:
+            return
+
+        # Si c'est la première vérification, enregistrer la plus récente sans notifier
+        if self.last_video_id is None:
+            self.last_video_id = max(videos, key=lambda video: int(video['id']))['id']
+            self.save_state()
+            print(f"ℹ️ Dernière vidéo TikTok enregistrée: {self.last_video_id}")
+            return
+
+        # Toutes les vidéos plus récentes que la dernière connue, de la plus ancienne à la plus récente
+        high_water_mark = int(self.last_video_id)
+        new_videos = sorted(
+            (video for video in videos if int(video['id']) > high_water_mark),
+            key=lambda video: int(video['id'])
+        )[-self.MAX_NOTIFICATIONS_PER_POLL:]
+
+        for video_data in new_videos:
+            await self.send_tiktok_notification(video_data)
+            self.last_video_id = video_data['id']
+            self.save_state()
+
     @monitor_tiktok.before_loop
     async def before_monitor_tiktok(self):
         """Attend que le bot soit prêt avant de démarrer la surveillance"""
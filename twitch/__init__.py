@@ -1,3 +1,6 @@
 from .stream_monitor import TwitchMonitor
+from .multi_monitor import MultiTwitchMonitor
+from .helix import HelixClient
+from .scheduler import AdaptivePollScheduler
 
-__all__ = ['TwitchMonitor']
+__all__ = ['TwitchMonitor', 'MultiTwitchMonitor', 'HelixClient', 'AdaptivePollScheduler']
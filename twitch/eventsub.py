@@ -0,0 +1,161 @@
+import asyncio
+import json
+from collections import deque
+from typing import Awaitable, Callable, List
+import aiohttp
+from http_client import http_client
+
+class EventSubClient:
+    WS_URL = "wss://eventsub.wss.twitch.tv/ws"
+    SUBSCRIPTIONS_URL = "https://api.twitch.tv/helix/eventsub/subscriptions"
+    SUBSCRIPTION_TYPES = ("stream.online", "stream.offline")
+
+    def __init__(self, client_id: str, user_token: str, on_event: Callable[[str, dict], Awaitable], on_connected: Callable[[], Awaitable] = None, ws_url: str = None, subscriptions_url: str = None, max_backoff: int = 60):
+        """
+        Client EventSub (transport WebSocket) pour les événements stream.online / stream.offline
+
+        Twitch impose un token utilisateur (et non le token d'application)
+        pour créer des abonnements sur le transport WebSocket.
+
+        Args:
+            client_id: Client ID de l'application Twitch
+            user_token: Token d'accès utilisateur Twitch
+            on_event: Coroutine appelée avec (type d'abonnement, événement) à chaque notification
+            on_connected: Coroutine appelée quand la session est prête (abonnements créés)
+            ws_url: URL du serveur EventSub (ex: serveur local de test)
+            subscriptions_url: URL de création des abonnements
+            max_backoff: Délai maximal (en secondes) entre deux tentatives de connexion
+        """
+        self.client_id = client_id
+        self.user_token = user_token
+        self.on_event = on_event
+        self.on_connected = on_connected
+        self.ws_url = ws_url or self.WS_URL
+        self.subscriptions_url = subscriptions_url or self.SUBSCRIPTIONS_URL
+        self.max_backoff = max_backoff
+        self.broadcaster_ids: List[str] = []
+        self.connected = False
+        self.session_id = None
+        self._seen_message_ids = deque(maxlen=100)
+
+    async def run(self, broadcaster_ids: List[str]):
+        """Maintient la connexion EventSub ouverte, avec reconnexion et backoff exponentiel"""
+        self.broadcaster_ids = list(broadcaster_ids)
+        delay = 1
+        while True:
+            try:
+                if await self._run_session():
+                    delay = 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Erreur EventSub: {e}")
+
+            self.connected = False
+            print(f"⚠️ Connexion EventSub perdue, nouvelle tentative dans {delay}s (polling en attendant)")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_backoff)
+
+    async def _run_session(self) -> bool:
+        """Ouvre une session, crée les abonnements et lit les messages jusqu'à la déconnexion"""
+        ws, keepalive = await self._open(self.ws_url)
+        try:
+            if not await self._subscribe():
+                return False
+
+            self.connected = True
+            print(f"✅ EventSub connecté (session {self.session_id})")
+            if self.on_connected:
+                await self.on_connected()
+
+            while True:
+                reconnect_url = await self._read_messages(ws, keepalive)
+                if reconnect_url is None:
+                    return True
+
+                # Les abonnements sont conservés : on bascule sur la nouvelle connexion
+                # dès qu'elle est accueillie, puis on ferme l'ancienne.
+                new_ws, keepalive = await self._open(reconnect_url)
+                await ws.close()
+                ws = new_ws
+                print(f"🔁 EventSub reconnecté (session {self.session_id})")
+        finally:
+            self.connected = False
+            await ws.close()
+
+    async def _open(self, url: str):
+        """Se connecte et attend le message session_welcome. Retourne (ws, keepalive en secondes)"""
+        session = await http_client.get_session()
+        ws = await session.ws_connect(url)
+        try:
+            message = await ws.receive_json(timeout=10)
+        except Exception:
+            await ws.close()
+            raise
+
+        if message["metadata"]["message_type"] != "session_welcome":
+            await ws.close()
+            raise RuntimeError(f"Message inattendu à la connexion: {message['metadata']['message_type']}")
+
+        session_data = message["payload"]["session"]
+        self.session_id = session_data["id"]
+        return ws, session_data.get("keepalive_timeout_seconds") or 10
+
+    async def _subscribe(self) -> bool:
+        """Crée les abonnements stream.online / stream.offline sur la session courante"""
+        headers = {
+            "Client-ID": self.client_id,
+            "Authorization": f"Bearer {self.user_token}",
+            "Content-Type": "application/json"
+        }
+        for broadcaster_id in self.broadcaster_ids:
+            for subscription_type in self.SUBSCRIPTION_TYPES:
+                body = {
+                    "type": subscription_type,
+                    "version": "1",
+                    "condition": {"broadcaster_user_id": broadcaster_id},
+                    "transport": {"method": "websocket", "session_id": self.session_id}
+                }
+                async with http_client.request("POST", self.subscriptions_url, headers=headers, json=body, timeout=10) as response:
+                    if response.status not in (200, 202):
+                        print(f"❌ Abonnement EventSub {subscription_type} refusé: {response.status}")
+                        return False
+        return True
+
+    async def _read_messages(self, ws, keepalive: int):
+        """
+        Lit les messages de la session
+
+        Returns:
+            str: URL de reconnexion si Twitch demande de changer de connexion,
+                 None si la connexion est fermée ou si plus aucun message n'arrive
+        """
+        while True:
+            try:
+                # Sans message (même keepalive) dans le délai annoncé, la connexion est considérée morte
+                msg = await ws.receive(timeout=keepalive + 5)
+            except asyncio.TimeoutError:
+                print("⚠️ Aucun keepalive EventSub reçu dans le délai")
+                return None
+
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                return None
+
+            message = json.loads(msg.data)
+            metadata = message["metadata"]
+            if metadata["message_id"] in self._seen_message_ids:
+                continue
+            self._seen_message_ids.append(metadata["message_id"])
+
+            message_type = metadata["message_type"]
+            if message_type == "session_keepalive":
+                continue
+            if message_type == "notification":
+                await self.on_event(metadata["subscription_type"], message["payload"]["event"])
+            elif message_type == "session_reconnect":
+                return message["payload"]["session"]["reconnect_url"]
+            elif message_type == "revocation":
+                subscription = message["payload"]["subscription"]
+                print(f"⚠️ Abonnement EventSub révoqué: {subscription['type']} ({subscription['status']})")
+                # Sans abonnement, la session ne sert plus : on se reconnecte pour se réabonner
+                return None
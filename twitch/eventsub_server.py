@@ -0,0 +1,172 @@
+"""
+Serveur EventSub local pour tester le mode WebSocket sans Twitch
+
+Imite le serveur de test de la Twitch CLI :
+    - ws://HOST:PORT/ws                       : connexion WebSocket (welcome, keepalive)
+    - POST /eventsub/subscriptions            : création des abonnements
+    - POST /trigger/stream.online?login=...   : envoie un événement aux sessions abonnées
+    - POST /trigger/stream.offline?login=...
+    - POST /reconnect                         : envoie session_reconnect à toutes les sessions
+
+Lancement : python -m twitch.eventsub_server --port 8080
+Puis : twitch_monitor.enable_eventsub("token", ws_url="ws://127.0.0.1:8080/ws",
+       subscriptions_url="http://127.0.0.1:8080/eventsub/subscriptions")
+"""
+import argparse
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from aiohttp import web
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _message(message_type: str, payload: dict, subscription: dict = None) -> dict:
+    metadata = {
+        "message_id": str(uuid.uuid4()),
+        "message_type": message_type,
+        "message_timestamp": _now()
+    }
+    if subscription:
+        metadata["subscription_type"] = subscription["type"]
+        metadata["subscription_version"] = subscription["version"]
+    return {"metadata": metadata, "payload": payload}
+
+
+class EventSubTestServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, keepalive_timeout: int = 10):
+        """
+        Serveur EventSub de test
+
+        Args:
+            host: Adresse d'écoute
+            port: Port d'écoute
+            keepalive_timeout: Délai annoncé aux clients entre deux messages (en secondes)
+        """
+        self.host = host
+        self.port = port
+        self.keepalive_timeout = keepalive_timeout
+        self.sockets = {}        # session_id: WebSocketResponse
+        self.subscriptions = {}  # session_id: [subscription]
+        self.app = web.Application()
+        self.app.router.add_get("/ws", self.handle_ws)
+        self.app.router.add_post("/eventsub/subscriptions", self.handle_subscribe)
+        self.app.router.add_post("/trigger/{type}", self.handle_trigger)
+        self.app.router.add_post("/reconnect", self.handle_reconnect)
+        self.app.on_shutdown.append(self.close_sockets)
+
+    def _session(self, session_id: str, reconnect_url: str = None) -> dict:
+        return {
+            "session": {
+                "id": session_id,
+                "status": "reconnecting" if reconnect_url else "connected",
+                "connected_at": _now(),
+                "keepalive_timeout_seconds": None if reconnect_url else self.keepalive_timeout,
+                "reconnect_url": reconnect_url
+            }
+        }
+
+    async def handle_ws(self, request: web.Request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        session_id = str(uuid.uuid4())
+        # Une reconnexion récupère les abonnements de l'ancienne session
+        previous = request.query.get("reconnect_from")
+        self.subscriptions[session_id] = self.subscriptions.pop(previous, []) if previous else []
+        self.sockets[session_id] = ws
+        await ws.send_json(_message("session_welcome", self._session(session_id)))
+
+        async def keepalive():
+            while not ws.closed:
+                await asyncio.sleep(self.keepalive_timeout / 2)
+                if not ws.closed:
+                    await ws.send_json(_message("session_keepalive", {}))
+
+        task = asyncio.create_task(keepalive())
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            task.cancel()
+            self.sockets.pop(session_id, None)
+            self.subscriptions.pop(session_id, None)
+        return ws
+
+    async def handle_subscribe(self, request: web.Request):
+        body = await request.json()
+        session_id = body["transport"]["session_id"]
+        if session_id not in self.sockets:
+            return web.json_response({"error": "Bad Request", "message": "session does not exist"}, status=400)
+
+        subscription = {
+            "id": str(uuid.uuid4()),
+            "status": "enabled",
+            "type": body["type"],
+            "version": body["version"],
+            "condition": body["condition"],
+            "transport": body["transport"],
+            "created_at": _now(),
+            "cost": 0
+        }
+        self.subscriptions[session_id].append(subscription)
+        return web.json_response({"data": [subscription], "total": 1, "total_cost": 0, "max_total_cost": 10}, status=202)
+
+    async def handle_trigger(self, request: web.Request):
+        subscription_type = request.match_info["type"]
+        login = request.query.get("login", "teststreamer")
+        broadcaster_id = request.query.get("broadcaster_user_id")
+
+        event = {
+            "broadcaster_user_id": broadcaster_id,
+            "broadcaster_user_login": login,
+            "broadcaster_user_name": login
+        }
+        if subscription_type == "stream.online":
+            event.update({"id": str(uuid.uuid4().int)[:10], "type": "live", "started_at": _now()})
+
+        sent = 0
+        for session_id, subscriptions in self.subscriptions.items():
+            ws = self.sockets.get(session_id)
+            for subscription in subscriptions:
+                if subscription["type"] != subscription_type or ws is None:
+                    continue
+                condition_id = subscription["condition"].get("broadcaster_user_id")
+                event["broadcaster_user_id"] = broadcaster_id or condition_id
+                if broadcaster_id and condition_id != broadcaster_id:
+                    continue
+                await ws.send_json(_message("notification", {"subscription": subscription, "event": event}, subscription))
+                sent += 1
+        return web.json_response({"sent": sent})
+
+    async def handle_reconnect(self, request: web.Request):
+        for session_id, ws in list(self.sockets.items()):
+            url = f"ws://{self.host}:{self.port}/ws?reconnect_from={session_id}"
+            await ws.send_json(_message("session_reconnect", self._session(session_id, url)))
+        return web.json_response({"sessions": len(self.sockets)})
+
+    async def close_sockets(self, app: web.Application):
+        """Ferme les connexions ouvertes pour que l'arrêt du serveur ne reste pas bloqué"""
+        for ws in list(self.sockets.values()):
+            await ws.close()
+
+    async def start(self) -> web.AppRunner:
+        """Démarre le serveur dans la boucle courante et retourne le runner (pour runner.cleanup())"""
+        runner = web.AppRunner(self.app)
+        await runner.setup()
+        await web.TCPSite(runner, self.host, self.port).start()
+        print(f"🧪 Serveur EventSub de test sur ws://{self.host}:{self.port}/ws")
+        return runner
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serveur EventSub WebSocket local")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--keepalive", type=int, default=10)
+    args = parser.parse_args()
+
+    server = EventSubTestServer(args.host, args.port, args.keepalive)
+    web.run_app(server.app, host=args.host, port=args.port)
@@ -0,0 +1,137 @@
+from typing import Dict, List, Optional
+from cache import TTLCache
+from http_client import http_client
+from .token_manager import AppTokenManager
+
+class HelixClient:
+    BASE_URL = "https://api.twitch.tv/helix"
+    MAX_LOGINS_PER_REQUEST = 100
+
+    def __init__(self, client_id: str, client_secret: str, token_cache_path: str = ".twitch_token.json", max_auth_retries: int = 1, profile_ttl: int = 6 * 3600):
+        """
+        Client minimal pour l'API Helix de Twitch
+
+        Args:
+            client_id: Client ID de l'application Twitch
+            client_secret: Client Secret de l'application Twitch
+            token_cache_path: Fichier où sauvegarder le token d'application (None pour désactiver)
+            max_auth_retries: Nombre de nouvelles tentatives après un 401
+            profile_ttl: Durée (en secondes) pendant laquelle un profil en cache est considéré à jour
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.max_auth_retries = max_auth_retries
+        self.tokens = AppTokenManager(client_id, client_secret, cache_path=token_cache_path)
+        self.profiles = TTLCache(ttl=profile_ttl)  # login: profil Helix
+
+    @property
+    def access_token(self) -> Optional[str]:
+        """Token d'application actuel (peut être expiré)"""
+        return self.tokens.access_token
+
+    async def get_app_access_token(self) -> bool:
+        """Force l'obtention d'un nouveau token d'accès OAuth pour l'API Twitch"""
+        # Passer par get_token : des appels simultanés partagent une seule requête
+        if self.tokens.access_token:
+            self.tokens.invalidate(self.tokens.access_token)
+        return await self.tokens.get_token() is not None
+
+    async def get(self, endpoint: str, params) -> Optional[dict]:
+        """
+        Effectue une requête GET sur l'API Helix
+
+        En cas de 401, le token est invalidé et la requête refaite au plus
+        max_auth_retries fois. Les erreurs temporaires sont retentées par
+        http_client.request (les erreurs réseau persistantes sont levées).
+
+        Returns:
+            dict: La réponse JSON, ou None en cas d'erreur
+        """
+        url = f"{self.BASE_URL}/{endpoint}"
+        for attempt in range(self.max_auth_retries + 1):
+            token = await self.tokens.get_token()
+            if not token:
+                return None
+
+            headers = {
+                "Client-ID": self.client_id,
+                "Authorization": f"Bearer {token}"
+            }
+            async with http_client.request("GET", url, params=params, headers=headers, timeout=10, retries=2, deadline=20) as response:
+                if response.status == 401:  # Token expiré ou révoqué
+                    self.tokens.invalidate(token)
+                    continue
+
+                if response.status == 200:
+                    return await response.json()
+                print(f"⚠️ Erreur Helix sur {endpoint}: {response.status}")
+                return None
+
+        print(f"❌ Token Twitch refusé sur {endpoint} après {self.max_auth_retries + 1} tentatives")
+        return None
+
+    async def get_streams(self, logins: List[str]) -> Optional[Dict[str, dict]]:
+        """
+        Récupère les streams en cours pour une liste de logins
+
+        Les logins sont regroupés par paquets de 100, soit une seule requête
+        Helix par paquet quel que soit le nombre de streamers.
+
+        Returns:
+            dict: login -> données du stream, pour les streamers en live uniquement.
+                  None si une requête a échoué (statut inconnu).
+        """
+        streams = {}
+        for start in range(0, len(logins), self.MAX_LOGINS_PER_REQUEST):
+            chunk = logins[start:start + self.MAX_LOGINS_PER_REQUEST]
+            params = [("user_login", login) for login in chunk]
+            params.append(("first", str(self.MAX_LOGINS_PER_REQUEST)))
+            data = await self.get("streams", params)
+            if data is None:
+                return None
+            for stream in data["data"]:
+                streams[stream["user_login"].lower()] = stream
+        return streams
+
+    async def get_users(self, logins: List[str]) -> Optional[Dict[str, dict]]:
+        """
+        Récupère les profils d'une liste de logins (par paquets de 100)
+
+        Returns:
+            dict: login -> données du profil, ou None si une requête a échoué
+        """
+        users = {}
+        for start in range(0, len(logins), self.MAX_LOGINS_PER_REQUEST):
+            chunk = logins[start:start + self.MAX_LOGINS_PER_REQUEST]
+            data = await self.get("users", [("login", login) for login in chunk])
+            if data is None:
+                return None
+            for user in data["data"]:
+                login = user["login"].lower()
+                users[login] = user
+                self.profiles.set(login, user)
+        return users
+
+    async def get_profiles(self, logins: List[str]) -> Dict[str, dict]:
+        """
+        Retourne les profils des logins en passant par le cache
+
+        Seuls les profils absents ou expirés sont redemandés à Helix, en une
+        requête par paquet de 100. En cas d'erreur, l'ancien profil est conservé.
+
+        Returns:
+            dict: login -> profil, pour les logins connus
+        """
+        missing = [login for login in logins if not self.profiles.is_fresh(login)]
+        if missing:
+            await self.get_users(missing)
+        profiles = {}
+        for login in logins:
+            profile = self.profiles.get(login, allow_stale=True)
+            if profile:
+                profiles[login] = profile
+        return profiles
+
+    def cached_profile(self, login: str) -> Optional[dict]:
+        """Retourne le profil en cache (même expiré) sans requête HTTP"""
+        return self.profiles.get(login, allow_stale=True)
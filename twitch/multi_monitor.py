@@ -0,0 +1,122 @@
+from typing import Dict, List
+from discord.ext import tasks
+from state_store import state_store
+from .helix import HelixClient
+from .stream_monitor import create_stream_embed, stream_mention
+
+class MultiTwitchMonitor:
+    def __init__(self, bot, client_id: str, client_secret: str, streamers: List[dict], helix: HelixClient = None):
+        """
+        Moniteur de streams Twitch pour plusieurs streamers
+
+        Tous les streamers sont interrogés en une seule requête Helix
+        (jusqu'à 100 logins par requête) à chaque vérification.
+
+        Args:
+            bot: Instance du bot Discord
+            client_id: Client ID de l'application Twitch
+            client_secret: Client Secret de l'application Twitch
+            streamers: Liste de dicts {"username", "notification_channel_id", "role_id"}
+                       (role_id optionnel, None pour @everyone)
+            helix: Client Helix à partager avec d'autres moniteurs (un nouveau est créé si None)
+        """
+        self.bot = bot
+        self.helix = helix or HelixClient(client_id, client_secret)
+        self.streamers: Dict[str, dict] = {}  # login: config
+        for streamer in streamers:
+            login = streamer["username"].lower()
+            self.streamers[login] = {
+                "notification_channel_id": streamer["notification_channel_id"],
+                "role_id": streamer.get("role_id")
+            }
+        self.live_streams: Dict[str, dict] = {}  # login: stream_data
+        self.announced: Dict[str, str] = {}  # login: ID du dernier stream annoncé (gardé après la fin du stream)
+
+        # Reprendre l'état sauvegardé : un stream déjà annoncé ne l'est pas une seconde fois
+        for login in self.streamers:
+            saved = state_store.get(f"twitch:{login}", {})
+            if saved.get("stream_id"):
+                self.announced[login] = saved["stream_id"]
+            if saved.get("is_live"):
+                self.live_streams[login] = {"id": saved.get("stream_id")}
+
+    async def check_streams_status(self):
+        """Retourne les streams en cours (login -> données), ou None si le statut est inconnu"""
+        try:
+            return await self.helix.get_streams(list(self.streamers))
+        except Exception as e:
+            print(f"❌ Erreur lors de la vérification du statut des streams: {e}")
+            return None
+
+    async def send_stream_notification(self, login: str, stream_data: dict):
+        """Envoie la notification de début de stream dans le salon du streamer"""
+        config = self.streamers[login]
+        channel = self.bot.get_channel(config["notification_channel_id"])
+        if not channel:
+            print(f"❌ Canal de notification introuvable (ID: {config['notification_channel_id']})")
+            return
+
+        # Profil lu dans le cache : aucune requête supplémentaire au moment de l'alerte
+        user_data = self.helix.cached_profile(login)
+        embed = create_stream_embed(stream_data, login, user_data)
+        mention, allowed_mentions = stream_mention(config["role_id"])
+
+        await channel.send(
+            content=mention,
+            embed=embed,
+            allowed_mentions=allowed_mentions
+        )
+        print(f"✅ Notification de stream envoyée pour {login}")
+
+    @tasks.loop(minutes=2)
+    async def monitor_streams(self):
+        """Tâche périodique pour surveiller le statut de tous les streams"""
+        streams = await self.check_streams_status()
+
+        # En cas d'erreur, ne rien conclure : on garde l'état précédent
+        if streams is None:
+            return
+
+        for login in self.streamers:
+            stream_data = streams.get(login)
+            known = self.live_streams.get(login)
+
+            # Si le stream vient de démarrer (ou si un autre stream a remplacé celui enregistré)
+            if stream_data and (known is None or (known.get("id") and known["id"] != stream_data["id"])):
+                self.live_streams[login] = stream_data
+                state_store.set(f"twitch:{login}", {"is_live": True, "stream_id": stream_data["id"]})
+                # Le même stream, vu hors ligne entre-temps (réponse vide de Twitch) : déjà annoncé
+                if self.announced.get(login) != stream_data["id"]:
+                    self.announced[login] = stream_data["id"]
+                    await self.send_stream_notification(login, stream_data)
+
+            # Si le stream s'est arrêté
+            elif not stream_data and known is not None:
+                del self.live_streams[login]
+                state_store.set(f"twitch:{login}", {"is_live": False, "stream_id": self.announced.get(login)})
+                print(f"ℹ️ Stream terminé pour {login}")
+
+        # Rafraîchir les profils expirés, après les éventuelles notifications
+        await self.refresh_profiles()
+
+    async def refresh_profiles(self):
+        """Met en cache les profils absents ou expirés (une requête par paquet de 100)"""
+        try:
+            await self.helix.get_profiles(list(self.streamers))
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des profils Twitch: {e}")
+
+    @monitor_streams.before_loop
+    async def before_monitor_streams(self):
+        """Attend que le bot soit prêt avant de démarrer la surveillance"""
+        await self.bot.wait_until_ready()
+        await self.refresh_profiles()
+        print(f"🔍 Surveillance de {len(self.streamers)} streams Twitch démarrée")
+
+    def start(self):
+        """Démarre la surveillance des streams"""
+        self.monitor_streams.start()
+
+    def stop(self):
+        """Arrête la surveillance des streams"""
+        self.monitor_streams.cancel()
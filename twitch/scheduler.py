@@ -0,0 +1,148 @@
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+class AdaptivePollScheduler:
+    SLOT_MINUTES = 15
+    SLOTS_PER_WEEK = 7 * 24 * 60 // SLOT_MINUTES
+
+    def __init__(self, fast_interval: int = 30, slow_interval: int = 600, default_interval: int = 120, live_interval: int = 120,
+                 window_minutes: int = 60, threshold: float = 0.15, min_history: int = 3, daily_budget: int = 720, decay: float = 0.95):
+        """
+        Planificateur adaptatif du polling Twitch
+
+        Les heures de début des streams passés (par créneau de 15 minutes dans
+        la semaine, avec un oubli progressif) servent à estimer si un live est
+        probable dans l'heure qui vient : on interroge souvent dans ces
+        fenêtres et rarement ailleurs, sans dépasser un budget de requêtes
+        sur 24 heures glissantes.
+
+        Args:
+            fast_interval: Intervalle (en secondes) dans une fenêtre probable
+            slow_interval: Intervalle (en secondes) hors des fenêtres probables
+            default_interval: Intervalle tant que l'historique est insuffisant (équivalent à la boucle fixe)
+            live_interval: Intervalle pendant un live (détection de la fin du stream)
+            window_minutes: Taille de la fenêtre de prévision (en minutes)
+            threshold: Part minimale des lives passés dans la fenêtre pour passer en mode rapide
+            min_history: Nombre de lives à observer avant d'adapter l'intervalle
+            daily_budget: Nombre maximal de requêtes sur 24 heures glissantes
+            decay: Facteur d'oubli appliqué à l'historique à chaque nouveau live
+        """
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+        self.default_interval = default_interval
+        self.live_interval = live_interval
+        self.window_minutes = window_minutes
+        self.threshold = threshold
+        self.min_history = min_history
+        self.daily_budget = daily_budget
+        self.decay = decay
+        self.histogram = [0.0] * self.SLOTS_PER_WEEK
+        self.go_live_count = 0
+        self.requests = deque()  # timestamps des requêtes sur les dernières 24h
+        self.decisions = deque(maxlen=200)
+        self.detection_latencies = deque(maxlen=50)  # en secondes
+
+    def _slot(self, moment: datetime) -> int:
+        moment = moment.astimezone(timezone.utc)
+        return (moment.weekday() * 24 * 60 + moment.hour * 60 + moment.minute) // self.SLOT_MINUTES
+
+    def record_go_live(self, started_at: datetime, detected_at: datetime = None):
+        """Enregistre un début de stream (heure réelle de début et heure de détection)"""
+        detected_at = detected_at or datetime.now(timezone.utc)
+        if self.decay < 1:
+            self.histogram = [weight * self.decay for weight in self.histogram]
+        self.histogram[self._slot(started_at)] += 1.0
+        self.go_live_count += 1
+        self.detection_latencies.append(max(0.0, (detected_at - started_at).total_seconds()))
+
+    def to_dict(self) -> dict:
+        """Historique appris, sérialisable en JSON"""
+        return {
+            "histogram": [round(weight, 4) for weight in self.histogram],
+            "go_live_count": self.go_live_count
+        }
+
+    def load_dict(self, data: dict):
+        """Recharge un historique produit par to_dict()"""
+        histogram = data.get("histogram")
+        if histogram and len(histogram) == self.SLOTS_PER_WEEK:
+            self.histogram = [float(weight) for weight in histogram]
+            self.go_live_count = data.get("go_live_count", 0)
+
+    def record_request(self, now: datetime = None):
+        """Enregistre une requête de polling"""
+        self.requests.append(now or datetime.now(timezone.utc))
+
+    def _requests_last_24h(self, now: datetime) -> int:
+        while self.requests and now - self.requests[0] >= timedelta(days=1):
+            self.requests.popleft()
+        return len(self.requests)
+
+    def likelihood(self, now: datetime = None) -> float:
+        """Part des lives passés ayant commencé dans la fenêtre [maintenant - 15 min, maintenant + fenêtre]"""
+        total = sum(self.histogram)
+        if total <= 0:
+            return 0.0
+        now = now or datetime.now(timezone.utc)
+        start = self._slot(now) - 1
+        slots = self.window_minutes // self.SLOT_MINUTES + 2
+        weight = sum(self.histogram[(start + i) % self.SLOTS_PER_WEEK] for i in range(slots))
+        return weight / total
+
+    def next_interval(self, is_live: bool, now: datetime = None) -> int:
+        """Choisit l'intervalle (en secondes) avant la prochaine vérification et enregistre la décision"""
+        now = now or datetime.now(timezone.utc)
+        likelihood = self.likelihood(now)
+
+        if is_live:
+            interval, reason = self.live_interval, "live"
+        elif self.go_live_count < self.min_history:
+            interval, reason = self.default_interval, "historique insuffisant"
+        elif likelihood >= self.threshold:
+            interval, reason = self.fast_interval, "fenêtre probable"
+        else:
+            interval, reason = self.slow_interval, "fenêtre peu probable"
+
+        # Budget épuisé : attendre que la plus ancienne requête sorte des 24h glissantes
+        used = self._requests_last_24h(now)
+        if used >= self.daily_budget:
+            wait = (self.requests[0] + timedelta(days=1) - now).total_seconds()
+            if wait > interval:
+                interval, reason = int(wait) + 1, "budget atteint"
+
+        self.decisions.append({
+            "time": now,
+            "interval": interval,
+            "reason": reason,
+            "likelihood": round(likelihood, 3),
+            "requests_24h": used
+        })
+        return interval
+
+    def last_decision(self) -> Optional[dict]:
+        """Dernière décision prise, ou None"""
+        return self.decisions[-1] if self.decisions else None
+
+    def report(self, fixed_interval: int = 120) -> dict:
+        """
+        Résumé des décisions, comparé à une boucle fixe
+
+        Returns:
+            dict: requêtes sur 24h (adaptatif vs boucle fixe), latence moyenne de
+                  détection observée vs attendue avec la boucle fixe, répartition des décisions
+        """
+        now = datetime.now(timezone.utc)
+        reasons = {}
+        for decision in self.decisions:
+            reasons[decision["reason"]] = reasons.get(decision["reason"], 0) + 1
+        latencies = list(self.detection_latencies)
+        return {
+            "requests_24h": self._requests_last_24h(now),
+            "fixed_requests_24h": 24 * 3600 // fixed_interval,
+            "avg_detection_latency": sum(latencies) / len(latencies) if latencies else None,
+            "fixed_expected_latency": fixed_interval / 2,
+            "go_live_count": self.go_live_count,
+            "decisions": reasons,
+            "last_decision": self.last_decision()
+        }
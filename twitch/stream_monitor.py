@@ -1,13 +1,63 @@
-import aiohttp
+import asyncio
 import discord
 from discord.ext import tasks
-from datetime import datetime
+from datetime import datetime, timezone
+from state_store import state_store
+from .eventsub import EventSubClient
+from .helix import HelixClient
+from .scheduler import AdaptivePollScheduler
+
+# Résultat de check_stream_status quand Twitch n'a pas répondu : ni en ligne, ni hors ligne
+STREAM_UNKNOWN = object()
+
+
+def create_stream_embed(stream_data: dict, twitch_username: str, user_data: dict = None) -> discord.Embed:
+    """
+    Crée l'embed de notification de début de stream
+
+    Args:
+        stream_data: Données du stream renvoyées par Helix
+        twitch_username: Nom d'utilisateur Twitch du streamer
+        user_data: Profil Twitch du streamer (pour l'avatar), optionnel
+
+    Returns:
+        discord.Embed: L'embed formaté
+    """
+    embed = discord.Embed(
+        title=f"🔴 {stream_data['user_name']} est en live !",
+        description=stream_data['title'],
+        color=discord.Color.purple(),
+        url=f"https://twitch.tv/{twitch_username}"
+    )
+
+    embed.add_field(name="🎮 Jeu", value=stream_data.get('game_name', 'Non spécifié'), inline=True)
+    embed.add_field(name="👥 Spectateurs", value=str(stream_data.get('viewer_count', 0)), inline=True)
+
+    # Thumbnail du stream
+    thumbnail_url = stream_data['thumbnail_url'].replace('{width}', '320').replace('{height}', '180')
+    embed.set_image(url=thumbnail_url)
+
+    # Avatar du streamer
+    if user_data and user_data.get('profile_image_url'):
+        embed.set_thumbnail(url=user_data['profile_image_url'])
+
+    embed.set_footer(text="Twitch", icon_url="https://static.twitchcdn.net/assets/favicon-32-e29e246c157142c94346.png")
+    embed.timestamp = datetime.utcnow()
+    return embed
+
+
+def stream_mention(role_id: int = None) -> tuple:
+    """Retourne (mention, allowed_mentions) pour un rôle, ou @everyone si role_id est None"""
+    if role_id:
+        return f"<@&{role_id}>", discord.AllowedMentions(roles=True)
+    return "@everyone", discord.AllowedMentions(everyone=True)
+
 
 class TwitchMonitor:
-    def __init__(self, bot, client_id: str, client_secret: str, twitch_username: str, notification_channel_id: int, role_id: int = None):
+    def __init__(self, bot, client_id: str, client_secret: str, twitch_username: str, notification_channel_id: int, role_id: int = None, helix: HelixClient = None, scheduler: AdaptivePollScheduler = None):
         """
         Moniteur de streams Twitch
-        
+
         Args:
             bot: Instance du bot Discord
             client_id: Client ID de l'application Twitch
@@ -15,6 +65,8 @@ class TwitchMonitor:
             twitch_username: Nom d'utilisateur Twitch à surveiller
             notification_channel_id: ID du salon Discord où envoyer les notifications
             role_id: ID du rôle Discord à mentionner (None pour @everyone)
+            helix: Client Helix à partager avec d'autres moniteurs (un nouveau est créé si None)
+            scheduler: Planificateur adaptatif du polling (None pour garder l'intervalle fixe de 2 minutes)
         """
         self.bot = bot
         self.client_id = client_id
@@ -22,176 +74,209 @@ class TwitchMonitor:
         self.twitch_username = twitch_username.lower()
         self.notification_channel_id = notification_channel_id
         self.role_id = role_id
-        self.access_token = None
-        self.is_live = False
+        self.helix = helix or HelixClient(client_id, client_secret)
         self.stream_data = None
-        
+        self.scheduler = scheduler
+
+        # Reprendre l'état sauvegardé : un stream déjà annoncé ne l'est pas une seconde fois
+        saved = state_store.get(self.state_key, {})
+        self.is_live = saved.get("is_live", False)
+        self.stream_id = saved.get("stream_id")  # dernier stream annoncé (gardé après la fin du stream)
+        if self.scheduler:
+            self.scheduler.load_dict(state_store.get(f"{self.state_key}:scheduler", {}))
+        self.eventsub = None
+        self._eventsub_task = None
+
+    @property
+    def state_key(self) -> str:
+        """Clé de ce moniteur dans le stockage d'état"""
+        return f"twitch:{self.twitch_username}"
+
+    def save_state(self):
+        """Sauvegarde l'état du stream (appelé à chaque transition)"""
+        state_store.set(self.state_key, {"is_live": self.is_live, "stream_id": self.stream_id})
+
+    def enable_eventsub(self, user_token: str, ws_url: str = None, subscriptions_url: str = None):
+        """
+        Active le mode EventSub (WebSocket) : les débuts et fins de stream
+        arrivent en temps réel et le polling n'est utilisé que lorsque la
+        connexion est coupée.
+
+        Args:
+            user_token: Token d'accès utilisateur Twitch (obligatoire pour le transport WebSocket)
+            ws_url: URL du serveur EventSub (None pour Twitch, ou le serveur local de test)
+            subscriptions_url: URL de création des abonnements (None pour Twitch)
+        """
+        self.eventsub = EventSubClient(
+            client_id=self.client_id,
+            user_token=user_token,
+            on_event=self.handle_eventsub_event,
+            on_connected=self.sync_stream_status,
+            ws_url=ws_url,
+            subscriptions_url=subscriptions_url
+        )
+
     async def get_app_access_token(self):
         """Obtient un token d'accès OAuth pour l'API Twitch"""
-        url = "https://id.twitch.tv/oauth2/token"
-        params = {
-            "client_id": self.client_id,
-            "client_secret": self.client_secret,
-            "grant_type": "client_credentials"
-        }
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.access_token = data["access_token"]
-                        print(f"✅ Token Twitch obtenu avec succès")
-                        return True
-                    else:
-                        print(f"❌ Erreur lors de l'obtention du token Twitch: {response.status}")
-                        return False
-        except Exception as e:
-            print(f"❌ Erreur lors de l'obtention du token Twitch: {e}")
-            return False
-    
+        return await self.helix.get_app_access_token()
+
     async def get_user_id(self):
         """Récupère l'ID utilisateur Twitch à partir du nom d'utilisateur"""
-        if not self.access_token:
-            await self.get_app_access_token()
-        
-        url = f"https://api.twitch.tv/helix/users?login={self.twitch_username}"
-        headers = {
-            "Client-ID": self.client_id,
-            "Authorization": f"Bearer {self.access_token}"
-        }
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data["data"]:
-                            return data["data"][0]["id"]
-                    return None
-        except Exception as e:
-            print(f"❌ Erreur lors de la récupération de l'ID utilisateur: {e}")
-            return None
-    
+        user_data = await self.get_user_info()
+        return user_data["id"] if user_data else None
+
     async def check_stream_status(self):
-        """Vérifie si le stream est en ligne"""
-        if not self.access_token:
-            await self.get_app_access_token()
-        
-        url = f"https://api.twitch.tv/helix/streams?user_login={self.twitch_username}"
-        headers = {
-            "Client-ID": self.client_id,
-            "Authorization": f"Bearer {self.access_token}"
-        }
-        
+        """Vérifie si le stream est en ligne : données du stream, None si hors ligne, STREAM_UNKNOWN en cas d'erreur"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 401:  # Token expiré
-                        await self.get_app_access_token()
-                        return await self.check_stream_status()
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        return data["data"][0] if data["data"] else None
-                    return None
+            streams = await self.helix.get_streams([self.twitch_username])
         except Exception as e:
             print(f"❌ Erreur lors de la vérification du statut du stream: {e}")
-            return None
-    
+            return STREAM_UNKNOWN
+        if streams is None:
+            return STREAM_UNKNOWN
+        return streams.get(self.twitch_username)
+
     async def send_stream_notification(self, stream_data):
         """Envoie une notification Discord quand le stream démarre"""
         channel = self.bot.get_channel(self.notification_channel_id)
         if not channel:
             print(f"❌ Canal de notification introuvable (ID: {self.notification_channel_id})")
             return
-        
-        embed = discord.Embed(
-            title=f"🔴 {stream_data['user_name']} est en live !",
-            description=stream_data['title'],
-            color=discord.Color.purple(),
-            url=f"https://twitch.tv/{self.twitch_username}"
-        )
-        
-        embed.add_field(name="🎮 Jeu", value=stream_data.get('game_name', 'Non spécifié'), inline=True)
-        embed.add_field(name="👥 Spectateurs", value=str(stream_data.get('viewer_count', 0)), inline=True)
-        
-        # Thumbnail du stream
-        thumbnail_url = stream_data['thumbnail_url'].replace('{width}', '320').replace('{height}', '180')
-        embed.set_image(url=thumbnail_url)
-        
-        # Avatar du streamer
-        user_data = await self.get_user_info()
-        if user_data and user_data.get('profile_image_url'):
-            embed.set_thumbnail(url=user_data['profile_image_url'])
-        
-        embed.set_footer(text="Twitch", icon_url="https://static.twitchcdn.net/assets/favicon-32-e29e246c157142c94346.png")
-        embed.timestamp = datetime.utcnow()
-        
-        # Déterminer la mention à utiliser
-        if self.role_id:
-            mention = f"<@&{self.role_id}>"
-            allowed_mentions = discord.AllowedMentions(roles=True)
-        else:
-            mention = "@everyone"
-            allowed_mentions = discord.AllowedMentions(everyone=True)
-        
+
+        # Profil lu dans le cache : aucune requête supplémentaire au moment de l'alerte
+        user_data = self.helix.cached_profile(self.twitch_username)
+        embed = create_stream_embed(stream_data, self.twitch_username, user_data)
+        mention, allowed_mentions = stream_mention(self.role_id)
+
         await channel.send(
             content=mention,
             embed=embed,
             allowed_mentions=allowed_mentions
         )
         print(f"✅ Notification de stream envoyée pour {self.twitch_username}")
-    
+
     async def get_user_info(self):
-        """Récupère les informations de profil de l'utilisateur Twitch"""
-        if not self.access_token:
-            await self.get_app_access_token()
-        
-        url = f"https://api.twitch.tv/helix/users?login={self.twitch_username}"
-        headers = {
-            "Client-ID": self.client_id,
-            "Authorization": f"Bearer {self.access_token}"
-        }
-        
+        """Récupère les informations de profil de l'utilisateur Twitch (via le cache de profils)"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data["data"][0] if data["data"] else None
-                    return None
+            profiles = await self.helix.get_profiles([self.twitch_username])
+            return profiles.get(self.twitch_username)
         except Exception as e:
             print(f"❌ Erreur lors de la récupération des infos utilisateur: {e}")
             return None
-    
-    @tasks.loop(minutes=2)  
-    async def monitor_stream(self):
-        """Tâche périodique pour surveiller le statut du stream"""
-        stream_data = await self.check_stream_status()
-        
-        # Si le stream vient de démarrer
-        if stream_data and not self.is_live:
+
+    async def update_stream_state(self, stream_data):
+        """Applique le statut du stream (None si hors ligne) et notifie au démarrage"""
+        # En cas d'erreur, ne rien conclure : on garde l'état précédent
+        if stream_data is STREAM_UNKNOWN:
+            return
+
+        stream_id = stream_data.get('id') if stream_data else None
+        new_stream = self.is_live and stream_id and self.stream_id and stream_id != self.stream_id
+
+        # Si le stream vient de démarrer (ou si un autre stream a remplacé celui enregistré)
+        if stream_data and (not self.is_live or new_stream):
+            already_announced = stream_id is not None and stream_id == self.stream_id
             self.is_live = True
             self.stream_data = stream_data
+            self.stream_id = stream_id
+            self.save_state()
+            if already_announced:
+                # Le même stream, vu hors ligne entre-temps (réponse vide de Twitch) : déjà annoncé
+                return
             await self.send_stream_notification(stream_data)
-        
+            if self.scheduler and stream_data.get('started_at'):
+                started_at = datetime.fromisoformat(stream_data['started_at'].replace('Z', '+00:00'))
+                self.scheduler.record_go_live(started_at)
+                state_store.set(f"{self.state_key}:scheduler", self.scheduler.to_dict())
+
         # Si le stream s'est arrêté
         elif not stream_data and self.is_live:
             self.is_live = False
             self.stream_data = None
+            self.save_state()
             print(f"ℹ️ Stream terminé pour {self.twitch_username}")
-    
+
+    async def sync_stream_status(self):
+        """Vérifie le statut par l'API (au démarrage du mode EventSub, pour rattraper une transition manquée)"""
+        await self.update_stream_state(await self.check_stream_status())
+
+    async def handle_eventsub_event(self, subscription_type: str, event: dict):
+        """Traite un événement EventSub stream.online / stream.offline"""
+        try:
+            if subscription_type == "stream.online":
+                # L'événement ne contient ni titre ni jeu : une requête pour les détails
+                stream_data = await self.check_stream_status()
+                if stream_data is STREAM_UNKNOWN or not stream_data:
+                    stream_data = self._stream_data_from_event(event)
+                await self.update_stream_state(stream_data)
+            elif subscription_type == "stream.offline":
+                await self.update_stream_state(None)
+        except Exception as e:
+            print(f"❌ Erreur lors du traitement de l'événement EventSub {subscription_type}: {e}")
+
+    def _stream_data_from_event(self, event: dict) -> dict:
+        """Données de stream minimales construites depuis un événement stream.online"""
+        login = event["broadcaster_user_login"]
+        return {
+            "id": event.get("id"),
+            "user_login": login,
+            "user_name": event["broadcaster_user_name"],
+            "title": "",
+            "started_at": event.get("started_at"),
+            "thumbnail_url": f"https://static-cdn.jtvnw.net/previews-ttv/live_user_{login}-{{width}}x{{height}}.jpg"
+        }
+
+    async def run_eventsub(self):
+        """Attend l'ID du streamer puis maintient la connexion EventSub"""
+        await self.bot.wait_until_ready()
+        user_id = await self.get_user_id()
+        while not user_id:
+            await asyncio.sleep(60)
+            user_id = await self.get_user_id()
+        await self.eventsub.run([user_id])
+
+    @tasks.loop(minutes=2)
+    async def monitor_stream(self):
+        """Tâche périodique pour surveiller le statut du stream (ignorée si EventSub est connecté)"""
+        if not (self.eventsub and self.eventsub.connected):
+            stream_data = await self.check_stream_status()
+            if self.scheduler:
+                self.scheduler.record_request()
+            await self.update_stream_state(stream_data)
+
+        # Rafraîchir le profil s'il a expiré, après l'éventuelle notification
+        await self.get_user_info()
+
+        if self.scheduler:
+            self.adjust_interval()
+
+    def adjust_interval(self):
+        """Applique l'intervalle choisi par le planificateur adaptatif"""
+        previous = self.scheduler.decisions[-1] if self.scheduler.decisions else None
+        interval = self.scheduler.next_interval(self.is_live, datetime.now(timezone.utc))
+        decision = self.scheduler.last_decision()
+        if previous is None or previous["reason"] != decision["reason"]:
+            print(f"⏱️ Polling Twitch de {self.twitch_username}: toutes les {interval}s ({decision['reason']}, "
+                  f"{decision['requests_24h']} requêtes sur 24h)")
+        if interval != self.monitor_stream.seconds:
+            self.monitor_stream.change_interval(seconds=interval)
+
     @monitor_stream.before_loop
     async def before_monitor_stream(self):
         """Attend que le bot soit prêt avant de démarrer la surveillance"""
         await self.bot.wait_until_ready()
+        await self.get_user_info()
         print(f"🔍 Surveillance du stream Twitch de {self.twitch_username} démarrée")
-    
+
     def start(self):
         """Démarre la surveillance du stream"""
         self.monitor_stream.start()
-    
+        if self.eventsub:
+            self._eventsub_task = asyncio.create_task(self.run_eventsub())
+
     def stop(self):
         """Arrête la surveillance du stream"""
         self.monitor_stream.cancel()
+        if self._eventsub_task:
+            self._eventsub_task.cancel()
+            self._eventsub_task = None
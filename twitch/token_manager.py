@@ -0,0 +1,117 @@
+import asyncio
+import json
+import os
+import time
+from typing import Optional
+from http_client import http_client
+
+class AppTokenManager:
+    TOKEN_URL = "https://id.twitch.tv/oauth2/token"
+
+    def __init__(self, client_id: str, client_secret: str, cache_path: str = ".twitch_token.json", refresh_margin: int = 300, max_attempts: int = 3):
+        """
+        Gestionnaire du token d'application Twitch (client credentials)
+
+        Le token est renouvelé peu avant son expiration, un seul
+        renouvellement tourne à la fois (les autres appelants l'attendent),
+        et il est sauvegardé sur disque pour être réutilisé au redémarrage.
+
+        Args:
+            client_id: Client ID de l'application Twitch
+            client_secret: Client Secret de l'application Twitch
+            cache_path: Fichier où sauvegarder le token (None pour désactiver)
+            refresh_margin: Nombre de secondes avant l'expiration où le token est renouvelé
+            max_attempts: Nombre maximal de tentatives par renouvellement
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.cache_path = cache_path
+        self.refresh_margin = refresh_margin
+        self.max_attempts = max_attempts
+        self.access_token = None
+        self.expires_at = 0.0  # timestamp UNIX
+        self._lock = asyncio.Lock()
+        self._load()
+
+    def is_valid(self) -> bool:
+        """Indique si le token actuel est utilisable sans renouvellement"""
+        return self.access_token is not None and time.time() < self.expires_at - self.refresh_margin
+
+    async def get_token(self) -> Optional[str]:
+        """Retourne un token valide, en le renouvelant si nécessaire"""
+        if self.is_valid():
+            return self.access_token
+
+        async with self._lock:
+            # Un autre appelant a pu renouveler le token pendant l'attente
+            if not self.is_valid():
+                await self.refresh()
+            return self.access_token
+
+    def invalidate(self, token: str):
+        """Invalide le token s'il a été refusé (401) et qu'il n'a pas déjà été remplacé"""
+        if token == self.access_token:
+            self.access_token = None
+            self.expires_at = 0.0
+
+    async def refresh(self) -> bool:
+        """Demande un nouveau token à id.twitch.tv (avec un nombre de tentatives borné)"""
+        params = {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "grant_type": "client_credentials"
+        }
+
+        for attempt in range(self.max_attempts):
+            try:
+                # Une seule tentative par tour de boucle : les nouvelles tentatives sont gérées ici
+                async with http_client.request("POST", self.TOKEN_URL, params=params, timeout=10, retries=0) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        self.access_token = data["access_token"]
+                        self.expires_at = time.time() + data.get("expires_in", 0)
+                        self._save()
+                        print(f"✅ Token Twitch obtenu avec succès")
+                        return True
+
+                    print(f"❌ Erreur lors de l'obtention du token Twitch: {response.status}")
+                    # Identifiants refusés : inutile de réessayer
+                    if 400 <= response.status < 500 and response.status != 429:
+                        return False
+            except Exception as e:
+                print(f"❌ Erreur lors de l'obtention du token Twitch: {e}")
+
+            if attempt < self.max_attempts - 1:
+                await asyncio.sleep(2 ** attempt)
+        return False
+
+    def _load(self):
+        """Charge le token sauvegardé s'il correspond à ce client ID"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("client_id") == self.client_id:
+                self.access_token = data["access_token"]
+                self.expires_at = float(data["expires_at"])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Cache du token Twitch illisible, il sera ignoré: {e}")
+
+    def _save(self):
+        """Sauvegarde le token de manière atomique (fichier temporaire puis renommage)"""
+        if not self.cache_path:
+            return
+        data = {
+            "client_id": self.client_id,
+            "access_token": self.access_token,
+            "expires_at": self.expires_at
+        }
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠️ Impossible de sauvegarder le token Twitch: {e}")
@@ -1,3 +1,4 @@
-from .rank_ctrl import get_valorant_rank
+from .rank_ctrl import get_valorant_rank, get_valorant_ranks, rank_cache
+from .registry import player_registry
 
-__all__ = ['get_valorant_rank', 'rank_ctrl']
+__all__ = ['get_valorant_rank', 'get_valorant_ranks', 'rank_cache', 'player_registry', 'rank_ctrl']
@@ -1,10 +1,159 @@
-import aiohttp
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Tuple
 from bs4 import BeautifulSoup
 import discord
+from cache import TTLCache
+from http_client import http_client
+from resilience import CircuitOpenError
+
+
+class LeaderCancelled(Exception):
+    """La requête partagée a été annulée par l'appelant qui l'avait lancée"""
+
+
+class RankCache:
+    def __init__(self, ttl: int = 300, negative_ttl: int = 60, max_size: int = 2048):
+        """
+        Cache des recherches de rang avec regroupement des requêtes identiques
+
+        Les rangs trouvés sont gardés ttl secondes, les joueurs introuvables
+        ou non classés negative_ttl secondes. Les autres erreurs ne sont pas
+        mises en cache. Plusieurs recherches simultanées du même username#tag
+        partagent une seule requête vers valorantrank.chat.
+
+        Args:
+            ttl: Durée de vie (en secondes) d'un rang trouvé
+            negative_ttl: Durée de vie (en secondes) d'un "introuvable" ou "non classé"
+            max_size: Nombre maximal de joueurs en cache
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.cache = TTLCache(ttl=ttl, max_size=max_size)
+        self._inflight: Dict[str, asyncio.Future] = {}  # clé: requête en cours
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+
+    @staticmethod
+    def key(username_tag: str) -> str:
+        """Clé normalisée (les Riot ID ne sont pas sensibles à la casse)"""
+        return username_tag.strip().lower()
+
+    def _ttl_for(self, data: dict):
+        if data["success"]:
+            return self.ttl
+        if data.get("code") in ("not_found", "unrated"):
+            return self.negative_ttl
+        return None
+
+    async def get(self, username_tag: str, fetch: Callable[[str], Awaitable[dict]]) -> dict:
+        """Retourne le résultat en cache, attend une requête identique en cours, ou appelle fetch"""
+        key = self.key(username_tag)
+        while True:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except LeaderCancelled:
+                # L'appelant qui faisait la requête a été annulé, pas nous : relancer la recherche
+                continue
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            self.upstream_calls += 1
+            data = await fetch(username_tag)
+            ttl = self._ttl_for(data)
+            if ttl:
+                self.cache.set(key, data, ttl=ttl)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            # Une annulation ne concerne que cet appelant : les autres reçoivent LeaderCancelled et relancent
+            future.set_exception(LeaderCancelled() if isinstance(e, asyncio.CancelledError) else e)
+            future.exception()  # évite l'avertissement si personne n'attendait
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        """Compteurs du cache (taux de succès, requêtes réellement envoyées)"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "upstream_calls": self.upstream_calls,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "cached_players": len(self.cache)
+        }
+
+
+# Cache global des recherches de rang
+rank_cache = RankCache()
+
 
 async def get_valorant_rank(username_tag: str) -> dict:
     """
-    Récupère les informations de rank Valorant depuis tracker.gg
+    Récupère les informations de rank Valorant, en passant par le cache
+
+    Args:
+        username_tag: Le nom d'utilisateur avec le tag (ex: "emm4#000")
+
+    Returns:
+        dict: Dictionnaire contenant les informations du joueur ou une erreur
+    """
+    if "#" not in username_tag:
+        return {
+            "success": False,
+            "error": "Format incorrect. Utilisez: username#tag"
+        }
+    return await rank_cache.get(username_tag, fetch_valorant_rank)
+
+
+async def get_valorant_ranks(username_tags: Iterable[str], concurrency: int = 8) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Récupère les rangs de plusieurs joueurs en parallèle
+
+    Les résultats sont renvoyés au fur et à mesure qu'ils arrivent (pas dans
+    l'ordre de la liste). Chaque recherche passe par le cache.
+
+    Args:
+        username_tags: Les noms d'utilisateur avec le tag
+        concurrency: Nombre maximal de recherches simultanées
+
+    Yields:
+        tuple: (username_tag, données du joueur comme get_valorant_rank)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(username_tag: str):
+        async with semaphore:
+            return username_tag, await get_valorant_rank(username_tag)
+
+    tasks = [asyncio.create_task(lookup(username_tag)) for username_tag in dict.fromkeys(username_tags)]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        # Si l'appelant s'arrête avant la fin, ne pas laisser de recherches orphelines
+        for task in tasks:
+            task.cancel()
+
+
+async def fetch_valorant_rank(username_tag: str) -> dict:
+    """
+    Récupère les informations de rank Valorant depuis tracker.gg (sans cache)
     
     Args:
         username_tag: Le nom d'utilisateur avec le tag (ex: "emm4#000")
@@ -26,50 +175,64 @@ async def get_valorant_rank(username_tag: str) -> dict:
         # Utiliser l'API valorantrank.chat (retourne du texte brut)
         url = f"https://valorantrank.chat/eu/{game_name}/{tag_line}?onlyRank=true"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 404:
-                    return {
-                        "success": False,
-                        "error": "Joueur non trouvé. Vérifiez le nom et le tag."
-                    }
-                
-                if response.status != 200:
-                    return {
-                        "success": False,
-                        "error": f"Erreur lors de la récupération des données (Status: {response.status})"
-                    }
-                
-                # Récupérer le texte brut (ex: "Diamond 3 : 19 RR")
-                text = await response.text()
-                text = text.strip()
+        # Délai borné : k?rank ne doit pas rester bloqué sur "Recherche..." si le site ne répond pas
+        async with http_client.request("GET", url, timeout=8, retries=2, deadline=15) as response:
+            if response.status == 404:
+                return {
+                    "success": False,
+                    "code": "not_found",
+                    "error": "Joueur non trouvé. Vérifiez le nom et le tag."
+                }
                 
-                # Vérifier si le joueur a un rang
-                if not text or "Unrated" in text:
-                    return {
-                        "success": False,
-                        "error": "Le joueur n'a pas de rang en compétitif."
-                    }
+            if response.status != 200:
+                return {
+                    "success": False,
+                    "error": f"Erreur lors de la récupération des données (Status: {response.status})"
+                }
                 
-                # Parser le texte (format: "Rank : RR RR")
-                if " : " in text:
-                    rank_part, rr_part = text.split(" : ", 1)
-                    rank = rank_part.strip()
-                    rr = rr_part.replace(" RR", "").strip()
-                else:
-                    # Si le format est différent, utiliser le texte brut
-                    rank = text
-                    rr = "N/A"
+            # Récupérer le texte brut (ex: "Diamond 3 : 19 RR")
+            text = await response.text()
+            text = text.strip()
                 
+            # Vérifier si le joueur a un rang
+            if not text or "Unrated" in text:
                 return {
-                    "success": True,
-                    "username": username_tag,
-                    "rank": rank,
-                    "rr": f"{rr} RR" if rr != "N/A" else "N/A",
-                    "stats": {},
-                    "url": f"https://tracker.gg/valorant/profile/riot/{game_name}%23{tag_line}/overview"
+                    "success": False,
+                    "code": "unrated",
+                    "error": "Le joueur n'a pas de rang en compétitif."
                 }
                 
+            # Parser le texte (format: "Rank : RR RR")
+            if " : " in text:
+                rank_part, rr_part = text.split(" : ", 1)
+                rank = rank_part.strip()
+                rr = rr_part.replace(" RR", "").strip()
+            else:
+                # Si le format est différent, utiliser le texte brut
+                rank = text
+                rr = "N/A"
+                
+            return {
+                "success": True,
+                "username": username_tag,
+                "rank": rank,
+                "rr": f"{rr} RR" if rr != "N/A" else "N/A",
+                "stats": {},
+                "url": f"https://tracker.gg/valorant/profile/riot/{game_name}%23{tag_line}/overview"
+            }
+                
+    except CircuitOpenError:
+        return {
+            "success": False,
+            "error": "Le service de rangs Valorant est indisponible pour le moment, réessayez dans quelques instants."
+        }
+
+    except asyncio.TimeoutError:
+        return {
+            "success": False,
+            "error": "Le service de rangs Valorant ne répond pas, réessayez plus tard."
+        }
+
     except Exception as e:
         return {
             "success": False,
@@ -77,6 +240,69 @@ async def get_valorant_rank(username_tag: str) -> dict:
         }
 
 
+RANK_TIERS = ["Iron", "Bronze", "Silver", "Gold", "Platinum", "Diamond", "Ascendant", "Immortal", "Radiant"]
+
+
+def rank_value(data: dict) -> Tuple[int, int]:
+    """
+    Convertit un rang texte (ex: "Diamond 3", "19 RR") en valeur triable
+
+    Returns:
+        tuple: (palier, RR) où palier = rang * 3 + division, (-1, 0) si pas de rang
+    """
+    if not data.get("success"):
+        return -1, 0
+
+    words = data["rank"].split()
+    tier = next((index for index, name in enumerate(RANK_TIERS) if words and words[0].lower() == name.lower()), None)
+    if tier is None:
+        return -1, 0
+
+    division = int(words[1]) if len(words) > 1 and words[1].isdigit() else 1
+    rr_text = data.get("rr", "").replace("RR", "").strip()
+    rr = int(rr_text) if rr_text.isdigit() else 0
+    return tier * 3 + (division - 1), rr
+
+
+def create_leaderboard_embed(guild_name: str, entries: List[Tuple[str, dict]], done: int, total: int) -> discord.Embed:
+    """
+    Crée l'embed du classement Valorant d'un serveur
+
+    Args:
+        guild_name: Nom du serveur
+        entries: Liste de (nom du membre, données du joueur) déjà reçues
+        done: Nombre de joueurs déjà récupérés
+        total: Nombre total de joueurs
+
+    Returns:
+        discord.Embed: L'embed formaté (les joueurs classés d'abord, du meilleur au moins bon)
+    """
+    ranked = sorted(entries, key=lambda entry: rank_value(entry[1]), reverse=True)
+
+    lines = []
+    position = 0
+    for member_name, data in ranked:
+        if data["success"]:
+            position += 1
+            lines.append(f"**{position}.** {member_name} - **{data['rank']}** ({data['rr']})")
+        else:
+            lines.append(f"➖ {member_name} - non classé")
+
+    description = "\n".join(lines) if lines else "Aucun résultat pour le moment..."
+    # Limite Discord de 4096 caractères pour la description
+    if len(description) > 4000:
+        description = description[:4000].rsplit("\n", 1)[0] + "\n..."
+
+    embed = discord.Embed(
+        title=f"🏆 Classement Valorant - {guild_name}",
+        description=description,
+        color=discord.Color.gold() if done == total else discord.Color.blue()
+    )
+    status = "Terminé" if done == total else "🔍 Recherche en cours..."
+    embed.set_footer(text=f"{status} {done}/{total} joueurs")
+    return embed
+
+
 def create_rank_embed(data: dict) -> discord.Embed:
     """
     Crée un embed Discord avec les informations de rank
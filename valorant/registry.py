@@ -0,0 +1,38 @@
+from typing import Dict, Optional
+from state_store import StateStore
+
+class PlayerRegistry:
+    def __init__(self, path: str = "valorant_players.json"):
+        """
+        Association membre Discord -> Riot ID (username#tag), par serveur
+
+        Args:
+            path: Fichier de sauvegarde
+        """
+        self.store = StateStore(path)
+
+    def get_players(self, guild_id: int) -> Dict[int, str]:
+        """Retourne {member_id: riot_id} pour un serveur"""
+        return {int(member_id): riot_id for member_id, riot_id in self.store.get(str(guild_id), {}).items()}
+
+    def get_player(self, guild_id: int, member_id: int) -> Optional[str]:
+        """Retourne le Riot ID enregistré d'un membre, ou None"""
+        return self.store.get(str(guild_id), {}).get(str(member_id))
+
+    def link(self, guild_id: int, member_id: int, riot_id: str):
+        """Enregistre (ou remplace) le Riot ID d'un membre"""
+        players = dict(self.store.get(str(guild_id), {}))
+        players[str(member_id)] = riot_id
+        self.store.set(str(guild_id), players)
+
+    def unlink(self, guild_id: int, member_id: int) -> bool:
+        """Supprime le Riot ID d'un membre. Retourne False s'il n'en avait pas"""
+        players = dict(self.store.get(str(guild_id), {}))
+        if players.pop(str(member_id), None) is None:
+            return False
+        self.store.set(str(guild_id), players)
+        return True
+
+
+# Registre global des joueurs
+player_registry = PlayerRegistry()